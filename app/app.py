@@ -2,23 +2,33 @@
 app/app.py  –  Haupt-Backend der Vereins‑Website
 ------------------------------------------------
 • Frontend‑Routen (Startseite, Verein, Team, Flipper, News …)
-• YAML‑basierte Inhalte werden bei jeder Request live eingelesen
+• YAML‑basierte Inhalte werden pro Datei‑Stand einmal eingelesen und
+  schreibgeschützt zwischen allen Threads geteilt (Content‑Store)
 • Hilfsfilter:  asset()   → lokale/remote‑Bilder
                 datetimeformat() → Datumsausgabe
 """
 
 from pathlib import Path
-from datetime import datetime, date as date_cls
+from datetime import datetime, timedelta, date as date_cls
+import bisect
 import copy
+from collections import OrderedDict
+from contextlib import contextmanager
 from itertools import groupby
 from functools import wraps
-from flask import Response, session, flash, jsonify
+from flask import Response, session, flash, jsonify, send_file
 
 import random
 import yaml
 import os
 import json
 import smtplib
+import sqlite3
+import shutil
+import threading
+import hashlib
+import gzip
+import mimetypes
 from email.message import EmailMessage
 from time import time
 
@@ -31,9 +41,25 @@ try:
     from flask_compress import Compress
 except Exception:
     Compress = None
+try:
+    import brotli
+except ImportError:
+    brotli = None
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = ImageOps = None
+try:
+    import fcntl
+except ImportError:  # Windows: nur Thread-Lock
+    fcntl = None
+try:
+    from http_cache import is_not_modified, not_modified_response, set_validators
+except ModuleNotFoundError:  # als app.app importiert (Tests)
+    from app.http_cache import is_not_modified, not_modified_response, set_validators
 import hmac
 import pyotp
-from werkzeug.security import check_password_hash, generate_password_hash
+from werkzeug.security import check_password_hash, generate_password_hash, safe_join
 from werkzeug.utils import secure_filename
 
 # --------------------------------------------------
@@ -51,9 +77,8 @@ try:
 except Exception:
     app.config['ASSET_VERSION'] = str(int(time()))
 
-# Enable gzip compression if available
-if Compress is not None:
-    Compress(app)
+# gzip/brotli compression (Flask-Compress) is set up together with the
+# response caches further below.
 
 ADMIN_USER = os.environ.get("ADMIN_USER", "admin")
 # Plaintext password support (preferred if set). Fallback to legacy hash.
@@ -118,21 +143,196 @@ KIOSK_NEWS_LIMIT = _env_int(os.environ.get("KIOSK_NEWS_LIMIT"), 12)
 KIOSK_FLIPPER_LIMIT = _env_int(os.environ.get("KIOSK_FLIPPER_LIMIT"), 12)
 KIOSK_TIMELINE_LIMIT = _env_int(os.environ.get("KIOSK_TIMELINE_LIMIT"), 6)
 KIOSK_SPOTLIGHT_LIMIT = _env_int(os.environ.get("KIOSK_SPOTLIGHT_LIMIT"), 0)
+KIOSK_POLL_SECONDS = _env_int(os.environ.get("KIOSK_POLL_SECONDS"), 60)
+PAGE_CACHE_ENABLED = _env_bool(os.environ.get("PAGE_CACHE_ENABLED"), True)
+PAGE_CACHE_MAX_BYTES = _env_int(os.environ.get("PAGE_CACHE_MAX_BYTES"), 16 * 1024 * 1024)
+COMPRESS_CACHE_MAX_BYTES = _env_int(os.environ.get("COMPRESS_CACHE_MAX_BYTES"), 8 * 1024 * 1024)
+STATIC_PRECOMPRESS_ON_STARTUP = _env_bool(os.environ.get("STATIC_PRECOMPRESS_ON_STARTUP"), True)
+IMAGE_VARIANT_WIDTHS = tuple(sorted(
+    int(w) for w in (os.environ.get("IMAGE_VARIANT_WIDTHS") or "480,960,1600").split(",") if w.strip()
+))
+IMAGE_VARIANT_DIR = Path(os.environ.get("IMAGE_VARIANT_DIR") or BASE_DIR / "data" / "image_variants")
 
-# In-memory login attempt tracker: {ip: (count, first_timestamp)}
-LOGIN_ATTEMPTS = {}
 MAX_ATTEMPTS = 5
 LOCKOUT_SECONDS = 15 * 60  # 15 minutes
-# In-memory contact attempt tracker: {ip: (count, first_timestamp)}
-CONTACT_ATTEMPTS = {}
 CONTACT_MAX_ATTEMPTS = _env_int(os.environ.get("CONTACT_MAX_ATTEMPTS"), 5)
 CONTACT_WINDOW_SECONDS = _env_int(os.environ.get("CONTACT_WINDOW_SECONDS"), 10 * 60)
+RATE_LIMIT_DB = os.environ.get("RATE_LIMIT_DB") or str(BASE_DIR / "data" / "ratelimit.db")
+RATE_LIMIT_MAX_KEYS = _env_int(os.environ.get("RATE_LIMIT_MAX_KEYS"), 100_000)
+CONTACT_LOG_MAX_BYTES = _env_int(os.environ.get("CONTACT_LOG_MAX_BYTES"), 5 * 1024 * 1024)
+CONTACT_LOG_PAGE_SIZE = 50
 
 
 class SMTPConfigurationError(RuntimeError):
     """Raised when SMTP is not configured properly."""
 
 
+# --------------------------------------------------
+# Rate-Limits (Login, Kontaktformular, Mitgliederportal)
+# --------------------------------------------------
+# Gleitende Fenster-Zähler in einer SQLite-Datei, die sich alle Worker teilen:
+# pro (Bucket, Schlüssel) eine Zeile mit Zähler des aktuellen und des
+# vorigen Fensters. Geschätzte Treffer = vorher · (Rest des Fensters) + jetzt.
+# Jede Prüfung ist ein Primärschlüssel-Zugriff; abgelaufene Zeilen werden
+# regelmäßig gelöscht, die Tabelle ist zusätzlich auf max_keys begrenzt.
+# SQLite-Fehler (gesperrt, defekt, schreibgeschützt) werden geloggt und
+# lassen die Anfrage durch, statt Login oder Kontaktformular scheitern zu lassen.
+class RateLimitStore:
+    SWEEP_INTERVAL = 60  # Sekunden zwischen TTL-Aufräumläufen pro Prozess
+
+    def __init__(self, path: str, max_keys: int = 100_000, timeout: float = 5):
+        self.path = path
+        self.max_keys = max_keys
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        self._next_sweep = 0.0
+
+    def _open(self, path: str):
+        conn = sqlite3.connect(path, timeout=self.timeout, isolation_level=None, check_same_thread=False)
+        try:
+            if path != ":memory:":
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limit ("
+                "bucket TEXT NOT NULL, key TEXT NOT NULL, win INTEGER NOT NULL, "
+                "count INTEGER NOT NULL, prev INTEGER NOT NULL, expires_at REAL NOT NULL, "
+                "PRIMARY KEY (bucket, key)) WITHOUT ROWID"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_rate_limit_expires ON rate_limit (expires_at)")
+        except sqlite3.Error:
+            conn.close()
+            raise
+        return conn
+
+    def _connect(self):
+        if self._conn is not None and self._pid == os.getpid():
+            return self._conn
+        try:
+            if self.path != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = self._open(self.path)
+        except (OSError, sqlite3.Error) as exc:
+            # z. B. schreibgeschütztes Dateisystem: nur noch pro Prozess begrenzen
+            app.logger.warning("Rate-Limit-Store %s nicht nutzbar (%s), nutze Speicher", self.path, exc)
+            conn = self._open(":memory:")
+        self._conn, self._pid = conn, os.getpid()
+        return conn
+
+    def _failed(self, exc) -> None:
+        app.logger.error("Rate-Limit-Store %s: %s – Anfrage wird nicht begrenzt", self.path, exc)
+
+    @staticmethod
+    def _estimate(row, window: int, now: float) -> float:
+        if row is None:
+            return 0.0
+        win, count, prev = row
+        current = int(now // window)
+        if win == current:
+            return prev * (1 - (now % window) / window) + count
+        if win == current - 1:
+            return count * (1 - (now % window) / window)
+        return 0.0
+
+    def hits(self, bucket: str, key: str, window: int, now: float | None = None) -> float:
+        now = time() if now is None else now
+        with self._lock:
+            try:
+                row = self._connect().execute(
+                    "SELECT win, count, prev FROM rate_limit WHERE bucket = ? AND key = ?", (bucket, key)
+                ).fetchone()
+            except sqlite3.Error as exc:
+                self._failed(exc)
+                return 0.0
+        return self._estimate(row, window, now)
+
+    def hit(self, bucket: str, key: str, window: int, now: float | None = None) -> float:
+        """Count one event and return the new estimate."""
+        now = time() if now is None else now
+        current = int(now // window)
+        with self._lock:
+            try:
+                conn = self._connect()
+                row = conn.execute(
+                    "INSERT INTO rate_limit (bucket, key, win, count, prev, expires_at) "
+                    "VALUES (?, ?, ?, 1, 0, ?) "
+                    "ON CONFLICT (bucket, key) DO UPDATE SET "
+                    "prev = CASE WHEN win = excluded.win THEN prev "
+                    "            WHEN win = excluded.win - 1 THEN count ELSE 0 END, "
+                    "count = CASE WHEN win = excluded.win THEN count + 1 ELSE 1 END, "
+                    "win = excluded.win, expires_at = excluded.expires_at "
+                    "RETURNING win, count, prev",
+                    (bucket, key, current, (current + 2) * window),
+                ).fetchone()
+            except sqlite3.Error as exc:
+                self._failed(exc)
+                return 0.0
+            if now >= self._next_sweep:
+                try:
+                    self._sweep(conn, now)
+                except sqlite3.Error as exc:
+                    self._failed(exc)
+        return self._estimate(row, window, now)
+
+    def _sweep(self, conn, now: float) -> None:
+        self._next_sweep = now + self.SWEEP_INTERVAL
+        conn.execute("DELETE FROM rate_limit WHERE expires_at <= ?", (now,))
+        excess = conn.execute("SELECT COUNT(*) FROM rate_limit").fetchone()[0] - self.max_keys
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM rate_limit WHERE (bucket, key) IN "
+                "(SELECT bucket, key FROM rate_limit ORDER BY expires_at LIMIT ?)",
+                (excess,),
+            )
+
+    def reset(self, bucket: str, key: str | None = None) -> None:
+        with self._lock:
+            try:
+                if key is None:
+                    self._connect().execute("DELETE FROM rate_limit WHERE bucket = ?", (bucket,))
+                else:
+                    self._connect().execute("DELETE FROM rate_limit WHERE bucket = ? AND key = ?", (bucket, key))
+            except sqlite3.Error as exc:
+                self._failed(exc)
+
+    def limit(self, bucket: str, limit: int, window: int) -> "RateLimit":
+        return RateLimit(self, bucket, limit, window)
+
+
+class RateLimit:
+    """One named limit (e.g. admin login per IP) on a shared RateLimitStore."""
+
+    def __init__(self, store: RateLimitStore, bucket: str, limit: int, window: int):
+        self.store = store
+        self.bucket = bucket
+        self.limit = limit
+        self.window = window
+
+    def hits(self, key: str, now: float | None = None) -> float:
+        return self.store.hits(self.bucket, key, self.window, now)
+
+    def hit(self, key: str, now: float | None = None) -> float:
+        return self.store.hit(self.bucket, key, self.window, now)
+
+    def is_limited(self, key: str, now: float | None = None) -> bool:
+        return self.hits(key, now) >= self.limit
+
+    def pop(self, key: str, default=None):
+        self.store.reset(self.bucket, key)
+        return default
+
+    def clear(self) -> None:
+        self.store.reset(self.bucket)
+
+
+RATE_LIMITS = RateLimitStore(RATE_LIMIT_DB, max_keys=RATE_LIMIT_MAX_KEYS)
+LOGIN_ATTEMPTS = RATE_LIMITS.limit("admin_login", MAX_ATTEMPTS, LOCKOUT_SECONDS)
+CONTACT_ATTEMPTS = RATE_LIMITS.limit("contact", CONTACT_MAX_ATTEMPTS, CONTACT_WINDOW_SECONDS)
+app.extensions["rate_limits"] = RATE_LIMITS
+
+
 # --------------------------------------------------
 # News/Datetime helpers
 # --------------------------------------------------
@@ -193,20 +393,105 @@ def news_is_visible(item: dict, now=None) -> bool:
     return True
 
 
+class NewsIndex:
+    """Pre-computed views on news.yaml, built once per file state.
+
+    items        – all articles, newest first
+    by_slug      – slug → article (first entry wins, like the old linear scan)
+    by_year      – year → articles of that year, newest first
+    by_category  – category → articles, newest first
+
+    Visibility only changes when "now" crosses one of the visible_from /
+    visible_until bounds, so the visible list (plus its year/category
+    dropdown values) is cached per interval between those bounds.
+    """
+
+    def __init__(self, raw_items):
+        prepared = []
+        for raw in raw_items:
+            if not isinstance(raw, dict):
+                continue
+            item = _prepare_news_item(dict(raw))
+            item["_title_lower"] = str(item.get("title") or "").lower()
+            prepared.append(FrozenDict(item))
+
+        self.by_slug = {}
+        for item in prepared:
+            if item.get("slug"):
+                self.by_slug.setdefault(item["slug"], item)
+
+        self.items = FrozenList(sorted(prepared, key=lambda n: n["_dt"], reverse=True))
+        self.by_year = {}
+        self.by_category = {}
+        for item in self.items:
+            if item["_year"]:
+                self.by_year.setdefault(item["_year"], []).append(item)
+            if item.get("category"):
+                self.by_category.setdefault(item["category"], []).append(item)
+
+        bounds = set()
+        for item in self.items:
+            if item["_visible_from"]:
+                bounds.add(item["_visible_from"])
+            if item["_visible_until"]:
+                # visible up to and including the bound itself
+                bounds.add(item["_visible_until"] + timedelta(microseconds=1))
+        self._bounds = sorted(bounds)
+        self._views = {}
+
+    def _view(self, now=None):
+        now_val = now or _local_now()
+        slot = bisect.bisect_right(self._bounds, now_val)
+        view = self._views.get(slot)
+        if view is None:
+            visible = FrozenList(n for n in self.items if news_is_visible(n, now_val))
+            years = sorted({n["_year"] for n in visible if n["_year"]}, reverse=True)
+            categories = sorted({n["category"] for n in visible if n.get("category")})
+            view = (visible, years, categories)
+            self._views[slot] = view
+        return view
+
+    def visible(self, now=None):
+        """Currently visible articles, newest first."""
+        return self._view(now)[0]
+
+    def visible_years(self, now=None):
+        return self._view(now)[1]
+
+    def visible_categories(self, now=None):
+        return self._view(now)[2]
+
+    def change_window(self, now=None):
+        """(last, next) visibility bound around now; either may be None."""
+        now_val = now or _local_now()
+        slot = bisect.bisect_right(self._bounds, now_val)
+        last = self._bounds[slot - 1] if slot else None
+        nxt = self._bounds[slot] if slot < len(self._bounds) else None
+        return last, nxt
+
+    def get_visible(self, slug, now=None):
+        """Article for slug if it exists and is currently visible."""
+        article = self.by_slug.get(slug)
+        if article is None or not news_is_visible(article, now):
+            return None
+        return article
+
+
+def news_index() -> NewsIndex:
+    return content_view("news.yaml", "index", NewsIndex)
+
+
 def load_news_items(include_hidden=False, now=None):
-    """Load news with helper metadata and optional visibility filtering."""
-    items = load_yaml("news.yaml")
-    for item in items:
-        _prepare_news_item(item)
+    """Load news (newest first) with helper metadata and optional visibility filtering."""
+    index = news_index()
     if include_hidden:
-        return items
-    now_val = now or _local_now()
-    return [item for item in items if news_is_visible(item, now_val)]
+        return index.items
+    return index.visible(now)
 
 
 def load_news_settings():
     """Return sanitized news settings with defaults for missing values."""
-    raw = load_yaml(NEWS_SETTINGS_FILE)
+    raw = load_content(NEWS_SETTINGS_FILE)
     settings = DEFAULT_NEWS_SETTINGS.copy()
     if isinstance(raw, dict):
         limit_raw = raw.get("homepage_limit")
@@ -220,7 +505,7 @@ def load_news_settings():
 
 def load_homepage_content():
     """Return homepage content dict merged with defaults."""
-    raw = load_yaml(HOMEPAGE_CONTENT_FILE)
+    raw = load_content(HOMEPAGE_CONTENT_FILE)
     content = DEFAULT_HOMEPAGE_CONTENT.copy()
     if isinstance(raw, dict):
         content.update(raw)
@@ -240,7 +525,7 @@ def _resolve_smtp_recipients():
 
 
 def send_contact_email(payload: dict):
-    """Send contact form payload via SMTP."""
+    """Send contact form payload via SMTP (queued when the intern portal is active)."""
     if app.config.get("TESTING"):
         return
     if not (SMTP_HOST and SMTP_USERNAME and SMTP_PASSWORD):
@@ -267,6 +552,12 @@ def send_contact_email(payload: dict):
         payload.get("message") or ""
     ]
     msg.set_content("\n".join(body_lines).strip() + "\n")
+    # Mit geladenem Mitgliederportal übernimmt dessen Mail-Queue die Zustellung
+    # (Retry mit Backoff), die Anfrage wartet nicht auf den SMTP-Server.
+    mail_queue = app.extensions.get("mail_queue")
+    if mail_queue is not None and mail_queue.settings.configured:
+        mail_queue.enqueue(msg, kind="contact")
+        return
     with smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=15) as server:
         server.ehlo()
         if SMTP_USE_TLS:
@@ -276,44 +567,290 @@ def send_contact_email(payload: dict):
         server.send_message(msg)
 
 
+# --------------------------------------------------
+# Kontaktanfragen: Append-only-Log
+# --------------------------------------------------
+# Jede Einsendung ist eine JSON-Zeile in contact_submissions.jsonl, angehängt
+# mit einem einzigen write() auf einen O_APPEND-Deskriptor unter flock –
+# parallele Threads/Worker verlieren keine Einträge und ein Post kostet O(1)
+# I/O. Ab CONTACT_LOG_MAX_BYTES wird die Datei zu
+# contact_submissions.<Zeitstempel>.jsonl rotiert. Ein altes
+# contact_submissions.yaml wird beim ersten Zugriff als ältestes Segment
+# übernommen und in *.yaml.imported umbenannt.
+class SubmissionLog:
+    LEGACY_SEGMENT = "00000000000000000000"  # sortiert vor allen Zeitstempeln
+
+    def __init__(self, directory: Path, name: str = "contact_submissions", max_bytes: int = 5 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.name = name
+        self.max_bytes = max_bytes
+        self.path = self.directory / f"{name}.jsonl"
+        self.legacy_path = self.directory / f"{name}.yaml"
+        self._lock_path = self.directory / f".{name}.lock"
+        self._thread_lock = threading.Lock()
+        self._counts = {}  # path -> (inode, size, lines)
+
+    @contextmanager
+    def _locked(self):
+        with self._thread_lock, open(self._lock_path, "a") as fh:
+            if fcntl is not None:
+                fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(fh, fcntl.LOCK_UN)
+
+    def _import_legacy(self):
+        """Convert contact_submissions.yaml (caller holds the lock).
+
+        Taucht die YAML-Datei erneut auf (Backup-Restore), werden ihre Einträge
+        an das vorhandene Legacy-Segment angehängt statt es zu ersetzen.
+        """
+        if not self.legacy_path.exists():
+            return
+        with open(self.legacy_path, encoding="utf-8") as f:
+            entries = yaml.safe_load(f) or []
+        target = self.directory / f"{self.name}.{self.LEGACY_SEGMENT}.jsonl"
+        tmp = target.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            if target.exists():
+                with open(target, "rb") as existing:
+                    shutil.copyfileobj(existing, f)
+            for entry in entries:
+                if isinstance(entry, dict):
+                    f.write((json.dumps(entry, ensure_ascii=False, default=str) + "\n").encode("utf-8"))
+        os.replace(tmp, target)
+        done = self.legacy_path.with_name(self.legacy_path.name + ".imported")
+        if done.exists():
+            stamp = datetime.now().strftime("%Y%m%d%H%M%S%f")
+            done = self.legacy_path.with_name(f"{self.legacy_path.name}.{stamp}.imported")
+        os.replace(self.legacy_path, done)
+
+    def _ensure_imported(self):
+        if self.legacy_path.exists():
+            with self._locked():
+                self._import_legacy()
+
+    def append(self, entry: dict):
+        line = (json.dumps(entry, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+        with self._locked():
+            self._import_legacy()
+            try:
+                size = self.path.stat().st_size
+            except FileNotFoundError:
+                size = 0
+            if size and size + len(line) > self.max_bytes:
+                stamp = datetime.now().strftime("%Y%m%d%H%M%S%f")
+                os.replace(self.path, self.directory / f"{self.name}.{stamp}.jsonl")
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+
+    def segments(self):
+        """Current file first, then rotated segments newest → oldest."""
+        rotated = sorted(self.directory.glob(f"{self.name}.*.jsonl"), reverse=True)
+        return ([self.path] if self.path.exists() else []) + rotated
+
+    def _line_count(self, path: Path) -> int:
+        # Segmente wachsen nur: bei gleichem Inode wird nur der Zuwachs gezählt
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return 0
+        inode, size, lines = self._counts.get(path, (None, 0, 0))
+        if inode != st.st_ino or st.st_size < size:
+            size, lines = 0, 0
+        if st.st_size > size:
+            with open(path, "rb") as f:
+                f.seek(size)
+                while chunk := f.read(1 << 16):
+                    lines += chunk.count(b"\n")
+            self._counts[path] = (st.st_ino, st.st_size, lines)
+        return lines
+
+    def count(self) -> int:
+        self._ensure_imported()
+        return sum(self._line_count(path) for path in self.segments())
+
+    @staticmethod
+    def _reverse_lines(path: Path, block: int = 1 << 16):
+        with open(path, "rb") as f:
+            pos = f.seek(0, os.SEEK_END)
+            rest = b""
+            while pos > 0:
+                step = min(block, pos)
+                pos -= step
+                f.seek(pos)
+                lines = (f.read(step) + rest).split(b"\n")
+                rest = lines.pop(0)
+                for line in reversed(lines):
+                    if line.strip():
+                        yield line
+            if rest.strip():
+                yield rest
+
+    def page(self, page: int = 1, per_page: int = 50) -> list:
+        """Entries of one page, newest first; reads only up to that page."""
+        self._ensure_imported()
+        skip = max(page - 1, 0) * per_page
+        entries = []
+        for path in self.segments():
+            lines = self._line_count(path)
+            if skip >= lines:
+                skip -= lines
+                continue
+            for raw in self._reverse_lines(path):
+                if skip:
+                    skip -= 1
+                    continue
+                try:
+                    entries.append(json.loads(raw))
+                except ValueError:
+                    app.logger.warning("Kontakt-Log: defekte Zeile in %s übersprungen", path.name)
+                    continue
+                if len(entries) >= per_page:
+                    return entries
+            skip = 0
+        return entries
+
+
+CONTACT_LOG = SubmissionLog(CONFIG_DIR, max_bytes=CONTACT_LOG_MAX_BYTES)
+
+
 def save_news_settings(new_settings: dict):
     """Persist news settings and invalidate cache."""
     filepath = CONFIG_DIR / NEWS_SETTINGS_FILE
     yaml_content = yaml.safe_dump(new_settings, allow_unicode=True, sort_keys=False)
     filepath.write_text(yaml_content, encoding="utf-8")
-    try:
-        YAML_CACHE.pop(NEWS_SETTINGS_FILE, None)
-    except Exception:
-        pass
+    invalidate_content(NEWS_SETTINGS_FILE)
 
 # --------------------------------------------------
 # Hilfsfunktionen
 # --------------------------------------------------
-YAML_CACHE = {}
+# Content-Store: jede YAML-Datei wird pro Datei-Stand (mtime/Größe) genau
+# einmal geparst. Öffentliche Routen bekommen eine schreibgeschützte Sicht,
+# die sich alle Threads eines Workers teilen – ohne deepcopy pro Request.
+YAML_CACHE = {}     # filename -> (signature, raw data)
+CONTENT_CACHE = {}  # (filename, view) -> (signature, value)
+_YAML_LOCK = threading.Lock()
 
-def load_yaml(filename: str):
-    """Beliebige YAML‑Datei aus dem config‑Ordner laden (mtime‑Cache).
-    Returns a deep copy to prevent accidental mutation of cached data.
-    """
-    path = CONFIG_DIR / filename
+
+class FrozenDict(dict):
+    """Read-only dict used for shared content; .copy() returns a plain dict."""
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("content store entries are read-only")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(dict(self), memo)
+
+
+class FrozenList(list):
+    """Read-only list used for shared content; slicing/.copy() return plain lists."""
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("content store entries are read-only")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = pop = remove = reverse = sort = clear = _readonly
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(list(self), memo)
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return FrozenDict((k, _freeze(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return FrozenList(_freeze(v) for v in value)
+    return value
+
+
+def _file_signature(filename: str):
+    """(mtime_ns, size) of a config file or None if it does not exist."""
     try:
-        mtime = path.stat().st_mtime
+        st = (CONFIG_DIR / filename).stat()
     except FileNotFoundError:
-        return []
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _load_raw_yaml(filename: str):
+    """Return (signature, parsed data); parses at most once per file state."""
+    sig = _file_signature(filename)
+    if sig is None:
+        return None, []
     cached = YAML_CACHE.get(filename)
-    if cached and cached[0] == mtime:
-        return copy.deepcopy(cached[1])
-    with open(path, encoding="utf-8") as f:
-        data = yaml.safe_load(f) or []
-    YAML_CACHE[filename] = (mtime, data)
-    return copy.deepcopy(data)
+    if cached and cached[0] == sig:
+        return cached
+    with _YAML_LOCK:
+        cached = YAML_CACHE.get(filename)
+        if cached and cached[0] == sig:
+            return cached
+        with open(CONFIG_DIR / filename, encoding="utf-8") as f:
+            data = yaml.safe_load(f) or []
+        cached = (sig, data)
+        YAML_CACHE[filename] = cached
+    return cached
+
+
+def load_yaml(filename: str):
+    """Beliebige YAML‑Datei aus dem config‑Ordner laden (mtime‑Cache).
+    Returns a mutable deep copy – only needed by the admin write paths,
+    read-only callers should use load_content().
+    """
+    return copy.deepcopy(_load_raw_yaml(filename)[1])
+
+
+def content_view(filename: str, view: str, builder):
+    """Return builder(load_content(filename)) memoized per file state.
+
+    Used for pre-normalized, read-only derivations (sorted timeline,
+    flipper epochs, …). Builders must not depend on request state; races
+    between threads only cause a duplicate (identical) build.
+    """
+    sig, data = _load_raw_yaml(filename)
+    key = (filename, view)
+    cached = CONTENT_CACHE.get(key)
+    if cached and cached[0] == sig:
+        return cached[1]
+    value = _freeze(data) if builder is None else builder(load_content(filename))
+    CONTENT_CACHE[key] = (sig, value)
+    return value
+
+
+def load_content(filename: str):
+    """Shared read-only view (FrozenDict/FrozenList) of a config YAML file."""
+    return content_view(filename, "content", None)
+
+
+def invalidate_content(filename: str):
+    """Drop parsed data and derived views of a file after an admin write."""
+    YAML_CACHE.pop(filename, None)
+    for key in list(CONTENT_CACHE):
+        if key[0] == filename:
+            CONTENT_CACHE.pop(key, None)
 
 
 def load_admin_accounts():
     """Return normalized admin definitions from admins.yaml or env fallback."""
     entries = []
     try:
-        raw = load_yaml("admins.yaml")
+        raw = load_content("admins.yaml")
     except Exception:
         raw = []
     for entry in raw:
@@ -485,7 +1022,8 @@ ADMIN_SECTIONS = {
         "description": "Eingehende Nachrichten aus dem Formular.",
         "icon": "envelope-open",
         "allow_new": False,
-        "read_only": True
+        "read_only": True,
+        "kind": "log"  # liegt in CONTACT_LOG, nicht in der YAML-Datei
     }
 }
 
@@ -534,25 +1072,78 @@ def normalize_field_value(field, value):
         return list(value)
     return value
 
+class OpeningSchedule:
+    """Compiled opening_days.yaml, built once per file state.
+
+    Entries are parsed once and sorted by end time; a suffix minimum over
+    the start times lets next_opening() find "the earliest-starting opening
+    that has not ended yet" with a single bisect. The is_today answer is
+    cached per (entry, calendar day).
+    """
+
+    def __init__(self, openings):
+        entries = []
+        for o in openings:
+            try:
+                from_dt = parser.parse(o["from"]).astimezone(LOCAL_TZ)
+                to_dt = parser.parse(o["to"]).astimezone(LOCAL_TZ)
+            except Exception as exc:
+                app.logger.warning("opening_days.yaml: Eintrag übersprungen (%s): %r", exc, o)
+                continue
+            entry = dict(o)
+            entry["from_dt"] = from_dt
+            entry["to_dt"] = to_dt
+            entries.append(entry)
+        entries.sort(key=lambda e: (e["to_dt"], e["from_dt"]))
+        self.entries = entries
+        self.ends = [e["to_dt"] for e in entries]
+        # first_from[i] = index of the earliest start among entries[i:]
+        self.first_from = [0] * len(entries)
+        best = None
+        for i in range(len(entries) - 1, -1, -1):
+            if best is None or entries[i]["from_dt"] <= entries[best]["from_dt"]:
+                best = i
+            self.first_from[i] = best
+        self._answers = {}
+
+    def next_opening(self, now=None):
+        """Earliest-starting opening whose end lies after now (or None)."""
+        now = now or datetime.now(tz=LOCAL_TZ)
+        pos = bisect.bisect_right(self.ends, now)
+        if pos >= len(self.entries):
+            return None
+        idx = self.first_from[pos]
+        key = (idx, now.date())
+        opening = self._answers.get(key)
+        if opening is None:
+            entry = self.entries[idx]
+            opening = FrozenDict(entry, is_today=entry["from_dt"].date() == now.date())
+            if len(self._answers) > 64:
+                self._answers.clear()
+            self._answers[key] = opening
+        return opening
+
+    def change_window(self, now=None):
+        """(last, next) end time around now – next_opening() can only change there."""
+        now = now or datetime.now(tz=LOCAL_TZ)
+        pos = bisect.bisect_right(self.ends, now)
+        last = self.ends[pos - 1] if pos else None
+        nxt = self.ends[pos] if pos < len(self.ends) else None
+        return last, nxt
+
+
+def opening_schedule() -> OpeningSchedule:
+    return content_view("opening_days.yaml", "schedule", OpeningSchedule)
+
+
 def get_next_opening():
     """Nächsten Öffnungstag aus opening_days.yaml ermitteln."""
-    openings = load_yaml("opening_days.yaml")
-    now = datetime.now(tz=tz.gettz("Europe/Berlin"))
-    for o in openings:
-        o["from_dt"] = parser.parse(o["from"]).astimezone(tz.gettz("Europe/Berlin"))
-        o["to_dt"] = parser.parse(o["to"]).astimezone(tz.gettz("Europe/Berlin"))
-
-    future = [o for o in openings if o["to_dt"] > now]
-    future.sort(key=lambda x: x["from_dt"])
-    opening = future[0] if future else None
-    if opening:
-        opening["is_today"] = opening["from_dt"].date() == now.date()
-    return opening
+    return opening_schedule().next_opening()
 
 
 def prepare_slides():
     """Return slides with ordering: first entry, pinned entries, then shuffled rest."""
-    slides = load_yaml("slides.yaml")
+    slides = load_content("slides.yaml")
     if not slides:
         return []
 
@@ -571,6 +1162,51 @@ def prepare_slides():
     return [first, *pinned, *other]
 
 
+def _build_timeline(timeline):
+    items = [item for item in timeline if isinstance(item, dict)]
+
+    def _timeline_key(item):
+        try:
+            return parser.parse(item.get("date", ""))
+        except Exception:
+            return datetime.min
+
+    # chronologisch sortiert – falls im YAML durcheinander
+    items.sort(key=_timeline_key)
+    return FrozenList(items)
+
+
+def load_timeline():
+    """Timeline-Milestones, chronologisch sortiert (einmal pro Datei-Stand)."""
+    return content_view("timeline.yaml", "sorted", _build_timeline)
+
+
+def _build_flipper_epochs(flippers):
+    # Erwartet: jedes Objekt hat mindestens "name", "image", "year"
+    result = []
+    for f in flippers:
+        entry = dict(f)
+        raw_year = entry.get("year", "")
+        try:
+            # Nur die ersten vier Ziffern als Jahr verwenden
+            year = int(str(raw_year)[:4])
+            entry["year"] = year
+            entry["decade_label"] = f"{(year // 10) * 10}er"
+        except (ValueError, TypeError):
+            entry["year"] = 0
+            entry["decade_label"] = "Unbekannt"
+        result.append(FrozenDict(entry))
+
+    # chronologisch (ältestes zuerst)
+    result.sort(key=lambda f: f["year"] or 9999)
+    return FrozenList(result)
+
+
+def load_flipper_epochs():
+    """Flipper mit Jahr/Jahrzehnt-Label, chronologisch sortiert."""
+    return content_view("flippers.yaml", "epochs", _build_flipper_epochs)
+
+
 def login_required(view):
     @wraps(view)
     def wrapped(*args, **kwargs):
@@ -618,6 +1254,30 @@ def asset(path: str):
         return path
     return url_for("static", filename=path)
 
+@app.template_filter("srcset_value")
+def srcset_value(path: str):
+    """srcset-Liste (Varianten + Original) für lokale Fotos, sonst ''."""
+    info = image_info(path) if path else None
+    if info is None:
+        return ""
+    digest, width, _ = info
+    candidates = [
+        f"{url_for('image_variant', width=w, filename=path, v=digest)} {w}w"
+        for w in IMAGE_VARIANT_WIDTHS if w < width
+    ]
+    if not candidates:
+        return ""
+    return ", ".join(candidates + [f"{asset(path)} {width}w"])
+
+@app.template_filter("srcset")
+def srcset(path: str, sizes: str = "100vw"):
+    """' srcset="…" sizes="…"' für ein <img>-Tag (leer, wenn keine Varianten)."""
+    from markupsafe import Markup, escape
+    value = srcset_value(path)
+    if not value:
+        return Markup("")
+    return Markup(f' srcset="{escape(value)}" sizes="{escape(sizes)}"')
+
 @app.template_filter("stat_number_html")
 def stat_number_html(value: str):
     """'50+' → '50<span>+</span>', '1994' → '1994'."""
@@ -644,6 +1304,500 @@ def nl2br(value: str):
     escaped = escape(str(value or ""))
     return Markup(str(escaped).replace('\n', Markup('<br>')))
 
+# --------------------------------------------------
+# Response-Caches (gerenderte Seiten, komprimierte Bodies, statische Assets)
+# --------------------------------------------------
+class LRUCache:
+    """Thread-safe LRU with a byte budget and optional absolute expiry.
+
+    Used for rendered pages (expiry = next opening boundary, midnight or
+    news visibility bound) and as Flask-Compress cache backend.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()  # key -> (value, cost, expires)
+        self._lock = threading.Lock()
+
+    def get(self, key, now=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[2] is not None and (now or datetime.now(tz=LOCAL_TZ)) >= entry[2]:
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key, value, cost=None, expires=None):
+        cost = (len(value) if cost is None else cost) + 64
+        if cost > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (value, cost, expires)
+            self.size += cost
+            while self.size > self.max_bytes and self._entries:
+                self._drop(next(iter(self._entries)))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _drop(self, key):
+        self.size -= self._entries.pop(key)[1]
+
+
+PAGE_CACHE = LRUCache(PAGE_CACHE_MAX_BYTES)
+COMPRESSED_CACHE = LRUCache(COMPRESS_CACHE_MAX_BYTES)
+
+
+def _compress_cache_key(req):
+    # set by _hash_response_body; unique fallback = never share a body
+    return g.get("body_hash") or f"nohash:{id(req)}:{time()}"
+
+
+if Compress is not None:
+    # Komprimierte Bodies werden über einen Hash des Inhalts wiederverwendet:
+    # gleiche Seite (z. B. aus PAGE_CACHE) → gleiche gzip/br-Bytes.
+    app.config.setdefault("COMPRESS_CACHE_BACKEND", lambda: COMPRESSED_CACHE)
+    app.config.setdefault("COMPRESS_CACHE_KEY", _compress_cache_key)
+    Compress(app)
+
+    @app.after_request
+    def _hash_response_body(response):
+        # runs before Flask-Compress (after_request handlers run in reverse order)
+        if not (response.is_streamed or response.direct_passthrough):
+            g.body_hash = hashlib.blake2b(response.get_data(), digest_size=16).hexdigest()
+        return response
+
+
+STATIC_PRECOMPRESS_SUFFIXES = {".css", ".js", ".svg", ".json", ".html", ".txt", ".xml"}
+STATIC_PRECOMPRESSED = {}  # rel path -> (signature, etag, {algorithm: bytes})
+
+
+def _static_encodings(data):
+    encoded = {"gzip": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        encoded["br"] = brotli.compress(data, quality=11)
+    return encoded
+
+
+def _precompressed_static(rel):
+    """(etag, encodings) for a text asset under static/, compressed once per file state."""
+    path = STATIC_DIR / rel
+    try:
+        st = path.stat()
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    sig = (st.st_mtime_ns, st.st_size)
+    cached = STATIC_PRECOMPRESSED.get(rel)
+    if cached and cached[0] == sig:
+        return cached
+    data = path.read_bytes()
+    cached = (sig, hashlib.blake2b(data, digest_size=16).hexdigest(), _static_encodings(data))
+    STATIC_PRECOMPRESSED[rel] = cached
+    return cached
+
+
+def warm_static_precompression():
+    """Compress all text assets (CSS/JS/…) once at startup; images are skipped."""
+    for path in STATIC_DIR.rglob("*"):
+        rel = path.relative_to(STATIC_DIR)
+        if rel.parts and rel.parts[0] == "images":
+            continue
+        if path.is_file() and path.suffix.lower() in STATIC_PRECOMPRESS_SUFFIXES:
+            try:
+                _precompressed_static(rel.as_posix())
+            except OSError as exc:
+                app.logger.warning("Precompression failed for %s: %s", rel, exc)
+
+
+@app.before_request
+def _serve_precompressed_static():
+    if request.endpoint != "static" or request.method not in ("GET", "HEAD") or "Range" in request.headers:
+        return None
+    filename = (request.view_args or {}).get("filename", "")
+    if Path(filename).suffix.lower() not in STATIC_PRECOMPRESS_SUFFIXES or not safe_join(str(STATIC_DIR), filename):
+        return None
+    accepted = request.accept_encodings
+    algorithm = next((a for a in ("br", "gzip") if accepted[a]), None)
+    entry = _precompressed_static(filename) if algorithm else None
+    if entry is None or algorithm not in entry[2]:
+        return None
+    sig, digest, encodings = entry
+    resp = Response(encodings[algorithm], mimetype=mimetypes.guess_type(filename)[0] or "application/octet-stream")
+    resp.headers["Content-Encoding"] = algorithm
+    resp.headers["Vary"] = "Accept-Encoding"
+    resp.set_etag(f"{digest}-{algorithm}")
+    resp.last_modified = datetime.fromtimestamp(sig[0] // 1_000_000_000, tz=tz.UTC)
+    resp.cache_control.public = True
+    resp.cache_control.max_age = app.config["SEND_FILE_MAX_AGE_DEFAULT"]
+    return resp.make_conditional(request)
+
+
+if STATIC_PRECOMPRESS_ON_STARTUP:
+    warm_static_precompression()
+
+
+# --------------------------------------------------
+# Responsive Bilder: verkleinerte AVIF/WebP/JPEG-Varianten
+# --------------------------------------------------
+# Das srcset-Filter verweist auf /img/<Breite>/<Pfad>?v=<Hash>. Die Variante
+# wird beim ersten Abruf (oder direkt nach dem Admin-Upload) mit Pillow
+# erzeugt und unter IMAGE_VARIANT_DIR/<Quell-Hash>/<Breite>.<Format> abgelegt;
+# das Format wählt der Server anhand des Accept-Headers (AVIF > WebP > JPEG).
+IMAGE_VARIANT_SOURCES = {".jpg", ".jpeg", ".png", ".webp"}
+IMAGE_VARIANT_QUALITY = {"avif": 55, "webp": 78, "jpeg": 82}
+IMAGE_INFO = {}  # rel path -> (signature, (hash, width, height))
+_IMAGE_LOCKS = {}
+_IMAGE_LOCKS_GUARD = threading.Lock()
+
+
+def _image_formats():
+    if Image is None:
+        return ()
+    formats = ["webp", "jpeg"]
+    try:
+        from PIL import features
+        if features.check("avif"):
+            formats.insert(0, "avif")
+    except Exception:
+        pass
+    return tuple(formats)
+
+
+IMAGE_VARIANT_FORMATS = _image_formats()
+
+
+def _image_source(path: str):
+    """Local source file for a static image path, or None."""
+    if not path or path.startswith(("http://", "https://", "//")):
+        return None
+    if Path(path).suffix.lower() not in IMAGE_VARIANT_SOURCES:
+        return None
+    full = safe_join(str(STATIC_DIR), path)
+    return Path(full) if full and os.path.isfile(full) else None
+
+
+def image_info(path: str):
+    """(content hash, width, height) of a static image; cached per file version."""
+    src = _image_source(path)
+    if src is None or Image is None:
+        return None
+    st = src.stat()
+    sig = (st.st_mtime_ns, st.st_size)
+    cached = IMAGE_INFO.get(path)
+    if cached and cached[0] == sig:
+        return cached[1]
+    try:
+        digest = hashlib.blake2b(src.read_bytes(), digest_size=8).hexdigest()
+        with Image.open(src) as im:
+            width, height = im.size
+            if im.getexif().get(0x0112) in (5, 6, 7, 8):  # EXIF-Drehung um 90°
+                width, height = height, width
+    except Exception as exc:
+        app.logger.warning("Bild %s nicht lesbar: %s", path, exc)
+        return None
+    info = (digest, width, height)
+    IMAGE_INFO[path] = (sig, info)
+    return info
+
+
+def image_variant_path(path: str, width: int, fmt: str):
+    """Create the variant if needed and return its file path (None if impossible)."""
+    info = image_info(path)
+    if info is None or width not in IMAGE_VARIANT_WIDTHS or fmt not in IMAGE_VARIANT_FORMATS:
+        return None
+    target = IMAGE_VARIANT_DIR / info[0] / f"{width}.{fmt}"
+    if target.exists():
+        return target
+    with _IMAGE_LOCKS_GUARD:
+        lock = _IMAGE_LOCKS.setdefault(info[0], threading.Lock())
+    with lock:  # ein Thread rechnet, parallele Abrufe warten auf das Ergebnis
+        if target.exists():
+            return target
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with Image.open(_image_source(path)) as im:
+            im = ImageOps.exif_transpose(im)
+            if im.width > width:
+                im = im.resize((width, max(1, round(im.height * width / im.width))), Image.LANCZOS)
+            if fmt == "jpeg" and im.mode not in ("RGB", "L"):
+                im = im.convert("RGB")
+            tmp = target.with_name(f".{target.name}.{os.getpid()}.{threading.get_ident()}")
+            im.save(tmp, format=fmt.upper(), quality=IMAGE_VARIANT_QUALITY[fmt])
+        os.replace(tmp, target)
+    return target
+
+
+def generate_image_variants(path: str):
+    """Eagerly build all variants of one image (used after uploads)."""
+    info = image_info(path)
+    if info is None:
+        return 0
+    built = 0
+    for width in IMAGE_VARIANT_WIDTHS:
+        if width < info[1]:
+            for fmt in IMAGE_VARIANT_FORMATS:
+                try:
+                    built += image_variant_path(path, width, fmt) is not None
+                except Exception as exc:
+                    app.logger.warning("Bildvariante %s/%s/%s fehlgeschlagen: %s", path, width, fmt, exc)
+    return built
+
+
+@app.route("/img/<int:width>/<path:filename>")
+def image_variant(width, filename):
+    # nur explizit genannte Formate – "image/*" schicken auch Browser ohne WebP
+    accepted = {value for value, quality in request.accept_mimetypes if quality > 0}
+    fmt = next((f for f in IMAGE_VARIANT_FORMATS if f == "jpeg" or f"image/{f}" in accepted), None)
+    try:
+        target = image_variant_path(filename, width, fmt) if fmt else None
+    except Exception as exc:
+        app.logger.warning("Bildvariante %s/%s fehlgeschlagen: %s", filename, width, exc)
+        target = None
+    if target is None:
+        abort(404)
+    resp = send_file(target, mimetype=f"image/{fmt}", conditional=True,
+                     max_age=app.config["SEND_FILE_MAX_AGE_DEFAULT"])
+    resp.vary.add("Accept")
+    resp.cache_control.public = True
+    return resp
+
+
+def content_version(*filenames):
+    """Version stamp of a set of config files (signature per file)."""
+    return tuple(_file_signature(name) for name in filenames)
+
+
+def _templates_mtime():
+    try:
+        return max((p.stat().st_mtime for p in (BASE_DIR / "templates").rglob("*") if p.is_file()), default=0)
+    except OSError:
+        return 0
+
+
+TEMPLATES_MODIFIED = datetime.fromtimestamp(int(_templates_mtime()), tz=tz.UTC)
+
+
+def _content_window(filenames, now):
+    """(since, until): interval around now in which a page built from
+    filenames cannot change without a file change."""
+    # is_today / Footer-Jahr wechseln um Mitternacht
+    since = datetime.combine(now.date(), datetime.min.time(), tzinfo=LOCAL_TZ)
+    until = since + timedelta(days=1)
+    bounds = []
+    if "opening_days.yaml" in filenames:
+        bounds.append(opening_schedule().change_window(now))
+    if "news.yaml" in filenames:
+        last, nxt = news_index().change_window(now.replace(tzinfo=None))
+        bounds.append((last and last.replace(tzinfo=LOCAL_TZ), nxt and nxt.replace(tzinfo=LOCAL_TZ)))
+    for last, nxt in bounds:
+        if last:
+            since = max(since, last)
+        if nxt:
+            until = min(until, nxt)
+    return since, until
+
+
+def content_validators(filenames, now):
+    """(etag, last_modified, expires) for a page built from filenames."""
+    version = content_version(*filenames)
+    since, until = _content_window(filenames, now)
+    digest = hashlib.sha1(repr((version, until, TEMPLATES_MODIFIED)).encode()).hexdigest()[:20]
+    mtimes = [datetime.fromtimestamp(sig[0] // 1_000_000_000, tz=tz.UTC) for sig in version if sig]
+    last_modified = max([since.astimezone(tz.UTC).replace(microsecond=0), TEMPLATES_MODIFIED, *mtimes])
+    return digest, last_modified, until
+
+
+def _page_cacheable_request():
+    if not PAGE_CACHE_ENABLED or request.method not in ("GET", "HEAD"):
+        return False
+    # nur anonyme Besucher ohne Session-Cookie (Flash, Captcha, Admin …)
+    return app.config["SESSION_COOKIE_NAME"] not in request.cookies
+
+
+def cached_page(*filenames, opening=True):
+    """Serve a public view from PAGE_CACHE while its YAML inputs are unchanged.
+
+    Also answers conditional requests (If-None-Match / If-Modified-Since)
+    with 304 before anything is rendered. opening_days.yaml is a dependency
+    unless opening=False, because public pages show the next opening.
+    """
+    deps = (("opening_days.yaml",) if opening else ()) + filenames
+
+    def decorator(view):
+        @wraps(view)
+        def wrapped(*args, **kwargs):
+            if not _page_cacheable_request():
+                return view(*args, **kwargs)
+            now = datetime.now(tz=LOCAL_TZ)
+            etag, last_modified, expires = content_validators(deps, now)
+            if is_not_modified(etag, last_modified):
+                return not_modified_response(etag, last_modified, public=True)
+            key = (request.url, etag)
+            entry = PAGE_CACHE.get(key, now)
+            if entry is not None:
+                resp = Response(entry[2], status=entry[0], headers=entry[1])
+                resp.headers["X-Page-Cache"] = "HIT"
+                return set_validators(resp, etag, last_modified, public=True)
+            resp = app.make_response(view(*args, **kwargs))
+            if resp.status_code != 200:
+                return resp
+            if (not resp.direct_passthrough
+                    and "Set-Cookie" not in resp.headers
+                    and not session.modified):
+                body = resp.get_data()
+                PAGE_CACHE.set(
+                    key, (resp.status_code, list(resp.headers.items()), body),
+                    cost=len(body) + 512, expires=expires,
+                )
+            resp.headers["X-Page-Cache"] = "MISS"
+            return set_validators(resp, etag, last_modified, public=True)
+        return wrapped
+    return decorator
+
+
+# --------------------------------------------------
+# Kiosk-Inhalte
+# --------------------------------------------------
+KIOSK_CONTENT_FILES = ("opening_days.yaml", "slides.yaml", "news.yaml", "flippers.yaml", "timeline.yaml")
+KIOSK_INFO_SPOTLIGHTS = _freeze([
+    {
+        "type": "info",
+        "eyebrow": "Vor Ort",
+        "title": "So läuft der Spieltag",
+        "text": "Die Flipper stehen bereit – such dir dein Gerät aus und leg los.",
+        "bullets": [
+            "Das Team hilft bei Regeln und Spielmodi",
+            "Highscores und Tipps direkt an den Maschinen",
+            "Fragt uns nach Turnier- oder Challenge-Runden",
+        ],
+    },
+    {
+        "type": "info",
+        "eyebrow": "Community",
+        "title": "Flipper gemeinsam erleben",
+        "text": "Ob Anfänger oder Profi: Hier zählt die Freude am Spiel.",
+        "bullets": [
+            "Austausch über Restaurationsprojekte",
+            "Gemeinsames Schrauben und Technik-Talks",
+            "Offene Abende mit Vereinsmitgliedern",
+        ],
+    },
+    {
+        "type": "info",
+        "eyebrow": "Tipp",
+        "title": "Mehr Punkte, mehr Kontrolle",
+        "text": "Ein ruhiger Stand und guter Überblick machen den Unterschied.",
+        "bullets": [
+            "Nudging ist erlaubt – aber mit Gefühl",
+            "Spielt bewusst auf Multiball-Momente",
+            "Merkt euch die besten Rampen-Kombos",
+        ],
+    },
+])
+
+
+def _unique_images(images):
+    seen = set()
+    unique = []
+    for img in images:
+        if not img or img in seen:
+            continue
+        seen.add(img)
+        unique.append(img)
+    return unique
+
+
+def _kiosk_flipper(flipper):
+    year_raw = flipper.get("year")
+    year_text = str(year_raw) if year_raw else ""
+    digits = "".join(ch for ch in year_text if ch.isdigit())
+    display_year = digits[:4] if len(digits) >= 4 else year_text
+    notes = []
+    detail_notes = []
+    for key in ("features", "notable_facts"):
+        items = flipper.get(key) or []
+        if isinstance(items, list):
+            for item in items:
+                if isinstance(item, str) and item.strip():
+                    cleaned = item.strip()
+                    notes.append(cleaned)
+                    detail_notes.append(cleaned)
+    if not detail_notes:
+        if flipper.get("designer"):
+            detail_notes.append(f"Design: {flipper['designer']}")
+        if flipper.get("system"):
+            detail_notes.append(f"System: {flipper['system']}")
+        if flipper.get("production"):
+            detail_notes.append(f"Produktion: {flipper['production']}")
+    if not notes:
+        notes = detail_notes[:]
+    specs = []
+    if flipper.get("manufacturer"):
+        specs.append(flipper["manufacturer"])
+    if display_year:
+        specs.append(display_year)
+    if flipper.get("system"):
+        specs.append(flipper["system"])
+    entry = dict(flipper)
+    entry["display_year"] = display_year
+    entry["kiosk_notes"] = notes[:2]
+    entry["kiosk_details"] = detail_notes[:4]
+    entry["kiosk_specs"] = " · ".join(specs)
+    entry["kiosk_images"] = _unique_images([entry.get("image"), *(entry.get("image_details") or [])])
+    return entry
+
+
+class KioskContent:
+    """Normalized kiosk data for one content version.
+
+    slides/news/flippers/timeline are prepared once; /kiosk only picks and
+    shuffles, /kiosk/payload.json only reports the version to poll for.
+    """
+
+    def __init__(self, version, now):
+        self.slides = [s if isinstance(s, dict) else {"image": s} for s in load_content("slides.yaml")]
+        self.news = FrozenList(
+            _freeze(dict(article, kiosk_images=_unique_images(
+                [article.get("preview_image"), *(article.get("images") or [])])))
+            for article in load_news_items(now=now.replace(tzinfo=None))[:KIOSK_NEWS_LIMIT]
+        )
+        self.flippers = FrozenList(
+            _freeze(_kiosk_flipper(f)) for f in load_content("flippers.yaml") if isinstance(f, dict)
+        )
+        timeline = list(load_timeline())
+        if len(timeline) > KIOSK_TIMELINE_LIMIT:
+            timeline = timeline[-KIOSK_TIMELINE_LIMIT:]
+        self.timeline = FrozenList(timeline)
+        self.bg_images = [s.get("image") for s in self.slides if s.get("image")] or ["images/slides/hall.jpg"]
+
+        # der Kiosk pollt nur auf Versionswechsel, die Inhalte kommen aus /kiosk
+        self.payload_json = json.dumps({"version": version}).encode()
+
+
+_KIOSK_CONTENT = {}  # etag → KioskContent (only the current version is kept)
+
+
+def kiosk_content(now):
+    """(etag, last_modified, KioskContent) for the current kiosk content version."""
+    etag, last_modified, _ = content_validators(KIOSK_CONTENT_FILES, now)
+    content = _KIOSK_CONTENT.get(etag)
+    if content is None:
+        content = KioskContent(etag, now)
+        _KIOSK_CONTENT.clear()
+        _KIOSK_CONTENT[etag] = content
+    return etag, last_modified, content
+
+
 # --------------------------------------------------
 # Routen
 # --------------------------------------------------
@@ -660,19 +1814,8 @@ def login():
         session["captcha_answer"] = str(a + b)
         return f"{a} + {b}"
 
-    def _attempt_info():
-        info = LOGIN_ATTEMPTS.get(ip)
-        if info and time() - info[1] > LOCKOUT_SECONDS:
-            LOGIN_ATTEMPTS.pop(ip, None)
-            return None
-        return info
-
     def _register_failure():
-        info = _attempt_info()
-        if info:
-            LOGIN_ATTEMPTS[ip] = (info[0] + 1, info[1])
-        else:
-            LOGIN_ATTEMPTS[ip] = (1, time())
+        LOGIN_ATTEMPTS.hit(ip)
 
     def _find_admin(username):
         for admin in admin_accounts:
@@ -739,12 +1882,12 @@ def login():
             LOGIN_ATTEMPTS.pop(ip, None)
             return redirect(url_for("admin"))
 
-        info = _attempt_info()
-        if info and info[0] >= MAX_ATTEMPTS:
+        attempts = LOGIN_ATTEMPTS.hits(ip)
+        if attempts >= MAX_ATTEMPTS:
             flash("Zu viele Fehlversuche. Bitte später erneut versuchen.", "danger")
             app.logger.warning(
-                "Login blocked (rate limit): ip=%s attempts=%s ua=%s",
-                ip, info[0], request.headers.get("User-Agent", "")
+                "Login blocked (rate limit): ip=%s attempts=%.1f ua=%s",
+                ip, attempts, request.headers.get("User-Agent", "")
             )
         else:
             username = request.form.get("username", "")
@@ -805,12 +1948,14 @@ def admin():
     for filename, meta in ADMIN_SECTIONS.items():
         if meta.get("hide_from_dashboard"):
             continue
+        kind = meta.get("kind", "list")
         try:
-            data = load_yaml(filename)
+            data = load_content(filename) if kind != "log" else []
         except Exception:
             data = []
-        kind = meta.get("kind", "list")
-        if kind == "doc":
+        if kind == "log":
+            count = CONTACT_LOG.count()
+        elif kind == "doc":
             count = len(data.keys()) if isinstance(data, dict) else 0
         else:
             count = len(data) if isinstance(data, list) else (len(data.keys()) if isinstance(data, dict) else 0)
@@ -831,6 +1976,10 @@ def admin():
 @app.route("/admin/edit/<path:filename>", methods=["GET", "POST"])
 @login_required
 def admin_edit(filename):
+    if get_admin_section(filename).get("kind") == "log":
+        # der Kontakt-Log liegt in JSONL-Segmenten, eine neue YAML-Datei würde erneut importiert
+        flash("Dieser Bereich kann nicht als Rohdaten bearbeitet werden.", "warning")
+        return redirect(url_for("admin_manage", filename=filename))
     filepath = CONFIG_DIR / filename
     if request.method == "POST":
         json_data = request.form.get("content", "")
@@ -854,8 +2003,20 @@ def admin_edit(filename):
 @login_required
 def admin_manage(filename):
     section = get_admin_section(filename)
+    if section.get("kind") == "log":
+        total = CONTACT_LOG.count()
+        pages = max(1, -(-total // CONTACT_LOG_PAGE_SIZE))
+        page = min(max(request.args.get("page", 1, type=int), 1), pages)
+        return render_template(
+            "admin_manage.html",
+            filename=filename,
+            data=CONTACT_LOG.page(page, CONTACT_LOG_PAGE_SIZE),
+            section=section,
+            read_only=True,
+            pagination={"page": page, "pages": pages, "total": total},
+        )
     schema = section.get("schema")
-    data = load_yaml(filename)
+    data = load_content(filename)
     preview_fields = [f for f in (schema or []) if f.get("preview")]
     schema_map = {f["name"]: f for f in (schema or [])}
     news_settings = load_news_settings() if filename == "news.yaml" else None
@@ -896,7 +2057,7 @@ def admin_doc(filename):
     full_schema = section.get("schema") or []
     filepath = CONFIG_DIR / filename
 
-    raw = load_yaml(filename)
+    raw = load_content(filename)
     if not isinstance(raw, dict):
         raw = {}
     item = {}
@@ -937,7 +2098,7 @@ def admin_doc(filename):
                 new_doc[key] = request.form.get(key, "").strip()
         yaml_content = yaml.safe_dump(new_doc, allow_unicode=True, sort_keys=False)
         filepath.write_text(yaml_content, encoding="utf-8")
-        YAML_CACHE.pop(filename, None)
+        invalidate_content(filename)
         flash("Gespeichert", "success")
         return redirect(url_for("admin_doc", filename=filename))
 
@@ -1058,10 +2219,7 @@ def admin_item(filename, index=None):
         yaml_content = yaml.safe_dump(data, allow_unicode=True, sort_keys=False)
         filepath.write_text(yaml_content, encoding="utf-8")
         # Invalidate YAML cache for this file; next read will reload from disk
-        try:
-            YAML_CACHE.pop(filename, None)
-        except Exception:
-            pass
+        invalidate_content(filename)
         flash("Gespeichert", "success")
         return redirect(url_for("admin_manage", filename=filename))
     return render_template(
@@ -1090,10 +2248,7 @@ def admin_delete(filename, index):
     filepath = CONFIG_DIR / filename
     yaml_content = yaml.safe_dump(data, allow_unicode=True, sort_keys=False)
     filepath.write_text(yaml_content, encoding="utf-8")
-    try:
-        YAML_CACHE.pop(filename, None)
-    except Exception:
-        pass
+    invalidate_content(filename)
     flash("Eintrag gelöscht.", "success")
     return redirect(url_for("admin_manage", filename=filename))
 
@@ -1107,6 +2262,9 @@ def admin_upload():
         upload_dir.mkdir(parents=True, exist_ok=True)
         filename = secure_filename(file.filename)
         file.save(upload_dir / filename)
+        if IMAGE_VARIANT_FORMATS:
+            threading.Thread(target=generate_image_variants, args=(f"images/{filename}",),
+                             name="image-variants", daemon=True).start()
         flash("Bild hochgeladen", "success")
     else:
         flash("Keine Datei ausgewählt", "warning")
@@ -1137,15 +2295,11 @@ def admin_images():
 
 @app.route("/")
 def index():
-    flippers      = load_yaml("flippers.yaml")
+    flippers      = load_content("flippers.yaml")
     home_flippers = random.sample(flippers, min(len(flippers), 6))
-    news_items    = load_news_items()
     news_settings = load_news_settings()
     news_limit    = news_settings.get("homepage_limit", DEFAULT_NEWS_SETTINGS["homepage_limit"])
-    sorted_news   = sorted(news_items,
-                           key=lambda n: n.get("_dt", datetime.min),
-                           reverse=True)
-    news_teaser   = sorted_news[:news_limit] if news_limit else []
+    news_teaser   = load_news_items()[:news_limit] if news_limit else []
     now = datetime.now(tz=tz.gettz("Europe/Berlin"))
 
     return render_template(
@@ -1162,6 +2316,7 @@ def index():
 @app.route("/kiosk")
 def kiosk():
     rng = random.SystemRandom()
+    etag, _, content = kiosk_content(datetime.now(tz=LOCAL_TZ))
     slides = prepare_slides()
     if slides:
         slides = list(slides)
@@ -1174,148 +2329,21 @@ def kiosk():
     if hide_logo_param is not None and str(hide_logo_param).strip().lower() in {"1", "true", "yes", "on"}:
         show_logo = False
 
-    news_items = load_news_items()
-    news_items.sort(key=lambda n: n.get("_dt", datetime.min), reverse=True)
-    latest_news = news_items[:KIOSK_NEWS_LIMIT]
-    rng.shuffle(latest_news)
-    latest_news_prepared = []
-    for article in latest_news:
-        entry = article.copy()
-        images = []
-        if entry.get("preview_image"):
-            images.append(entry["preview_image"])
-        images.extend(entry.get("images") or [])
-        seen = set()
-        unique_images = []
-        for img in images:
-            if not img or img in seen:
-                continue
-            seen.add(img)
-            unique_images.append(img)
-        if unique_images:
-            rng.shuffle(unique_images)
-        entry["kiosk_images"] = unique_images
-        latest_news_prepared.append(entry)
-    latest_news = latest_news_prepared
-
-    flippers = load_yaml("flippers.yaml")
-    kiosk_flippers = []
-    for flipper in flippers:
-        if not isinstance(flipper, dict):
-            continue
-        year_raw = flipper.get("year")
-        year_text = str(year_raw) if year_raw else ""
-        digits = "".join(ch for ch in year_text if ch.isdigit())
-        display_year = digits[:4] if len(digits) >= 4 else year_text
-        notes = []
-        detail_notes = []
-        for key in ("features", "notable_facts"):
-            items = flipper.get(key) or []
-            if isinstance(items, list):
-                for item in items:
-                    if isinstance(item, str) and item.strip():
-                        cleaned = item.strip()
-                        notes.append(cleaned)
-                        detail_notes.append(cleaned)
-        if not detail_notes:
-            if flipper.get("designer"):
-                detail_notes.append(f"Design: {flipper['designer']}")
-            if flipper.get("system"):
-                detail_notes.append(f"System: {flipper['system']}")
-            if flipper.get("production"):
-                detail_notes.append(f"Produktion: {flipper['production']}")
-        if not notes:
-            notes = detail_notes[:]
-        specs = []
-        if flipper.get("manufacturer"):
-            specs.append(flipper["manufacturer"])
-        if display_year:
-            specs.append(display_year)
-        if flipper.get("system"):
-            specs.append(flipper["system"])
-        entry = flipper.copy()
-        entry["display_year"] = display_year
-        entry["kiosk_notes"] = notes[:2]
-        entry["kiosk_details"] = detail_notes[:4]
-        entry["kiosk_specs"] = " · ".join(specs)
-        detail_images = []
-        if entry.get("image"):
-            detail_images.append(entry["image"])
-        detail_images.extend(entry.get("image_details") or [])
-        seen = set()
-        unique_images = []
-        for img in detail_images:
-            if not img or img in seen:
-                continue
-            seen.add(img)
-            unique_images.append(img)
-        if unique_images:
-            rng.shuffle(unique_images)
-        entry["kiosk_images"] = unique_images
-        kiosk_flippers.append(entry)
+    # Normalisierung passiert in KioskContent; hier nur noch Auswahl/Reihenfolge
+    def _shuffled(entry):
+        entry = dict(entry, kiosk_images=list(entry["kiosk_images"]))
+        rng.shuffle(entry["kiosk_images"])
+        return entry
 
+    latest_news = [_shuffled(article) for article in content.news]
+    rng.shuffle(latest_news)
+    kiosk_flippers = list(content.flippers)
     if len(kiosk_flippers) > KIOSK_FLIPPER_LIMIT:
         kiosk_flippers = rng.sample(kiosk_flippers, KIOSK_FLIPPER_LIMIT)
+    kiosk_flippers = [_shuffled(flipper) for flipper in kiosk_flippers]
     rng.shuffle(kiosk_flippers)
 
-    timeline = load_yaml("timeline.yaml")
-    timeline_items = [item for item in timeline if isinstance(item, dict)]
-
-    def _timeline_key(item):
-        try:
-            return parser.parse(item.get("date", ""))
-        except Exception:
-            return datetime.min
-
-    timeline_items.sort(key=_timeline_key)
-    if len(timeline_items) > KIOSK_TIMELINE_LIMIT:
-        timeline_items = timeline_items[-KIOSK_TIMELINE_LIMIT:]
-
-    bg_images = [
-        slide.get("image") for slide in slides
-        if isinstance(slide, dict) and slide.get("image")
-    ]
-    if not bg_images:
-        bg_images = ["images/slides/hall.jpg"]
-
-    info_spotlights = [
-        {
-            "type": "info",
-            "eyebrow": "Vor Ort",
-            "title": "So läuft der Spieltag",
-            "text": "Die Flipper stehen bereit – such dir dein Gerät aus und leg los.",
-            "bullets": [
-                "Das Team hilft bei Regeln und Spielmodi",
-                "Highscores und Tipps direkt an den Maschinen",
-                "Fragt uns nach Turnier- oder Challenge-Runden",
-            ],
-        },
-        {
-            "type": "info",
-            "eyebrow": "Community",
-            "title": "Flipper gemeinsam erleben",
-            "text": "Ob Anfänger oder Profi: Hier zählt die Freude am Spiel.",
-            "bullets": [
-                "Austausch über Restaurationsprojekte",
-                "Gemeinsames Schrauben und Technik-Talks",
-                "Offene Abende mit Vereinsmitgliedern",
-            ],
-        },
-        {
-            "type": "info",
-            "eyebrow": "Tipp",
-            "title": "Mehr Punkte, mehr Kontrolle",
-            "text": "Ein ruhiger Stand und guter Überblick machen den Unterschied.",
-            "bullets": [
-                "Nudging ist erlaubt – aber mit Gefühl",
-                "Spielt bewusst auf Multiball-Momente",
-                "Merkt euch die besten Rampen-Kombos",
-            ],
-        },
-    ]
-    for info in info_spotlights:
-        info["image"] = rng.choice(bg_images)
-
+    info_spotlights = [dict(info, image=rng.choice(content.bg_images)) for info in KIOSK_INFO_SPOTLIGHTS]
     kiosk_spotlights = (
         [{"type": "news", "article": article} for article in latest_news]
         + [{"type": "flipper", "flipper": flipper} for flipper in kiosk_flippers]
@@ -1331,13 +2359,26 @@ def kiosk():
         opening=get_next_opening(),
         latest_news=latest_news,
         kiosk_flippers=kiosk_flippers,
-        timeline=timeline_items,
+        timeline=content.timeline,
         kiosk_spotlights=kiosk_spotlights,
         show_logo=show_logo,
+        kiosk_version=etag,
+        kiosk_poll_ms=KIOSK_POLL_SECONDS * 1000,
         body_class="kiosk-mode"
     )
 
+
+@app.route("/kiosk/payload.json")
+def kiosk_payload():
+    """Aktuelle Kiosk-Version; der Kiosk pollt hier und lädt nur bei neuer Version neu."""
+    etag, last_modified, content = kiosk_content(datetime.now(tz=LOCAL_TZ))
+    if is_not_modified(etag, last_modified):
+        return not_modified_response(etag, last_modified, public=True)
+    resp = Response(content.payload_json, mimetype="application/json")
+    return set_validators(resp, etag, last_modified, public=True)
+
 @app.route("/preise")
+@cached_page()
 def preise():
     """Preise‑/Besucherinfos anzeigen."""
     return render_template(
@@ -1346,60 +2387,44 @@ def preise():
     )
 
 @app.route("/verein")
+@cached_page("timeline.yaml", "members.yaml")
 def verein():
-    # Timeline‑Milestones laden
-    timeline = load_yaml("timeline.yaml")
-    # chronologisch sortiert – falls im YAML durcheinander
-    timeline.sort(key=lambda x: parser.parse(x["date"]))
     return render_template(
         "verein.html",
         opening=get_next_opening(),
-        timeline=timeline,
-        members=load_yaml("members.yaml")  # für Team‑Section auf gleicher Seite
+        timeline=load_timeline(),
+        members=load_content("members.yaml")  # für Team‑Section auf gleicher Seite
     )
 
 @app.route("/team")
+@cached_page("members.yaml")
 def team():
     return render_template("team.html",
-                           members = load_yaml("members.yaml"),
+                           members = load_content("members.yaml"),
                            opening = get_next_opening())
 
 
 @app.route("/flipper")
+@cached_page("flippers.yaml")
 def flipper_all():
     """
     Reise durch unsere Flipper‑Epochen:
-    • lädt flippers.yaml
+    • lädt flippers.yaml (vorbereitet pro Datei‑Stand, s. load_flipper_epochs)
     • sortiert chronologisch
     • berechnet Jahrzehnt‑Label (70er, 80er …)
     """
-    flippers = load_yaml("flippers.yaml")
-
-    # Erwartet: jedes Objekt hat mindestens "name", "image", "year"
-    for f in flippers:
-        raw_year = f.get("year", "")
-        try:
-            # Nur die ersten vier Ziffern als Jahr verwenden
-            year = int(str(raw_year)[:4])
-            f["year"] = year
-            f["decade_label"] = f"{(year // 10) * 10}er"
-        except (ValueError, TypeError):
-            f["year"] = 0
-            f["decade_label"] = "Unbekannt"
-
-    # chronologisch (ältestes zuerst)
-    flippers.sort(key=lambda f: f["year"] or 9999)
-
     return render_template(
         "flipper_all.html",
-        flippers=flippers,
+        flippers=load_flipper_epochs(),
         opening=get_next_opening()
     )
 
 @app.route("/news")
+@cached_page("news.yaml")
 def news_list():
     """News‑Liste mit Filterung nach Jahr, Kategorie und Suchbegriff."""
-    visible_news = load_news_items()
+    index = news_index()
+    visible_news = index.visible()
 
     # -----------------------
     # URL‑Parameter auslesen
@@ -1408,14 +2433,11 @@ def news_list():
     selected_categories = request.args.getlist("category")
     q                   = request.args.get("q", "").strip()
 
-    # -----------------------
-    # Zusatzinfos vorbereiten
-    # -----------------------
-    news = list(visible_news)
-
     # -----------------------
     # Filter anwenden
     # -----------------------
+    # Alle Listen im Index sind bereits nach Datum absteigend sortiert.
+    news = visible_news
     # Filter by one or multiple years chosen via checkboxes
     if years_param:
         try:
@@ -1423,37 +2445,33 @@ def news_list():
         except ValueError:
             years_sel = set()
         if years_sel:
-            news = [n for n in news if n.get("_year") in years_sel]
+            now = _local_now()
+            news = [
+                n
+                for year in sorted(years_sel, reverse=True)
+                for n in index.by_year.get(year, ())
+                if news_is_visible(n, now)
+            ]
     if selected_categories:
-        news = [n for n in news if n.get("category") in selected_categories]
+        categories_sel = set(selected_categories)
+        news = [n for n in news if n.get("category") in categories_sel]
     if q:
         q_lower = q.lower()
-        news = [n for n in news if q_lower in n.get("title", "").lower()]
-
-    # -----------------------
-    # Sortierung
-    # -----------------------
-    news.sort(key=lambda x: x.get("_dt", datetime.min), reverse=True)
-
-    # -----------------------
-    # Dropdown‑Werte berechnen
-    # -----------------------
-    years = sorted({n.get("_year") for n in visible_news if n.get("_year")}, reverse=True)
-    categories = sorted({n.get("category") for n in visible_news if n.get("category")})
+        news = [n for n in news if q_lower in n["_title_lower"]]
 
     return render_template(
         "news_list.html",
         news=news,
-        years=years,
-        categories=categories,
+        years=index.visible_years(),
+        categories=index.visible_categories(),
         opening=get_next_opening()
     )
 
 @app.route("/news/<slug>")
+@cached_page("news.yaml")
 def news_detail(slug):
-    news = load_news_items(include_hidden=True)
-    article = next((n for n in news if n["slug"] == slug), None)
-    if article is None or not news_is_visible(article):
+    article = news_index().get_visible(slug)
+    if article is None:
         return redirect(url_for("news_list"))
     if article.get("youtube_links"):
         g.force_cookie_banner = True
@@ -1465,42 +2483,11 @@ def news_detail(slug):
 def kontakt():
     ip = request.remote_addr or "?"
 
-    def _save_submission(payload: dict):
-        path = CONFIG_DIR / "contact_submissions.yaml"
-        try:
-            existing = []
-            if path.exists():
-                with open(path, encoding="utf-8") as f:
-                    existing = yaml.safe_load(f) or []
-            existing.append(payload)
-            with open(path, "w", encoding="utf-8") as f:
-                yaml.safe_dump(existing, f, allow_unicode=True, sort_keys=False)
-        except Exception as e:
-            raise e
-
     def _generate_captcha():
         a, b = random.randint(1, 9), random.randint(1, 9)
         session["captcha_answer"] = str(a + b)
         return f"{a} + {b}"
 
-    def _attempt_info():
-        info = CONTACT_ATTEMPTS.get(ip)
-        if info and time() - info[1] > CONTACT_WINDOW_SECONDS:
-            CONTACT_ATTEMPTS.pop(ip, None)
-            return None
-        return info
-
-    def _register_attempt():
-        info = _attempt_info()
-        if info:
-            CONTACT_ATTEMPTS[ip] = (info[0] + 1, info[1])
-        else:
-            CONTACT_ATTEMPTS[ip] = (1, time())
-
-    def _is_rate_limited():
-        info = _attempt_info()
-        return info and info[0] >= CONTACT_MAX_ATTEMPTS
-
     if request.method == "POST":
         # Honeypot
         if request.form.get("website"):
@@ -1508,14 +2495,14 @@ def kontakt():
             flash("Nachricht gesendet.", "success")
             return redirect(url_for("kontakt"))
 
-        if _is_rate_limited():
+        if CONTACT_ATTEMPTS.is_limited(ip):
             flash("Zu viele Anfragen. Bitte später erneut versuchen.", "danger")
             app.logger.warning(
                 "Kontaktformular: Rate limit ausgelöst: ip=%s ua=%s",
                 ip, request.headers.get("User-Agent", "")
             )
             return redirect(url_for("kontakt"))
-        _register_attempt()
+        CONTACT_ATTEMPTS.hit(ip)
 
         name    = request.form.get("name", "").strip()
         email   = request.form.get("email", "").strip()
@@ -1554,7 +2541,7 @@ def kontakt():
             return redirect(url_for("kontakt"))
         session.pop("captcha_answer", None)
         try:
-            _save_submission(payload)
+            CONTACT_LOG.append(payload)
         except Exception as e:
             app.logger.exception("Kontaktformular: Speicherung fehlgeschlagen")
             flash(f"Nachricht gesendet, aber Archivierung fehlgeschlagen: {e}", "warning")
@@ -1566,17 +2553,20 @@ def kontakt():
     return render_template("contact.html", opening=get_next_opening(), captcha_question=question)
 
 @app.route("/impressum")
+@cached_page()
 def impressum():
     return render_template("impressum.html",
                            opening=get_next_opening())
 
 
 @app.route("/robots.txt")
+@cached_page(opening=False)
 def robots():
     txt = "User-agent: *\nAllow: /\nSitemap: https://aixtraball.de/sitemap.xml"
     return Response(txt, mimetype="text/plain")
 
 @app.route("/sitemap.xml")
+@cached_page("news.yaml", opening=False)
 def sitemap():
     pages = [
         {"loc": url_for('index',      _external=True)},
@@ -0,0 +1,41 @@
+"""
+Conditional GET helpers (ETag / Last-Modified / 304) for the public pages in
+app.py (cached_page, kiosk payload) and the intern feeds.
+
+Only depends on Flask, so importing it never pulls in the member portal.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime
+
+from flask import Response, request
+
+
+def make_etag(*parts) -> str:
+    """Short, stable validator built from arbitrary version parts."""
+    return hashlib.sha1(repr(parts).encode()).hexdigest()[:20]
+
+
+def is_not_modified(etag: str, last_modified: datetime | None) -> bool:
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and last_modified:
+        return last_modified <= request.if_modified_since
+    return False
+
+
+def set_validators(resp: Response, etag: str, last_modified: datetime | None,
+                   public: bool = False) -> Response:
+    """public=True for anonymous pages that shared caches may keep (revalidated)."""
+    # weak ETag: Flask-Compress leaves it untouched for every encoding
+    resp.set_etag(etag, weak=True)
+    if last_modified:
+        resp.last_modified = last_modified
+    resp.headers["Cache-Control"] = "no-cache" if public else "private, no-cache"
+    return resp
+
+
+def not_modified_response(etag: str, last_modified: datetime | None, public: bool = False) -> Response:
+    return set_validators(Response(status=304), etag, last_modified, public)
@@ -4,6 +4,7 @@ Intern Blueprint — Aixtraball Mitgliederportal
 
 from __future__ import annotations
 
+import os
 import time
 
 import yaml
@@ -12,7 +13,9 @@ from flask import Blueprint, Flask, Request, g
 import re
 import unicodedata
 
-from .models import Base, Machine, Member, SessionLocal, engine
+from .auth import invalidate_member_cache
+from .migrations import run_migrations
+from .models import Machine, Member, SessionLocal, effective_db_settings, engine
 
 BUILD_ID = f"intern-{int(time.time())}"
 
@@ -76,6 +79,7 @@ def _sync_members_from_yaml(app: Flask) -> None:
 
     db = SessionLocal()
     try:
+        renamed = False
         for m in members_data:
             name = (m.get("name") or "").strip()
             if not name:
@@ -86,7 +90,10 @@ def _sync_members_from_yaml(app: Flask) -> None:
                 db.add(Member(email=email, display_name=name, is_active=True))
             elif existing.display_name != name:
                 existing.display_name = name
+                renamed = True
         db.commit()
+        if renamed:
+            invalidate_member_cache()
     except Exception as exc:
         db.rollback()
         app.logger.error("Member sync failed: %s", exc)
@@ -138,44 +145,25 @@ def create_intern_blueprint(app: Flask) -> None:
     app.config["MAX_CONTENT_LENGTH"] = None
     app.config.setdefault("PERMANENT_SESSION_LIFETIME", timedelta(days=30))
 
-    # Create all tables (idempotent)
-    Base.metadata.create_all(engine)
+    app.logger.info("Intern DB: %s", effective_db_settings())
 
-    # Migrate: add new columns to auth_token if they don't exist yet
-    with engine.connect() as conn:
-        for col, definition in [
-            ("pin_code", "VARCHAR(6)"),
-            ("attempt_count", "INTEGER NOT NULL DEFAULT 0"),
-        ]:
-            try:
-                conn.execute(__import__("sqlalchemy").text(
-                    f"ALTER TABLE auth_token ADD COLUMN {col} {definition}"
-                ))
-                conn.commit()
-            except Exception:
-                pass  # column already exists
+    # Schema migrations (applied once, recorded in schema_version)
+    run_migrations(engine)
 
-    with engine.connect() as conn:
-        for col, definition in [
-            ("section", "VARCHAR(100)"),
-            # event.min_members
-        ]:
-            try:
-                conn.execute(__import__("sqlalchemy").text(
-                    f"ALTER TABLE info_page ADD COLUMN {col} {definition}"
-                ))
-                conn.commit()
-            except Exception:
-                pass
+    # Outbound mail: requests enqueue, one sender thread per worker delivers
+    from .mail_queue import MailQueue
+    mail_queue = MailQueue(engine)
+    app.extensions["mail_queue"] = mail_queue
+    if not app.testing and os.environ.get("MAIL_QUEUE_WORKER", "true").lower() not in {"0", "false", "no"}:
+        mail_queue.start()
 
-    with engine.connect() as conn:
-        try:
-            conn.execute(__import__("sqlalchemy").text(
-                "ALTER TABLE event ADD COLUMN min_members INTEGER"
-            ))
-            conn.commit()
-        except Exception:
-            pass
+    # Repair media: re-encode/thumbnail uploads off-request
+    from .media_processing import MediaProcessor
+    from .routes_repairs import UPLOAD_DIR
+    media_processor = MediaProcessor(UPLOAD_DIR)
+    app.extensions["media_processor"] = media_processor
+    if not app.testing:
+        media_processor.resume_pending()
 
     # Sync machines and members from YAML
     _sync_machines_from_yaml(app)
@@ -191,6 +179,7 @@ def create_intern_blueprint(app: Flask) -> None:
     from .routes_contacts import contacts_bp
     from .routes_todos import todos_bp
     from .routes_parts import parts_bp
+    from .routes_search import search_bp
 
     intern_bp.register_blueprint(pwa_bp)
     intern_bp.register_blueprint(auth_bp)
@@ -201,6 +190,7 @@ def create_intern_blueprint(app: Flask) -> None:
     intern_bp.register_blueprint(contacts_bp)
     intern_bp.register_blueprint(todos_bp)
     intern_bp.register_blueprint(parts_bp)
+    intern_bp.register_blueprint(search_bp)
 
     # Make generate_csrf_token and build_id available in all intern templates
     from .auth import generate_csrf_token
@@ -5,11 +5,66 @@ Member authentication helpers for the intern portal.
 from __future__ import annotations
 
 import secrets
+import threading
+import time
+from collections import OrderedDict
 from functools import wraps
+from typing import NamedTuple
 
 from flask import g, redirect, session, url_for
 
-from .models import Member, SessionLocal
+from .models import Member, SessionLocal, bump_cache_version, get_cache_version
+
+MEMBER_CACHE_NAME = "members"
+IDENTITY_TTL = 300.0      # seconds
+IDENTITY_CACHE_SIZE = 256
+
+
+class MemberIdentity(NamedTuple):
+    """Immutable snapshot of the logged-in member (g.current_member).
+
+    Views that need the ORM object (relationships, writes) load it with
+    db.get(Member, g.current_member.id).
+    """
+    id: int
+    email: str
+    display_name: str | None
+    is_active: bool
+
+    def get_display_name(self) -> str:
+        return self.display_name or self.email.split("@")[0]
+
+
+# member_id -> (members version, expires_at, identity)
+_identities: OrderedDict[int, tuple[int, float, MemberIdentity]] = OrderedDict()
+_identities_lock = threading.Lock()
+
+
+def invalidate_member_cache() -> None:
+    """Call after committing changes to members (name, active flag …) — all workers."""
+    with _identities_lock:
+        _identities.clear()
+    bump_cache_version(MEMBER_CACHE_NAME)
+
+
+def _load_identity(member_id: int) -> MemberIdentity | None:
+    version = get_cache_version(MEMBER_CACHE_NAME)
+    now = time.monotonic()
+    with _identities_lock:
+        cached = _identities.get(member_id)
+        if cached and cached[0] == version and cached[1] > now:
+            _identities.move_to_end(member_id)
+            return cached[2]
+    member = _get_db_for_auth().get(Member, member_id)
+    if member is None:
+        return None
+    identity = MemberIdentity(member.id, member.email, member.display_name, bool(member.is_active))
+    with _identities_lock:
+        _identities[member_id] = (version, now + IDENTITY_TTL, identity)
+        _identities.move_to_end(member_id)
+        while len(_identities) > IDENTITY_CACHE_SIZE:
+            _identities.popitem(last=False)
+    return identity
 
 
 def member_required(view):
@@ -18,8 +73,7 @@ def member_required(view):
         member_id = session.get("member_id")
         if not member_id:
             return redirect(url_for("intern.auth.login"))
-        db = _get_db_for_auth()
-        member = db.get(Member, member_id)
+        member = _load_identity(member_id)
         if not member or not member.is_active:
             session.pop("member_id", None)
             session.pop("member_email", None)
@@ -29,7 +83,7 @@ def member_required(view):
     return wrapped
 
 
-def get_current_member() -> Member | None:
+def get_current_member() -> MemberIdentity | None:
     return getattr(g, "current_member", None)
 
 
@@ -4,10 +4,10 @@ Email utilities for the intern portal (magic link + PIN delivery).
 
 from __future__ import annotations
 
-import os
-import smtplib
 from email.message import EmailMessage
 
+from flask import current_app
+
 
 def _html_email(verify_url: str, pin_code: str, logo_url: str = "") -> str:
     if logo_url:
@@ -148,33 +148,21 @@ Falls du keinen Login angefordert hast, ignoriere diese E-Mail.
 """
 
 
-def send_magic_link_email(to_email: str, verify_url: str, pin_code: str, logo_url: str = "") -> None:
-    smtp_host = os.environ.get("SMTP_HOST")
-    smtp_port = int(os.environ.get("SMTP_PORT", 587))
-    smtp_user = os.environ.get("SMTP_USERNAME")
-    smtp_pass = os.environ.get("SMTP_PASSWORD")
-    smtp_sender = os.environ.get("SMTP_SENDER") or smtp_user
-    use_tls = str(os.environ.get("SMTP_USE_TLS", "true")).lower() in {"1", "true", "yes"}
-
-    if not smtp_host or not smtp_sender:
-        raise RuntimeError("SMTP nicht konfiguriert (SMTP_HOST, SMTP_SENDER fehlen).")
-
+def build_magic_link_email(to_email: str, verify_url: str, pin_code: str,
+                           sender: str, logo_url: str = "") -> EmailMessage:
     msg = EmailMessage()
     msg["Subject"] = f"Dein Login-Code: {pin_code}"
-    msg["From"] = smtp_sender
+    msg["From"] = sender
     msg["To"] = to_email
     msg.set_content(_text_fallback(verify_url, pin_code))
     msg.add_alternative(_html_email(verify_url, pin_code, logo_url), subtype="html")
+    return msg
 
-    if use_tls:
-        with smtplib.SMTP(smtp_host, smtp_port) as server:
-            server.ehlo()
-            server.starttls()
-            if smtp_user and smtp_pass:
-                server.login(smtp_user, smtp_pass)
-            server.send_message(msg)
-    else:
-        with smtplib.SMTP(smtp_host, smtp_port) as server:
-            if smtp_user and smtp_pass:
-                server.login(smtp_user, smtp_pass)
-            server.send_message(msg)
+
+def send_magic_link_email(to_email: str, verify_url: str, pin_code: str, logo_url: str = "") -> None:
+    """Queue the login mail; the mail queue thread delivers it (see mail_queue.py)."""
+    queue = current_app.extensions["mail_queue"]
+    if not queue.settings.configured:
+        raise RuntimeError("SMTP nicht konfiguriert (SMTP_HOST, SMTP_SENDER fehlen).")
+    msg = build_magic_link_email(to_email, verify_url, pin_code, queue.settings.sender, logo_url)
+    queue.enqueue(msg, kind="magic_link")
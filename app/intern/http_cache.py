@@ -0,0 +1,14 @@
+"""
+Re-export of the shared conditional GET helpers (app/http_cache.py).
+"""
+
+try:
+    from ..http_cache import (
+        is_not_modified, make_etag, not_modified_response, set_validators,
+    )
+except ImportError:  # intern als Top-Level-Paket geladen (gunicorn app:app)
+    from http_cache import (
+        is_not_modified, make_etag, not_modified_response, set_validators,
+    )
+
+__all__ = ["is_not_modified", "make_etag", "not_modified_response", "set_validators"]
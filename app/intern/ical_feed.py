@@ -0,0 +1,156 @@
+"""
+Cached iCal feed for the intern calendar.
+
+Calendar apps poll /intern/ical every few minutes per subscribed member. The
+feed is therefore served from a per-worker snapshot keyed by the shared
+"events" cache version (see CacheVersion): every VEVENT is serialized once and
+reused for all members and variants; on a version change only events whose
+updated_at moved are serialized again. Conditional requests are answered from
+the version stamp alone (ETag only: no timestamp moves when an event is
+deleted or an assignment changes, so there is no Last-Modified).
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy import select
+
+from .models import Event, EventAssignment, bump_cache_version, get_cache_version
+
+EVENTS_CACHE_NAME = "events"
+
+CALENDAR_HEADER = (
+    "BEGIN:VCALENDAR\r\n"
+    "VERSION:2.0\r\n"
+    "PRODID:-//Aixtraball//Intern//DE\r\n"
+    "X-WR-CALNAME:Aixtraball Termine\r\n"
+    "X-WR-TIMEZONE:Europe/Berlin\r\n"
+    "CALSCALE:GREGORIAN\r\n"
+    "METHOD:PUBLISH\r\n"
+)
+CALENDAR_FOOTER = "END:VCALENDAR\r\n"
+
+
+@dataclass(frozen=True)
+class FeedEvent:
+    id: int
+    start_dt: datetime
+    end_dt: datetime | None
+    updated_at: datetime | None
+    vevent: str
+
+
+@dataclass
+class FeedSnapshot:
+    version: int
+    events: list[FeedEvent]                       # non-archived, by start_dt
+    assignments: dict[int, frozenset[int]]        # member_id -> event ids
+    _full: str | None = field(default=None, repr=False)
+
+    def full_calendar(self) -> str:
+        if self._full is None:
+            self._full = render_calendar(self.events)
+        return self._full
+
+    def select(self, member_id: int | None = None,
+               start: datetime | None = None, end: datetime | None = None) -> list[FeedEvent]:
+        """Events of one member and/or overlapping [start, end)."""
+        mine = self.assignments.get(member_id, frozenset()) if member_id is not None else None
+        return [
+            e for e in self.events
+            if (mine is None or e.id in mine)
+            and (end is None or e.start_dt < end)
+            and (start is None or (e.end_dt or e.start_dt) >= start)
+        ]
+
+
+def ical_escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace(",", "\\,").replace(";", "\\;")
+
+
+def serialize_event(e) -> str:
+    # DTSTAMP = last change, so the block is stable and can be cached
+    stamp = (e.updated_at or e.created_at).strftime("%Y%m%dT%H%M%SZ")
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{e.id}@aixtraball.de",
+        f"DTSTAMP:{stamp}",
+        f"DTSTART;TZID=Europe/Berlin:{e.start_dt.strftime('%Y%m%dT%H%M%S')}",
+    ]
+    if e.end_dt:
+        lines.append(f"DTEND;TZID=Europe/Berlin:{e.end_dt.strftime('%Y%m%dT%H%M%S')}")
+    lines.append(f"SUMMARY:{ical_escape(e.title)}")
+    if e.description:
+        lines.append(f"DESCRIPTION:{ical_escape(e.description)}")
+    if e.location:
+        lines.append(f"LOCATION:{ical_escape(e.location)}")
+    lines.append("END:VEVENT")
+    return "\r\n".join(lines) + "\r\n"
+
+
+def render_calendar(events: list[FeedEvent]) -> str:
+    return CALENDAR_HEADER + "".join(e.vevent for e in events) + CALENDAR_FOOTER
+
+
+def parse_window_bound(value: str, today: date) -> datetime | None:
+    """'2026-05-01' or a day offset relative to today ('-30', '+90'); '' → None."""
+    value = value.strip()
+    if not value:
+        return None
+    # ValueError / OverflowError (huge offsets) → 400 in the route
+    if value.lstrip("+-").isdigit():
+        day = today + timedelta(days=int(value))
+    else:
+        day = date.fromisoformat(value)
+    return datetime.combine(day, time.min)
+
+
+# Per-worker snapshot; the version lives in the shared DB
+_snapshot: FeedSnapshot | None = None
+_snapshot_lock = threading.Lock()
+
+
+def invalidate_events() -> None:
+    """Call after committing changes to events or assignments — all workers."""
+    bump_cache_version(EVENTS_CACHE_NAME)
+
+
+def current_version() -> int:
+    return get_cache_version(EVENTS_CACHE_NAME)
+
+
+def get_snapshot(db, version: int | None = None) -> FeedSnapshot:
+    """Snapshot for the shared version, rebuilt only when the version moved."""
+    global _snapshot
+    if version is None:
+        version = current_version()
+    current = _snapshot
+    if current is not None and current.version == version:
+        return current
+    with _snapshot_lock:
+        current = _snapshot
+        if current is None or current.version != version:
+            current = _build_snapshot(db, version, current)
+            _snapshot = current
+    return current
+
+
+def _build_snapshot(db, version: int, previous: FeedSnapshot | None) -> FeedSnapshot:
+    reuse = {(e.id, e.updated_at): e for e in previous.events} if previous else {}
+    events = []
+    for e in db.scalars(select(Event).where(Event.is_archived == False).order_by(Event.start_dt)):
+        cached = reuse.get((e.id, e.updated_at))
+        if cached is None:
+            cached = FeedEvent(e.id, e.start_dt, e.end_dt, e.updated_at, serialize_event(e))
+        events.append(cached)
+    assignments: dict[int, set[int]] = {}
+    for member_id, event_id in db.execute(select(EventAssignment.member_id, EventAssignment.event_id)):
+        assignments.setdefault(member_id, set()).add(event_id)
+    return FeedSnapshot(
+        version=version,
+        events=events,
+        assignments={m: frozenset(ids) for m, ids in assignments.items()},
+    )
@@ -0,0 +1,345 @@
+"""
+Durable outbound mail queue (table outbound_mail in intern.db).
+
+Request handlers only enqueue; a daemon thread per worker process claims
+due mails atomically (so several gunicorn workers can drain the same
+queue), sends them over one reused SMTP connection and reschedules
+failures with exponential backoff. A circuit breaker stops hammering an
+unreachable relay.
+
+Mails carry magic links and login PINs, so a sent row keeps no message
+source and the sender thread purges finished rows (sent after a few hours,
+failed after a few days).
+"""
+
+from __future__ import annotations
+
+import atexit
+import email
+import email.policy
+import logging
+import os
+import smtplib
+import threading
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from email.message import EmailMessage
+from email.utils import getaddresses
+
+from sqlalchemy import and_, delete, insert, or_, select, update
+
+from .models import OutboundMail, now_utc
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SmtpSettings:
+    host: str | None
+    port: int = 587
+    username: str | None = None
+    password: str | None = None
+    sender: str | None = None
+    use_tls: bool = True
+    timeout: float = 15.0
+
+    @classmethod
+    def from_env(cls) -> "SmtpSettings":
+        username = os.environ.get("SMTP_USERNAME")
+        return cls(
+            host=os.environ.get("SMTP_HOST"),
+            port=int(os.environ.get("SMTP_PORT", 587)),
+            username=username,
+            password=os.environ.get("SMTP_PASSWORD"),
+            sender=os.environ.get("SMTP_SENDER") or username,
+            use_tls=str(os.environ.get("SMTP_USE_TLS", "true")).lower() in {"1", "true", "yes"},
+            timeout=float(os.environ.get("SMTP_TIMEOUT", 15)),
+        )
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.host and self.sender)
+
+
+class CircuitBreaker:
+    """Opens after `threshold` consecutive failures; one trial send after `cooldown` s."""
+
+    def __init__(self, threshold: int = 5, cooldown: float = 60.0, clock=time.monotonic):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self.failures = 0
+        self.opened_at: float | None = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half-open" if self.clock() - self.opened_at >= self.cooldown else "open"
+
+    def allow(self) -> bool:
+        return self.state != "open"
+
+    def retry_in(self) -> float:
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.cooldown - (self.clock() - self.opened_at))
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.failures >= self.threshold or self.opened_at is not None:
+            self.opened_at = self.clock()
+
+
+class SmtpConnection:
+    """One SMTP session reused across mails; reconnects when idle or dropped."""
+
+    def __init__(self, settings: SmtpSettings, idle_timeout: float = 30.0, factory=smtplib.SMTP):
+        self.settings = settings
+        self.idle_timeout = idle_timeout
+        self.factory = factory
+        self._server: smtplib.SMTP | None = None
+        self._last_used = 0.0
+
+    def _connect(self) -> smtplib.SMTP:
+        s = self.settings
+        server = self.factory(s.host, s.port, timeout=s.timeout)
+        try:
+            server.ehlo()
+            if s.use_tls:
+                server.starttls()
+                server.ehlo()
+            if s.username and s.password:
+                server.login(s.username, s.password)
+        except Exception:
+            server.close()
+            raise
+        return server
+
+    def send(self, msg: EmailMessage, recipients: list[str]) -> None:
+        if self._server is not None and time.monotonic() - self._last_used > self.idle_timeout:
+            self.close()
+        if self._server is None:
+            self._server = self._connect()
+            fresh = True
+        else:
+            fresh = False
+        try:
+            self._server.send_message(msg, from_addr=self.settings.sender, to_addrs=recipients)
+        except smtplib.SMTPServerDisconnected:
+            self.close()
+            if fresh:
+                raise
+            self._server = self._connect()
+            self._server.send_message(msg, from_addr=self.settings.sender, to_addrs=recipients)
+        self._last_used = time.monotonic()
+
+    def close_if_idle(self) -> None:
+        if self._server is not None and time.monotonic() - self._last_used > self.idle_timeout:
+            self.close()
+
+    def close(self) -> None:
+        server, self._server = self._server, None
+        if server is not None:
+            try:
+                server.quit()
+            except Exception:
+                server.close()
+
+
+# "authentication required/failed" from MAIL FROM is a relay problem, not the message's
+_AUTH_CODES = {530, 534, 535, 538}
+
+
+def _rejected_permanently(exc: Exception) -> bool:
+    """5xx for this message's sender, recipients or content; everything else
+    (auth, TLS/HELO, 4xx, network) is retried and counts for the breaker."""
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return bool(exc.recipients) and all(code >= 500 for code, _ in exc.recipients.values())
+    if isinstance(exc, (smtplib.SMTPSenderRefused, smtplib.SMTPDataError)):
+        return exc.smtp_code >= 500 and exc.smtp_code not in _AUTH_CODES
+    return False
+
+
+class MailQueue:
+    LEASE = timedelta(minutes=5)  # a "sending" row older than this is retried
+
+    def __init__(self, engine, settings: SmtpSettings | None = None, *,
+                 max_attempts: int = 8, base_delay: float = 30.0, max_delay: float = 3600.0,
+                 poll_interval: float = 10.0, breaker: CircuitBreaker | None = None,
+                 connection: SmtpConnection | None = None,
+                 keep_sent: timedelta = timedelta(hours=6), keep_failed: timedelta = timedelta(days=7),
+                 purge_interval: float = 600.0):
+        self.engine = engine
+        self.settings = settings or SmtpSettings.from_env()
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        self.breaker = breaker or CircuitBreaker()
+        self.connection = connection or SmtpConnection(self.settings)
+        self.keep_sent = keep_sent
+        self.keep_failed = keep_failed
+        self.purge_interval = purge_interval
+        self._next_purge = 0.0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    # ── producer side ────────────────────────────────────────────────────────
+
+    def enqueue(self, msg: EmailMessage, kind: str = "mail") -> int:
+        """Store the mail and return immediately; raises if SMTP is not configured."""
+        if not self.settings.configured:
+            raise RuntimeError("SMTP nicht konfiguriert (SMTP_HOST, SMTP_SENDER fehlen).")
+        recipients = [addr for _, addr in getaddresses(
+            msg.get_all("To", []) + msg.get_all("Cc", []) + msg.get_all("Bcc", [])
+        ) if addr]
+        if not recipients:
+            raise ValueError("Mail without recipients")
+        del msg["Bcc"]
+        with self.engine.begin() as conn:
+            mail_id = conn.execute(
+                insert(OutboundMail).values(
+                    kind=kind,
+                    recipients=",".join(recipients),
+                    message=msg.as_string(),
+                    status="pending",
+                    attempts=0,
+                    next_attempt_at=now_utc(),
+                    created_at=now_utc(),
+                ).returning(OutboundMail.id)
+            ).scalar_one()
+        self._wake.set()
+        return mail_id
+
+    # ── consumer side ────────────────────────────────────────────────────────
+
+    def _claim(self):
+        now = now_utc()
+        t = OutboundMail
+        due = (
+            select(t.id)
+            .where(or_(t.status == "pending", t.status == "sending"), t.next_attempt_at <= now)
+            .order_by(t.next_attempt_at, t.id)
+            .limit(1)
+            .scalar_subquery()
+        )
+        with self.engine.begin() as conn:
+            return conn.execute(
+                update(t)
+                .where(t.id == due)
+                .values(status="sending", attempts=t.attempts + 1, next_attempt_at=now + self.LEASE)
+                .returning(t.id, t.recipients, t.message, t.attempts)
+            ).first()
+
+    def _finish(self, mail_id: int, **values) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(update(OutboundMail).where(OutboundMail.id == mail_id).values(**values))
+
+    def backoff(self, attempts: int) -> float:
+        return min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+
+    def process_one(self) -> bool:
+        """Send the next due mail. Returns False if nothing was sent/attempted."""
+        if not self.breaker.allow():
+            return False
+        row = self._claim()
+        if row is None:
+            return False
+        mail_id, recipients, source, attempts = row
+        msg = email.message_from_string(source, policy=email.policy.default)
+        try:
+            self.connection.send(msg, recipients.split(","))
+        except (OSError, smtplib.SMTPException) as exc:
+            if not _rejected_permanently(exc):
+                self._retry(mail_id, attempts, exc)
+                return True
+            # this message was refused – the relay itself works
+            self.breaker.record_success()
+            self._finish(mail_id, status="failed", last_error=str(exc))
+            log.error("Mail %s rejected permanently: %s", mail_id, exc)
+        else:
+            self.breaker.record_success()
+            # the source (magic link, PIN) is not needed any more
+            self._finish(mail_id, status="sent", sent_at=now_utc(), last_error=None, message="")
+        return True
+
+    def _retry(self, mail_id: int, attempts: int, exc: Exception) -> None:
+        self.breaker.record_failure()
+        self.connection.close()
+        if attempts >= self.max_attempts:
+            self._finish(mail_id, status="failed", last_error=str(exc))
+            log.error("Mail %s failed after %s attempts: %s", mail_id, attempts, exc)
+        else:
+            retry_at = now_utc() + timedelta(seconds=self.backoff(attempts))
+            self._finish(mail_id, status="pending", next_attempt_at=retry_at, last_error=str(exc))
+            log.warning("Mail %s attempt %s failed, retry at %s: %s", mail_id, attempts, retry_at, exc)
+
+    def purge(self) -> int:
+        """Delete sent rows older than keep_sent and failed rows older than keep_failed."""
+        now = now_utc()
+        t = OutboundMail
+        with self.engine.begin() as conn:
+            return conn.execute(delete(t).where(or_(
+                and_(t.status == "sent", t.sent_at < now - self.keep_sent),
+                and_(t.status == "failed", t.created_at < now - self.keep_failed),
+            ))).rowcount
+
+    def _maybe_purge(self) -> None:
+        if time.monotonic() < self._next_purge:
+            return
+        self._next_purge = time.monotonic() + self.purge_interval
+        try:
+            purged = self.purge()
+        except Exception:
+            log.exception("Mail queue purge failed")
+        else:
+            if purged:
+                log.info("Purged %s finished mails", purged)
+
+    def drain(self, limit: int = 100) -> int:
+        """Synchronously process due mails (tests, maintenance)."""
+        done = 0
+        while done < limit and self.process_one():
+            done += 1
+        return done
+
+    # ── background thread ────────────────────────────────────────────────────
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                worked = self.process_one()
+            except Exception:
+                log.exception("Mail queue iteration failed")
+                worked = False
+            if not worked:
+                self._maybe_purge()
+                self.connection.close_if_idle()
+                wait = self.poll_interval
+                if not self.breaker.allow():
+                    wait = max(1.0, self.breaker.retry_in())
+                self._wake.wait(wait)
+                self._wake.clear()
+        self.connection.close()
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="mail-queue", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
@@ -0,0 +1,187 @@
+"""
+Background processing of repair media uploads.
+
+The upload route only writes the file and commits a RepairMedia row with
+processing_status "pending". A small thread pool then
+  • re-encodes photos as EXIF-free JPEGs (max. DISPLAY_MAX px, replaces the
+    original) and writes a THUMB_MAX px thumbnail,
+  • extracts a poster frame from videos (only if ffmpeg is installed).
+Rows are claimed with a conditional UPDATE, so several workers resuming
+pending media after a restart never process the same file twice. A claim
+older than STALE_AFTER (worker killed mid-processing) counts as pending
+again. Variants are named after the media id, so uploads with the same file
+name never overwrite each other's processed files.
+"""
+
+from __future__ import annotations
+
+import logging
+import shutil
+import subprocess
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+
+from sqlalchemy import and_, or_, update
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = ImageOps = None
+
+from .models import RepairMedia, SessionLocal, now_utc
+
+log = logging.getLogger(__name__)
+
+DISPLAY_MAX = 2048
+THUMB_MAX = 480
+JPEG_QUALITY = 82
+FFMPEG_TIMEOUT = 60
+# far above any real run (ffmpeg tries twice with FFMPEG_TIMEOUT each)
+STALE_AFTER = timedelta(minutes=15)
+
+
+def _claimable():
+    """Pending rows and rows whose claim went stale."""
+    return or_(
+        RepairMedia.processing_status == "pending",
+        and_(
+            RepairMedia.processing_status == "processing",
+            or_(RepairMedia.processing_started_at.is_(None),
+                RepairMedia.processing_started_at < now_utc() - STALE_AFTER),
+        ),
+    )
+
+
+def _flatten(im):
+    """RGB copy with transparency composited onto white."""
+    if im.mode in ("RGBA", "LA") or (im.mode == "P" and "transparency" in im.info):
+        im = im.convert("RGBA")
+        background = Image.new("RGB", im.size, (255, 255, 255))
+        background.paste(im, mask=im.getchannel("A"))
+        return background
+    return im.convert("RGB") if im.mode != "RGB" else im
+
+
+class MediaProcessor:
+    def __init__(self, upload_dir: Path, session_factory=SessionLocal, workers: int = 2):
+        self.upload_dir = Path(upload_dir)
+        self.session_factory = session_factory
+        self.workers = workers
+        self.ffmpeg = shutil.which("ffmpeg")
+        self._executor: ThreadPoolExecutor | None = None
+
+    def can_process(self, mime_type: str) -> bool:
+        if mime_type.startswith("image/"):
+            return Image is not None
+        return mime_type.startswith("video/") and self.ffmpeg is not None
+
+    def submit(self, media_id: int) -> Future | None:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="repair-media")
+        return self._executor.submit(self._run, media_id)
+
+    def _run(self, media_id: int) -> str | None:
+        try:
+            return self.process(media_id)
+        except Exception:
+            log.exception("Processing repair media %s failed", media_id)
+            return None
+
+    def resume_pending(self) -> int:
+        """Queue media left unprocessed (older uploads, restarts, killed workers)."""
+        db = self.session_factory()
+        try:
+            pending = db.query(RepairMedia.id, RepairMedia.mime_type).filter(_claimable()).all()
+        finally:
+            db.close()
+        queued = 0
+        for media_id, mime_type in pending:
+            if self.can_process(mime_type):
+                self.submit(media_id)
+                queued += 1
+        return queued
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    # ── processing ───────────────────────────────────────────────────────────
+
+    def process(self, media_id: int) -> str | None:
+        """Process one media row; returns the final status or None if not claimed."""
+        db = self.session_factory()
+        try:
+            claimed = db.execute(
+                update(RepairMedia)
+                .where(RepairMedia.id == media_id, _claimable())
+                .values(processing_status="processing", processing_started_at=now_utc())
+            ).rowcount
+            db.commit()
+            if not claimed:
+                return None
+            media = db.get(RepairMedia, media_id)
+            replaced = None
+            try:
+                if media.mime_type.startswith("image/"):
+                    values, replaced = self._process_image(media_id, media.filename)
+                else:
+                    values = self._process_video(media_id, media.filename)
+                status = "done"
+            except Exception as exc:
+                log.warning("Repair media %s (%s) could not be processed: %s", media_id, media.filename, exc)
+                values, status = {}, "failed"
+            for key, value in values.items():
+                setattr(media, key, value)
+            media.processing_status = status
+            db.commit()
+            if replaced is not None:
+                replaced.unlink(missing_ok=True)
+            return status
+        finally:
+            db.close()
+
+    def _variant(self, media_id: int, rel: str, suffix: str) -> tuple[Path, str]:
+        """New file next to `rel`, unique per media row; never an existing file."""
+        path = self.upload_dir / rel
+        out = path.with_name(f"{path.stem}_{media_id}_{suffix}.jpg")
+        while out.exists():
+            out = path.with_name(f"{path.stem}_{media_id}_{uuid.uuid4().hex[:8]}_{suffix}.jpg")
+        return out, out.relative_to(self.upload_dir).as_posix()
+
+    def _process_image(self, media_id: int, rel: str) -> tuple[dict, Path | None]:
+        if Image is None:
+            raise RuntimeError("Pillow is not installed")
+        src = self.upload_dir / rel
+        thumb_path, thumb_rel = self._variant(media_id, rel, "thumb")
+        with Image.open(src) as im:
+            animated = getattr(im, "is_animated", False)
+            frame = _flatten(ImageOps.exif_transpose(im))
+            thumb = frame.copy()
+            thumb.thumbnail((THUMB_MAX, THUMB_MAX), Image.LANCZOS)
+            thumb.save(thumb_path, "JPEG", quality=JPEG_QUALITY, optimize=True)
+            if animated:
+                # animierte GIFs bleiben erhalten, nur das Vorschaubild wird erzeugt
+                return {"thumb_filename": thumb_rel}, None
+            display_path, display_rel = self._variant(media_id, rel, "display")
+            frame.thumbnail((DISPLAY_MAX, DISPLAY_MAX), Image.LANCZOS)
+            # no exif= argument: metadata (GPS, camera serial) is dropped
+            frame.save(display_path, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+        return {"filename": display_rel, "thumb_filename": thumb_rel}, src
+
+    def _process_video(self, media_id: int, rel: str) -> dict:
+        if self.ffmpeg is None:
+            return {}
+        src = self.upload_dir / rel
+        poster_path, poster_rel = self._variant(media_id, rel, "poster")
+        for offset in ("1", "0"):  # very short clips have no frame at 1 s
+            subprocess.run(
+                [self.ffmpeg, "-loglevel", "error", "-y", "-ss", offset, "-i", str(src),
+                 "-frames:v", "1", "-vf", f"scale='min({THUMB_MAX},iw)':-2", str(poster_path)],
+                check=False, timeout=FFMPEG_TIMEOUT, stdin=subprocess.DEVNULL,
+            )
+            if poster_path.exists() and poster_path.stat().st_size:
+                return {"thumb_filename": poster_rel}
+        raise RuntimeError("ffmpeg produced no poster frame")
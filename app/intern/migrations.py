@@ -0,0 +1,145 @@
+"""
+Schema migrations for intern.db.
+
+Each migration runs exactly once and is recorded in `schema_version`.
+Worker boot reads max(version); only if it is behind does a worker take
+the file lock next to the database and apply the pending steps, so
+concurrently starting gunicorn workers never race on DDL.
+"""
+
+from __future__ import annotations
+
+import logging
+from contextlib import contextmanager
+from typing import Callable
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+try:
+    import fcntl
+except ImportError:  # Windows dev setups: no cross-process lock
+    fcntl = None
+
+from .models import Base, DB_PATH
+from .portal_search import create_search_index, rebuild_search_index
+
+log = logging.getLogger(__name__)
+
+LOCK_PATH = DB_PATH.with_suffix(".migrate.lock")
+
+
+def _columns(conn: Connection, table: str) -> set[str]:
+    return {row[1] for row in conn.execute(text(f"PRAGMA table_info({table})"))}
+
+
+def _add_column(table: str, column: str, definition: str) -> Callable[[Connection], None]:
+    """ALTER TABLE … ADD COLUMN, skipped if the column exists (DBs from before versioning)."""
+    def migrate(conn: Connection) -> None:
+        if column not in _columns(conn, table):
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {definition}"))
+    return migrate
+
+
+def _create_all(conn: Connection) -> None:
+    Base.metadata.create_all(conn)
+
+
+def _create_table(name: str) -> Callable[[Connection], None]:
+    def migrate(conn: Connection) -> None:
+        Base.metadata.tables[name].create(conn, checkfirst=True)
+    return migrate
+
+
+def _create_search_index(conn: Connection) -> None:
+    """Index table plus sync triggers, filled once from the existing rows."""
+    if "is_published" not in _columns(conn, "info_page"):
+        conn.execute(text("ALTER TABLE info_page ADD COLUMN is_published BOOLEAN NOT NULL DEFAULT 1"))
+    create_search_index(conn)
+    rebuild_search_index(conn)
+
+
+def _create_indexes(*names: str) -> Callable[[Connection], None]:
+    """Create model-declared indexes by name (already there on fresh DBs)."""
+    def migrate(conn: Connection) -> None:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                if index.name in names:
+                    index.create(conn, checkfirst=True)
+    return migrate
+
+
+# (version, description, function) – append only, never renumber
+MIGRATIONS: list[tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "baseline tables", _create_all),
+    (2, "auth_token.pin_code", _add_column("auth_token", "pin_code", "VARCHAR(6)")),
+    (3, "auth_token.attempt_count", _add_column("auth_token", "attempt_count", "INTEGER NOT NULL DEFAULT 0")),
+    (4, "info_page.section", _add_column("info_page", "section", "VARCHAR(100)")),
+    (5, "event.min_members", _add_column("event", "min_members", "INTEGER")),
+    (6, "indexes for hot intern queries", _create_indexes(
+        "ix_auth_token_member_open", "ix_event_archived_start", "ix_event_start",
+        "ix_event_assignment_member", "ix_repair_machine_created", "ix_repair_status_machine",
+        "ix_repair_media_repair_uploaded", "ix_repair_comment_repair_created",
+    )),
+    (7, "outbound_mail queue", _create_table("outbound_mail")),
+    (8, "repair_media.thumb_filename", _add_column("repair_media", "thumb_filename", "VARCHAR(300)")),
+    (9, "repair_media.processing_status", _add_column(
+        "repair_media", "processing_status", "VARCHAR(20) NOT NULL DEFAULT 'pending'")),
+    (10, "info_page.content_html", _add_column("info_page", "content_html", "TEXT DEFAULT ''")),
+    (11, "portal-wide search index", _create_search_index),
+    (12, "contact indexes for the vCard export", _create_indexes("ix_contact_name", "ix_contact_updated")),
+    (13, "repair_media.processing_started_at", _add_column(
+        "repair_media", "processing_started_at", "DATETIME")),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def current_version(engine: Engine) -> int:
+    with engine.connect() as conn:
+        try:
+            return conn.execute(text("SELECT MAX(version) FROM schema_version")).scalar() or 0
+        except Exception:
+            return 0  # table does not exist yet
+
+
+@contextmanager
+def migration_lock():
+    """Exclusive lock shared by all processes using this database file."""
+    if fcntl is None:
+        yield
+        return
+    with open(LOCK_PATH, "a") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def run_migrations(engine: Engine) -> int:
+    """Apply pending migrations and return the resulting schema version."""
+    if current_version(engine) >= LATEST_VERSION:
+        return LATEST_VERSION
+
+    with migration_lock():
+        with engine.begin() as conn:
+            conn.execute(text(
+                "CREATE TABLE IF NOT EXISTS schema_version ("
+                "version INTEGER PRIMARY KEY, description VARCHAR(200), "
+                "applied_at DATETIME DEFAULT CURRENT_TIMESTAMP)"
+            ))
+        # another worker may have finished while we waited for the lock
+        version = current_version(engine)
+        for number, description, migrate in MIGRATIONS:
+            if number <= version:
+                continue
+            with engine.begin() as conn:
+                migrate(conn)
+                conn.execute(
+                    text("INSERT INTO schema_version (version, description) VALUES (:v, :d)"),
+                    {"v": number, "d": description},
+                )
+            log.info("Applied intern DB migration %s: %s", number, description)
+            version = number
+    return version
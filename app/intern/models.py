@@ -1,34 +1,88 @@
 """
 SQLAlchemy models for the Aixtraball member portal.
-DB: SQLite (WAL mode) at app/data/intern.db
+DB: SQLite (WAL mode) at app/data/intern.db (INTERN_DB_PATH overrides)
 """
 
 from __future__ import annotations
 
+import html
+import os
+import re
 import secrets
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import NamedTuple
 
 from sqlalchemy import (
-    Boolean, DateTime, ForeignKey, Integer, String, Text,
-    UniqueConstraint, create_engine, event, text,
+    Boolean, DateTime, ForeignKey, Index, Integer, String, Text,
+    UniqueConstraint, create_engine, event, select, text,
 )
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship, sessionmaker
+from sqlalchemy.pool import QueuePool
+
+from .sqlite_profile import Optimizer, apply_pragmas, load_profile, read_pragmas
 
 BASE_DIR = Path(__file__).resolve().parent.parent
-DB_PATH = BASE_DIR / "data" / "intern.db"
-DB_PATH.parent.mkdir(exist_ok=True)
+DB_PATH = Path(os.environ.get("INTERN_DB_PATH") or BASE_DIR / "data" / "intern.db")
+DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+
+DB_PROFILE, DB_PRAGMAS = load_profile()
+# gthread workers: one pooled connection per thread, LIFO keeps hot connections in use
+DB_POOL_SIZE = int(os.environ.get("INTERN_DB_POOL_SIZE", "8"))
+DB_POOL_OVERFLOW = int(os.environ.get("INTERN_DB_POOL_OVERFLOW", "4"))
 
 engine = create_engine(
     f"sqlite:///{DB_PATH}",
-    connect_args={"check_same_thread": False},
+    connect_args={
+        "check_same_thread": False,
+        "timeout": int(DB_PRAGMAS["busy_timeout"]) / 1000,
+    },
+    poolclass=QueuePool,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_POOL_OVERFLOW,
+    pool_use_lifo=True,
+    pool_timeout=30,
 )
+_optimizer = Optimizer()
+
+
+_TAG_RE = re.compile(r"<(script|style)\b.*?</\1\s*>|<[^>]+>", re.IGNORECASE | re.DOTALL)
+
+
+def strip_html(value: str | None) -> str:
+    """Plain text of an HTML fragment (for the full-text index)."""
+    if not value:
+        return ""
+    return " ".join(html.unescape(_TAG_RE.sub(" ", value)).split())
+
+
+def register_sql_functions(dbapi_conn) -> None:
+    # used by the search_index triggers (portal_search.py), so every connection needs it
+    dbapi_conn.create_function("intern_strip_html", 1, strip_html, deterministic=True)
 
 
 @event.listens_for(engine, "connect")
 def _set_wal_mode(dbapi_conn, _):
-    dbapi_conn.execute("PRAGMA journal_mode=WAL")
-    dbapi_conn.execute("PRAGMA foreign_keys=ON")
+    apply_pragmas(dbapi_conn, DB_PRAGMAS)
+    register_sql_functions(dbapi_conn)
+
+
+@event.listens_for(engine, "checkin")
+def _periodic_optimize(dbapi_conn, _):
+    if dbapi_conn is not None:
+        _optimizer.maybe_run(dbapi_conn)
+
+
+def effective_db_settings() -> dict:
+    """Profile, pool configuration and PRAGMAs as SQLite reports them."""
+    with engine.connect() as conn:
+        pragmas = read_pragmas(conn.connection.dbapi_connection, DB_PRAGMAS)
+    return {
+        "profile": DB_PROFILE,
+        "pool": {"class": type(engine.pool).__name__, "size": DB_POOL_SIZE,
+                 "max_overflow": DB_POOL_OVERFLOW, "lifo": True},
+        "pragmas": pragmas,
+    }
 
 
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
@@ -65,6 +119,10 @@ class Member(Base):
 
 class AuthToken(Base):
     __tablename__ = "auth_token"
+    __table_args__ = (
+        # open tokens of a member (login: invalidate old / verify PIN)
+        Index("ix_auth_token_member_open", "member_id", "used_at", "expires_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     member_id: Mapped[int] = mapped_column(ForeignKey("member.id", ondelete="CASCADE"))
@@ -80,6 +138,10 @@ class AuthToken(Base):
 
 class Event(Base):
     __tablename__ = "event"
+    __table_args__ = (
+        Index("ix_event_archived_start", "is_archived", "start_dt"),
+        Index("ix_event_start", "start_dt"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     title: Mapped[str] = mapped_column(String(200), nullable=False)
@@ -101,7 +163,10 @@ class Event(Base):
 
 class EventAssignment(Base):
     __tablename__ = "event_assignment"
-    __table_args__ = (UniqueConstraint("event_id", "member_id"),)
+    __table_args__ = (
+        UniqueConstraint("event_id", "member_id"),
+        Index("ix_event_assignment_member", "member_id", "event_id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     event_id: Mapped[int] = mapped_column(ForeignKey("event.id", ondelete="CASCADE"))
@@ -127,6 +192,10 @@ class Machine(Base):
 
 class Repair(Base):
     __tablename__ = "repair"
+    __table_args__ = (
+        Index("ix_repair_machine_created", "machine_id", "created_at"),
+        Index("ix_repair_status_machine", "status", "machine_id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     machine_id: Mapped[int] = mapped_column(ForeignKey("machine.id"))
@@ -157,6 +226,7 @@ class Repair(Base):
 
 class RepairMedia(Base):
     __tablename__ = "repair_media"
+    __table_args__ = (Index("ix_repair_media_repair_uploaded", "repair_id", "uploaded_at"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     repair_id: Mapped[int] = mapped_column(ForeignKey("repair.id", ondelete="CASCADE"))
@@ -164,6 +234,13 @@ class RepairMedia(Base):
     mime_type: Mapped[str] = mapped_column(String(100), nullable=False)
     uploaded_by: Mapped[int] = mapped_column(ForeignKey("member.id"))
     uploaded_at: Mapped[datetime] = mapped_column(DateTime, default=now_utc)
+    # set by media_processing: thumbnail / video poster, relative to the upload dir
+    thumb_filename: Mapped[str | None] = mapped_column(String(300))
+    processing_status: Mapped[str] = mapped_column(
+        String(20), default="pending", server_default="pending", nullable=False,
+    )  # pending | processing | done | failed
+    # set when a worker claims the row; stale claims are taken over again
+    processing_started_at: Mapped[datetime | None] = mapped_column(DateTime)
 
     repair: Mapped[Repair] = relationship("Repair", back_populates="media")
     uploader: Mapped[Member] = relationship("Member")
@@ -171,6 +248,7 @@ class RepairMedia(Base):
 
 class RepairComment(Base):
     __tablename__ = "repair_comment"
+    __table_args__ = (Index("ix_repair_comment_repair_created", "repair_id", "created_at"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     repair_id: Mapped[int] = mapped_column(ForeignKey("repair.id", ondelete="CASCADE"))
@@ -215,6 +293,11 @@ class InfoPage(Base):
 
 class Contact(Base):
     __tablename__ = "contact"
+    __table_args__ = (
+        # vCard export: streamed in name order, "changed since" re-sync
+        Index("ix_contact_name", "name"),
+        Index("ix_contact_updated", "updated_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     name: Mapped[str] = mapped_column(String(200), nullable=False)
@@ -340,3 +423,102 @@ class PartManufacturer(Base):
 
     part: Mapped[Part] = relationship("Part", back_populates="part_manufacturers")
     manufacturer: Mapped[Manufacturer] = relationship("Manufacturer", back_populates="part_manufacturers")
+
+
+class PartRow(NamedTuple):
+    """Compact, ORM-free part record as returned by load_part_rows()."""
+    id: int
+    name: str
+    article_number: str | None
+    supplier: str | None
+    stock: int
+    shelf: str | None
+    bin: str | None
+    synonyms: tuple[str, ...]
+    manufacturers: tuple[str, ...]
+
+    def to_dict(self) -> dict:
+        d = self._asdict()
+        d["synonyms"] = list(self.synonyms)
+        d["manufacturers"] = list(self.manufacturers)
+        return d
+
+
+def load_part_rows(conn) -> list[PartRow]:
+    """
+    Load all parts ordered by name in three queries (parts, synonyms,
+    manufacturers) instead of lazy-loading relations per part.
+    `conn` may be a Session or a Connection.
+    """
+    synonyms: dict[int, list[str]] = {}
+    for part_id, synonym in conn.execute(
+        select(PartSynonym.part_id, PartSynonym.synonym).order_by(PartSynonym.id)
+    ):
+        synonyms.setdefault(part_id, []).append(synonym)
+
+    manufacturers: dict[int, list[str]] = {}
+    for part_id, name in conn.execute(
+        select(PartManufacturer.part_id, Manufacturer.name)
+        .join(Manufacturer, Manufacturer.id == PartManufacturer.manufacturer_id)
+        .order_by(PartManufacturer.id)
+    ):
+        manufacturers.setdefault(part_id, []).append(name)
+
+    rows = conn.execute(
+        select(Part.id, Part.name, Part.article_number, Part.supplier,
+               Part.stock, Part.shelf, Part.bin)
+        .order_by(Part.name, Part.id)
+    )
+    return [
+        PartRow(*row, tuple(synonyms.get(row[0], ())), tuple(manufacturers.get(row[0], ())))
+        for row in rows
+    ]
+
+
+# ── Mail-Queue ───────────────────────────────────────────────────────────────
+
+class OutboundMail(Base):
+    """Queued e-mail; drained by the sender thread in intern/mail_queue.py."""
+    __tablename__ = "outbound_mail"
+    __table_args__ = (Index("ix_outbound_mail_due", "status", "next_attempt_at"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    kind: Mapped[str] = mapped_column(String(50), default="mail")
+    recipients: Mapped[str] = mapped_column(Text, nullable=False)   # comma-separated
+    message: Mapped[str] = mapped_column(Text, nullable=False)      # RFC 5322 source
+    status: Mapped[str] = mapped_column(String(20), default="pending")  # pending|sending|sent|failed
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime, default=now_utc)
+    last_error: Mapped[str | None] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=now_utc)
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime)
+
+
+# ── Cache-Versionen (über Gunicorn-Worker hinweg) ────────────────────────────
+
+class CacheVersion(Base):
+    """Monotonic counter per cached dataset; bumped after every write."""
+    __tablename__ = "cache_version"
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+
+def get_cache_version(name: str) -> int:
+    with engine.connect() as conn:
+        row = conn.execute(
+            text("SELECT version FROM cache_version WHERE name = :name"), {"name": name}
+        ).first()
+    return row[0] if row else 0
+
+
+def bump_cache_version(name: str) -> int:
+    with engine.begin() as conn:
+        return conn.execute(
+            text(
+                "INSERT INTO cache_version (name, version) VALUES (:name, 1) "
+                "ON CONFLICT(name) DO UPDATE SET version = version + 1 "
+                "RETURNING version"
+            ),
+            {"name": name},
+        ).scalar_one()
@@ -0,0 +1,204 @@
+"""
+Portal-wide full-text index (Reparaturen, Kommentare, Kontakte, Todos,
+Info-Seiten, Ersatzteile).
+
+One FTS5 table holds a (title, body) document per searchable row; the rowid
+encodes kind and primary key, so a changed row is replaced with one DELETE
+by rowid. Triggers on the source tables re-read the affected documents, so
+every write path (ORM, bulk query updates/deletes, FK cascades,
+scripts/import_parts.py) keeps the index in sync within the same transaction. The info page search
+(routes_info.search_pages) reads the "info" documents from this table.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import defaultdict
+
+from markupsafe import Markup, escape
+from sqlalchemy import bindparam, event, text
+
+from .models import Base, register_sql_functions
+
+# kind → code in the low bits of the rowid (rowid = ref_id * 8 + code)
+KINDS = {"repair": 1, "comment": 2, "contact": 3, "todo": 4, "info": 5, "part": 6}
+_KIND_SLOTS = 8
+
+SEARCH_INDEX_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+    "kind UNINDEXED, ref_id UNINDEXED, title, body, "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+)
+
+# Document per kind: SELECT id, title, body (wrapped in `WHERE d.id IN …` for updates)
+DOCUMENTS = {
+    "repair": ("SELECT r.id AS id, r.title AS title, coalesce(r.description, '') AS body "
+               "FROM repair r"),
+    "comment": "SELECT c.id AS id, '' AS title, c.body AS body FROM repair_comment c",
+    "contact": ("SELECT k.id AS id, k.name AS title, "
+                "coalesce(k.phone, '') || ' ' || coalesce(k.email, '') || ' ' || coalesce(k.note, '') AS body "
+                "FROM contact k"),
+    "todo": "SELECT i.id AS id, i.text AS title, '' AS body FROM todo_item i",
+    "info": ("SELECT p.id AS id, p.title AS title, "
+             "coalesce(p.section, '') || ' ' || intern_strip_html(p.content_html) AS body "
+             "FROM info_page p WHERE p.is_published = 1"),
+    "part": ("SELECT p.id AS id, p.name AS title, "
+             "coalesce(p.article_number, '') || ' ' || coalesce(p.supplier, '') || ' ' || "
+             "coalesce((SELECT group_concat(s.synonym, ' ') FROM part_synonym s WHERE s.part_id = p.id), '') "
+             "|| ' ' || coalesce((SELECT group_concat(m.name, ' ') FROM part_manufacturer pm "
+             "JOIN manufacturer m ON m.id = pm.manufacturer_id WHERE pm.part_id = p.id), '') AS body "
+             "FROM part p"),
+}
+
+# Triggers: (kind, source table, affected document ids with {row} = new/old,
+# columns that change the document, trigger events)
+_ROW_EVENTS = ("INSERT", "UPDATE", "DELETE")
+TRIGGER_SOURCES = [
+    ("repair", "repair", "SELECT {row}.id AS id", "title, description", _ROW_EVENTS),
+    ("comment", "repair_comment", "SELECT {row}.id AS id", "body", _ROW_EVENTS),
+    ("contact", "contact", "SELECT {row}.id AS id", "name, phone, email, note", _ROW_EVENTS),
+    ("todo", "todo_item", "SELECT {row}.id AS id", "text", _ROW_EVENTS),
+    ("info", "info_page", "SELECT {row}.id AS id", "title, section, content_html, is_published", _ROW_EVENTS),
+    ("part", "part", "SELECT {row}.id AS id", "name, article_number, supplier", _ROW_EVENTS),
+    ("part", "part_synonym", "SELECT {row}.part_id AS id", "part_id, synonym", _ROW_EVENTS),
+    ("part", "part_manufacturer", "SELECT {row}.part_id AS id", "part_id, manufacturer_id", _ROW_EVENTS),
+    ("part", "manufacturer",
+     "SELECT part_id AS id FROM part_manufacturer WHERE manufacturer_id = {row}.id", "name", ("UPDATE",)),
+]
+
+# Hit details per kind: id, label (context line), parent (list id, slug, …)
+HIT_DETAILS = {
+    "repair": "SELECT r.id, m.display_name, NULL FROM repair r JOIN machine m ON m.id = r.machine_id",
+    "comment": "SELECT c.id, r.title, c.repair_id FROM repair_comment c JOIN repair r ON r.id = c.repair_id",
+    "contact": "SELECT k.id, k.name, NULL FROM contact k",
+    "todo": ("SELECT i.id, l.title || ' · ' || s.title, s.list_id FROM todo_item i "
+             "JOIN todo_section s ON s.id = i.section_id JOIN todo_list l ON l.id = s.list_id"),
+    "info": "SELECT p.id, p.section, p.slug FROM info_page p",
+    "part": "SELECT p.id, p.article_number, NULL FROM part p",
+}
+_DETAIL_ID = {"repair": "r.id", "comment": "c.id", "contact": "k.id", "todo": "i.id", "info": "p.id", "part": "p.id"}
+
+# FTS snippet markers, replaced by <mark> after escaping the indexed text
+HL_START, HL_END = "\x02", "\x03"
+
+
+def fts_query(q: str) -> str:
+    """User input → FTS5 MATCH expression: every word as quoted prefix term (AND)."""
+    return " ".join(f'"{term}"*' for term in re.findall(r"\w+", q)[:8])
+
+
+def highlight(fragment: str) -> Markup:
+    """Escape an FTS snippet/highlight and turn the markers into <mark>."""
+    return Markup(str(escape(fragment)).replace(HL_START, "<mark>").replace(HL_END, "</mark>"))
+
+
+def _rowid(kind: str, ref_id: int) -> int:
+    return ref_id * _KIND_SLOTS + KINDS[kind]
+
+
+# ── maintenance ──────────────────────────────────────────────────────────────
+
+def _refresh_sql(kind: str, ids: str) -> str:
+    """Trigger body: drop and re-read the documents of `ids` (gone/unpublished rows stay out)."""
+    code = KINDS[kind]
+    return (
+        f"DELETE FROM search_index WHERE rowid IN (SELECT id * {_KIND_SLOTS} + {code} FROM ({ids})); "
+        f"INSERT INTO search_index (rowid, kind, ref_id, title, body) "
+        f"SELECT d.id * {_KIND_SLOTS} + {code}, '{kind}', d.id, d.title, d.body "
+        f"FROM ({DOCUMENTS[kind]}) AS d WHERE d.id IN ({ids});"
+    )
+
+
+def trigger_ddl() -> list[str]:
+    statements = []
+    for kind, table, ids, columns, events in TRIGGER_SOURCES:
+        for action in events:
+            if action == "INSERT":
+                affected = ids.format(row="new")
+            elif action == "DELETE":
+                affected = ids.format(row="old")
+            else:
+                affected = f"{ids.format(row='old')} UNION {ids.format(row='new')}"
+            when = f"UPDATE OF {columns}" if action == "UPDATE" else action
+            statements.append(
+                f"CREATE TRIGGER IF NOT EXISTS search_index_{table}_a{action[0].lower()} "
+                f"AFTER {when} ON {table} BEGIN {_refresh_sql(kind, affected)} END"
+            )
+    return statements
+
+
+def create_search_index(conn) -> None:
+    """Create the index table and its triggers (empty; see rebuild_search_index)."""
+    conn.exec_driver_sql(SEARCH_INDEX_DDL)
+    for statement in trigger_ddl():
+        conn.exec_driver_sql(statement)
+
+
+def rebuild_search_index(conn) -> None:
+    """Refill the index from all source tables."""
+    register_sql_functions(conn.connection.dbapi_connection)
+    conn.exec_driver_sql("DELETE FROM search_index")
+    for kind, select_sql in DOCUMENTS.items():
+        conn.exec_driver_sql(
+            f"INSERT INTO search_index (rowid, kind, ref_id, title, body) "
+            f"SELECT d.id * {_KIND_SLOTS} + {KINDS[kind]}, '{kind}', d.id, d.title, d.body "
+            f"FROM ({select_sql}) AS d"
+        )
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _metadata_created(target, conn, **kw):
+    # empty on a fresh schema; older databases are filled by the migrations
+    create_search_index(conn)
+
+
+# ── query ────────────────────────────────────────────────────────────────────
+
+def search(db, q: str, kinds=None, limit: int = 20) -> list[dict]:
+    """Ranked hits for `q` across all (or the given) kinds.
+
+    Each hit: type, id, title, label, parent, snippet (HTML with <mark>), score.
+    """
+    match = fts_query(q)
+    kinds = [k for k in (kinds or KINDS) if k in KINDS]
+    if not match or not kinds:
+        return []
+    rows = db.execute(
+        text(
+            "SELECT kind, ref_id, highlight(search_index, 2, :hl_start, :hl_end), "
+            "snippet(search_index, 3, :hl_start, :hl_end, ' … ', 12), "
+            "bm25(search_index, 0.0, 0.0, 10.0, 1.0) AS rank "
+            "FROM search_index WHERE search_index MATCH :match AND kind IN :kinds "
+            "ORDER BY rank LIMIT :limit"
+        ).bindparams(bindparam("kinds", expanding=True)),
+        {"match": match, "kinds": kinds, "hl_start": HL_START, "hl_end": HL_END, "limit": limit},
+    ).all()
+
+    # one lookup per kind for the context; the triggers keep hits and rows in step
+    wanted: dict[str, list[int]] = defaultdict(list)
+    for kind, ref_id, *_ in rows:
+        wanted[kind].append(ref_id)
+    details: dict[tuple[str, int], tuple] = {}
+    for kind, ids in wanted.items():
+        for ref_id, label, parent in db.execute(
+            text(f"{HIT_DETAILS[kind]} WHERE {_DETAIL_ID[kind]} IN :ids").bindparams(
+                bindparam("ids", expanding=True)),
+            {"ids": ids},
+        ):
+            details[(kind, ref_id)] = (label, parent)
+
+    hits = []
+    for kind, ref_id, title, snippet, rank in rows:
+        if (kind, ref_id) not in details:
+            continue
+        label, parent = details[(kind, ref_id)]
+        hits.append({
+            "type": kind,
+            "id": ref_id,
+            "title": highlight(title),
+            "label": label,
+            "parent": parent,
+            "snippet": highlight(snippet),
+            "score": round(-rank, 4),
+        })
+    return hits
@@ -0,0 +1,74 @@
+"""
+EXPLAIN QUERY PLAN checks for the hot intern queries.
+
+Each entry in HOT_QUERIES calls the same query builder the route uses, so
+a changed route query is checked as it runs. `full_scans()` reports every
+table the SQLite planner would read completely; the test suite fails on
+any scan that is not explicitly allowed for that query.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Callable, NamedTuple
+
+from sqlalchemy.orm import Query, Session
+
+from .repair_stats import stats_query
+from .routes_auth import open_tokens_query, pin_token_query
+from .routes_calendar import past_events_query, upcoming_events_query
+from .routes_contacts import export_query
+from .routes_dashboard import _unseen_repairs_query, my_assignments_query
+from .routes_repairs import machine_repairs_query, open_repairs_query
+
+
+class HotQuery(NamedTuple):
+    build: Callable[[Session], object]  # -> Query or Select
+    # small lookup tables that may be scanned (e.g. ~50 machines)
+    allow_scan: frozenset[str] = frozenset()
+
+
+_NOW = datetime(2000, 1, 1)
+
+HOT_QUERIES: dict[str, HotQuery] = {
+    "dashboard.unseen_repairs": HotQuery(lambda db: _unseen_repairs_query(db, 1)),
+    "dashboard.my_assignments": HotQuery(lambda db: my_assignments_query(db, 1, _NOW)),
+    "repairs.machine_stats": HotQuery(stats_query, frozenset({"machine"})),
+    "repairs.open_overview": HotQuery(open_repairs_query),
+    "repairs.machine_repairs": HotQuery(lambda db: machine_repairs_query(db, 1)),
+    # also the dashboard's next event (.first())
+    "calendar.upcoming": HotQuery(lambda db: upcoming_events_query(db, _NOW)),
+    "calendar.archive": HotQuery(lambda db: past_events_query(db, _NOW)),
+    "contacts.export": HotQuery(lambda db: export_query()),
+    "contacts.export_since": HotQuery(lambda db: export_query(_NOW)),
+    "auth.open_tokens": HotQuery(lambda db: open_tokens_query(db, 1)),
+    "auth.verify_pin": HotQuery(lambda db: pin_token_query(db, 1, _NOW)),
+}
+
+
+def query_plan(db: Session, stmt) -> list[str]:
+    """EXPLAIN QUERY PLAN detail lines for a Query / Select."""
+    if isinstance(stmt, Query):
+        stmt = stmt.statement
+    compiled = stmt.compile(dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True})
+    rows = db.connection().exec_driver_sql("EXPLAIN QUERY PLAN " + str(compiled)).all()
+    return [row[-1] for row in rows]
+
+
+def full_scans(plan: list[str]) -> set[str]:
+    """Tables read without an index ("SCAN repair", not "SCAN … USING INDEX")."""
+    scanned = set()
+    for detail in plan:
+        if detail.startswith("SCAN ") and "USING" not in detail:
+            scanned.add(detail.split()[1])
+    return scanned
+
+
+def check_hot_queries(db: Session) -> dict[str, set[str]]:
+    """name -> disallowed full scans, only for queries that have any."""
+    problems = {}
+    for name, hot in HOT_QUERIES.items():
+        scans = full_scans(query_plan(db, hot.build(db))) - hot.allow_scan
+        if scans:
+            problems[name] = scans
+    return problems
@@ -0,0 +1,55 @@
+"""
+Aggregated repair counts per machine (machine list, dashboard badge).
+"""
+
+from __future__ import annotations
+
+from typing import NamedTuple
+
+from sqlalchemy import case, func
+
+from .models import Machine, Repair
+
+ACTIVE_STATUSES = ("open", "in_progress")
+
+
+class MachineRepairStats(NamedTuple):
+    open: int = 0
+    in_progress: int = 0
+    critical: int = 0
+
+    @property
+    def active(self) -> int:
+        """Repairs not yet resolved (open + in progress)."""
+        return self.open + self.in_progress
+
+
+NO_REPAIRS = MachineRepairStats()
+
+
+def machine_repair_stats(db) -> dict[int, MachineRepairStats]:
+    """
+    Open / in-progress / critical repair counts for every active machine
+    with at least one unresolved repair, in a single GROUP BY query.
+    Machines without unresolved repairs are missing (use NO_REPAIRS).
+    """
+    rows = stats_query(db).all()
+    return {machine_id: MachineRepairStats(*counts) for machine_id, *counts in rows}
+
+
+def stats_query(db):
+    return (
+        db.query(
+            Repair.machine_id,
+            func.sum(case((Repair.status == "open", 1), else_=0)),
+            func.sum(case((Repair.status == "in_progress", 1), else_=0)),
+            func.sum(case((Repair.priority == "critical", 1), else_=0)),
+        )
+        .join(Machine, Machine.id == Repair.machine_id)
+        .filter(Machine.is_active == True, Repair.status.in_(ACTIVE_STATUSES))
+        .group_by(Repair.machine_id)
+    )
+
+
+def defective_machine_count(stats: dict[int, MachineRepairStats]) -> int:
+    return sum(1 for s in stats.values() if s.active > 0)
@@ -7,10 +7,9 @@ from __future__ import annotations
 import re
 import secrets
 from datetime import datetime, timedelta, timezone
-from time import time
 
 from flask import (
-    Blueprint, flash, redirect, render_template,
+    Blueprint, current_app, flash, redirect, render_template,
     request, session, url_for,
 )
 
@@ -21,7 +20,6 @@ from . import get_db
 
 auth_bp = Blueprint("auth", __name__)
 
-_LOGIN_ATTEMPTS: dict[str, tuple[int, float]] = {}
 _MAX_ATTEMPTS = 5
 _LOCKOUT_SECONDS = 15 * 60
 _MAX_PIN_ATTEMPTS = 5
@@ -33,27 +31,32 @@ def _generate_pin() -> str:
     return f"{secrets.randbelow(1_000_000):06d}"
 
 
+def open_tokens_query(db, member_id: int):
+    """Unused tokens of a member (invalidated when a new code is sent)."""
+    return db.query(AuthToken).filter(
+        AuthToken.member_id == member_id,
+        AuthToken.used_at.is_(None),
+    )
+
+
+def pin_token_query(db, member_id: int, now: datetime):
+    """Newest still valid token for the PIN step."""
+    return open_tokens_query(db, member_id).filter(
+        AuthToken.expires_at > now,
+    ).order_by(AuthToken.created_at.desc())
+
+
+def _login_limit():
+    """Per-IP limit on the shared store of the main app (all workers count together)."""
+    return current_app.extensions["rate_limits"].limit("intern_login", _MAX_ATTEMPTS, _LOCKOUT_SECONDS)
+
+
 def _check_rate_limit(ip: str) -> bool:
-    now = time()
-    entry = _LOGIN_ATTEMPTS.get(ip)
-    if entry:
-        count, first_ts = entry
-        if now - first_ts < _LOCKOUT_SECONDS:
-            if count >= _MAX_ATTEMPTS:
-                return False
-        else:
-            del _LOGIN_ATTEMPTS[ip]
-    return True
+    return not _login_limit().is_limited(ip)
 
 
 def _record_attempt(ip: str) -> None:
-    now = time()
-    entry = _LOGIN_ATTEMPTS.get(ip)
-    if entry:
-        count, first_ts = entry
-        _LOGIN_ATTEMPTS[ip] = (count + 1, first_ts) if now - first_ts < _LOCKOUT_SECONDS else (1, now)
-    else:
-        _LOGIN_ATTEMPTS[ip] = (1, now)
+    _login_limit().hit(ip)
 
 
 @auth_bp.route("/login", methods=["GET", "POST"])
@@ -85,10 +88,7 @@ def login():
             db.add(member)
             db.flush()
 
-        for t in db.query(AuthToken).filter(
-            AuthToken.member_id == member.id,
-            AuthToken.used_at.is_(None),
-        ).all():
+        for t in open_tokens_query(db, member.id).all():
             t.used_at = now_utc()
 
         pin_code = _generate_pin()
@@ -107,7 +107,6 @@ def login():
         try:
             send_magic_link_email(email, verify_url, pin_code, logo_url)
         except Exception as exc:
-            from flask import current_app
             current_app.logger.error("Magic link email failed: %s", exc)
             flash("E-Mail konnte nicht gesendet werden. Bitte SMTP prüfen.", "error")
             return render_template("intern/login.html", step="email", csrf_token=csrf_token)
@@ -149,11 +148,7 @@ def login_code():
             flash("Kein aktives Konto gefunden.", "error")
             return redirect(url_for("intern.auth.login"))
 
-        token = db.query(AuthToken).filter(
-            AuthToken.member_id == member.id,
-            AuthToken.used_at.is_(None),
-            AuthToken.expires_at > now,
-        ).order_by(AuthToken.created_at.desc()).first()
+        token = pin_token_query(db, member.id, now).first()
 
         if not token:
             flash("Der Code ist abgelaufen. Bitte neuen Code anfordern.", "error")
@@ -12,6 +12,8 @@ from flask import (
 )
 
 from .auth import member_required, generate_csrf_token
+from .http_cache import is_not_modified, make_etag, not_modified_response, set_validators
+from .ical_feed import current_version, get_snapshot, invalidate_events, parse_window_bound, render_calendar
 from .models import Event, EventAssignment, Member, now_utc
 from . import get_db
 
@@ -31,22 +33,33 @@ def _parse_dt(value: str) -> datetime | None:
     return None
 
 
-@calendar_bp.route("/termine/")
-@member_required
-def list_events():
-    db = get_db()
-    now = now_utc()
-    events = (
+def upcoming_events_query(db, now: datetime):
+    """Non-archived events from `now` on, soonest first (calendar and dashboard)."""
+    return (
         db.query(Event)
         .filter(Event.is_archived == False, Event.start_dt >= now)
         .order_by(Event.start_dt)
-        .all()
     )
+
+
+def past_events_query(db, now: datetime):
+    return (
+        db.query(Event)
+        .filter(Event.start_dt < now)
+        .order_by(Event.start_dt.desc())
+    )
+
+
+@calendar_bp.route("/termine/")
+@member_required
+def list_events():
+    db = get_db()
+    events = upcoming_events_query(db, now_utc()).all()
     assigned_to_me = {
         a.event_id for e in events for a in e.assignments
         if a.member_id == g.current_member.id
     }
-    ical_token = g.current_member.get_or_create_ical_token(db)
+    ical_token = db.get(Member, g.current_member.id).get_or_create_ical_token(db)
     return render_template(
         "intern/calendar_list.html",
         active_tab="termine",
@@ -60,13 +73,7 @@ def list_events():
 @member_required
 def archive_events():
     db = get_db()
-    now = now_utc()
-    events = (
-        db.query(Event)
-        .filter(Event.start_dt < now)
-        .order_by(Event.start_dt.desc())
-        .all()
-    )
+    events = past_events_query(db, now_utc()).all()
     return render_template(
         "intern/calendar_list.html",
         active_tab="termine",
@@ -111,6 +118,7 @@ def new_event():
             for mid in assigned_ids:
                 db.add(EventAssignment(event_id=event.id, member_id=mid))
             db.commit()
+            invalidate_events()
             flash("Termin erstellt.", "success")
             return redirect(url_for("intern.calendar.list_events"))
 
@@ -172,6 +180,7 @@ def edit_event(event_id: int):
             for mid in new_ids - current_assigned:
                 db.add(EventAssignment(event_id=event.id, member_id=mid))
             db.commit()
+            invalidate_events()
             flash("Termin aktualisiert.", "success")
             return redirect(url_for("intern.calendar.detail_event", event_id=event.id))
 
@@ -192,6 +201,7 @@ def delete_event(event_id: int):
     if event:
         db.delete(event)
         db.commit()
+        invalidate_events()
         flash("Termin gelöscht.", "success")
     return redirect(url_for("intern.calendar.list_events"))
 
@@ -206,6 +216,7 @@ def assign_self(event_id: int):
     if not existing:
         db.add(EventAssignment(event_id=event_id, member_id=g.current_member.id))
         db.commit()
+        invalidate_events()
         flash("Du wurdest dem Termin zugewiesen.", "success")
     return redirect(url_for("intern.calendar.detail_event", event_id=event_id))
 
@@ -220,13 +231,18 @@ def unassign_self(event_id: int):
     if a:
         db.delete(a)
         db.commit()
+        invalidate_events()
         flash("Du wurdest vom Termin abgemeldet.", "success")
     return redirect(url_for("intern.calendar.detail_event", event_id=event_id))
 
 
 @calendar_bp.route("/ical")
 def ical_feed():
-    """iCal feed authenticated via personal token (no session required)."""
+    """iCal feed authenticated via personal token (no session required).
+
+    Optional variants: ?mine=1 (only own assignments), ?from=…&to=… (date
+    window, ISO date or day offset like -30 / +180).
+    """
     token_str = request.args.get("token", "")
     db = get_db()
     if not token_str:
@@ -234,45 +250,24 @@ def ical_feed():
     member = db.query(Member).filter_by(ical_token=token_str, is_active=True).first()
     if not member:
         return Response("Ungültiger Token.", status=401, content_type="text/plain")
-    events = (
-        db.query(Event)
-        .filter(Event.is_archived == False)
-        .order_by(Event.start_dt)
-        .all()
-    )
-    ical = _build_ical(events)
+    today = now_utc().date()
+    try:
+        start = parse_window_bound(request.args.get("from", ""), today)
+        end = parse_window_bound(request.args.get("to", ""), today)
+    except (ValueError, OverflowError):  # kein Datum / Offset jenseits von date.max
+        return Response("Ungültiger Zeitraum.", status=400, content_type="text/plain")
+    member_id = member.id if request.args.get("mine") in {"1", "true", "ja"} else None
+
+    # ETag only: deletions and (un)assignments move the version, not a timestamp
+    version = current_version()
+    etag = make_etag("ical", version, member_id, start, end)
+    if is_not_modified(etag, None):
+        return not_modified_response(etag, None)
+    snapshot = get_snapshot(db, version)
+    if member_id is None and start is None and end is None:
+        ical = snapshot.full_calendar()
+    else:
+        ical = render_calendar(snapshot.select(member_id, start, end))
     resp = Response(ical, content_type="text/calendar; charset=utf-8")
     resp.headers["Content-Disposition"] = "attachment; filename=aixtraball.ics"
-    return resp
-
-
-def _build_ical(events: list) -> str:
-    lines = [
-        "BEGIN:VCALENDAR",
-        "VERSION:2.0",
-        "PRODID:-//Aixtraball//Intern//DE",
-        "X-WR-CALNAME:Aixtraball Termine",
-        "X-WR-TIMEZONE:Europe/Berlin",
-        "CALSCALE:GREGORIAN",
-        "METHOD:PUBLISH",
-    ]
-    now_stamp = now_utc().strftime("%Y%m%dT%H%M%SZ")
-    for e in events:
-        lines.append("BEGIN:VEVENT")
-        lines.append(f"UID:{e.id}@aixtraball.de")
-        lines.append(f"DTSTAMP:{now_stamp}")
-        lines.append(f"DTSTART;TZID=Europe/Berlin:{e.start_dt.strftime('%Y%m%dT%H%M%S')}")
-        if e.end_dt:
-            lines.append(f"DTEND;TZID=Europe/Berlin:{e.end_dt.strftime('%Y%m%dT%H%M%S')}")
-        lines.append(f"SUMMARY:{_ical_escape(e.title)}")
-        if e.description:
-            lines.append(f"DESCRIPTION:{_ical_escape(e.description)}")
-        if e.location:
-            lines.append(f"LOCATION:{_ical_escape(e.location)}")
-        lines.append("END:VEVENT")
-    lines.append("END:VCALENDAR")
-    return "\r\n".join(lines) + "\r\n"
-
-
-def _ical_escape(value: str) -> str:
-    return value.replace("\\", "\\\\").replace("\n", "\\n").replace(",", "\\,").replace(";", "\\;")
+    return set_validators(resp, etag, None)
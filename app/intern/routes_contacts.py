@@ -4,27 +4,38 @@ Contacts (Kontakte) routes for the intern portal.
 
 from __future__ import annotations
 
+from datetime import datetime, timezone
+
 from flask import (
     Blueprint, Response, flash, g, redirect,
     render_template, request, url_for,
 )
 
+from sqlalchemy import func, select
+
 from .auth import member_required, generate_csrf_token
-from .models import Contact, now_utc
+from .http_cache import is_not_modified, make_etag, not_modified_response, set_validators
+from .models import Contact, SessionLocal, now_utc
+from .portal_search import search
 from . import get_db
 
 contacts_bp = Blueprint("contacts", __name__)
 
+EXPORT_BATCH = 200
+
 
 @contacts_bp.route("/kontakte/")
 @member_required
 def list_contacts():
     db = get_db()
     q = request.args.get("q", "").strip()
-    query = db.query(Contact).order_by(Contact.name)
     if q:
-        query = query.filter(Contact.name.ilike(f"%{q}%"))
-    contacts = query.all()
+        # name, phone, e-mail and note via the portal search index, best match first
+        ids = [hit["id"] for hit in search(db, q, kinds=["contact"], limit=200)]
+        by_id = {c.id: c for c in db.query(Contact).filter(Contact.id.in_(ids))}
+        contacts = [by_id[i] for i in ids if i in by_id]
+    else:
+        contacts = db.query(Contact).order_by(Contact.name).all()
     return render_template(
         "intern/contacts_list.html", active_tab="kontakte",
         contacts=contacts, search=q,
@@ -112,18 +123,59 @@ def vcard(contact_id: int):
     return resp
 
 
+def export_query(since: datetime | None = None):
+    """Columns for the vCard export in name order (index scan, no sort step)."""
+    stmt = select(Contact.name, Contact.phone, Contact.email, Contact.note).order_by(Contact.name)
+    if since is not None:
+        stmt = stmt.where(Contact.updated_at > since)
+    return stmt
+
+
+def _stream_vcards(stmt):
+    # own session: the generator outlives the request's get_db() session
+    db = SessionLocal()
+    try:
+        rows = db.execute(stmt.execution_options(stream_results=True, yield_per=EXPORT_BATCH))
+        for i, row in enumerate(rows):
+            yield ("\n" if i else "") + _build_vcard(row)
+    finally:
+        db.close()
+
+
 @contacts_bp.route("/kontakte/export.vcf")
 @member_required
 def export_all():
+    """All contacts as one .vcf, streamed.
+
+    ?since=<ISO timestamp> only exports contacts changed after that point (phone
+    re-sync; the X-Next-Since header is the value for the next call). Deleted
+    contacts cannot be expressed in a vCard file and need a full export.
+
+    Validated by ETag only: the row count covers deletions, max(updated_at)
+    alone (a Last-Modified) would not.
+    """
     db = get_db()
-    contacts = db.query(Contact).order_by(Contact.name).all()
-    vc = "\n".join(_build_vcard(c) for c in contacts)
-    resp = Response(vc, content_type="text/vcard; charset=utf-8")
+    since = None
+    if request.args.get("since"):
+        try:
+            since = datetime.fromisoformat(request.args["since"].replace("Z", "+00:00"))
+        except ValueError:
+            return Response("Ungültiger Zeitpunkt.", status=400, content_type="text/plain")
+        if since.tzinfo is not None:
+            since = since.astimezone(timezone.utc).replace(tzinfo=None)
+    count, last_update = db.query(func.count(Contact.id), func.max(Contact.updated_at)).one()
+    etag = make_etag("vcf", count, last_update, since)
+    if is_not_modified(etag, None):
+        return not_modified_response(etag, None)
+    resp = Response(_stream_vcards(export_query(since)), content_type="text/vcard; charset=utf-8")
     resp.headers["Content-Disposition"] = 'attachment; filename="aixtraball_kontakte.vcf"'
-    return resp
+    if last_update is not None:
+        resp.headers["X-Next-Since"] = last_update.isoformat()
+    return set_validators(resp, etag, None)
 
 
-def _build_vcard(contact: Contact) -> str:
+def _build_vcard(contact) -> str:
+    """vCard 3.0 for a Contact or an export row (name, phone, email, note)."""
     lines = ["BEGIN:VCARD", "VERSION:3.0", f"FN:{contact.name}"]
     if contact.phone:
         lines.append(f"TEL;TYPE=CELL:{contact.phone}")
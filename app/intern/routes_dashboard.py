@@ -5,77 +5,78 @@ Dashboard route for the intern portal.
 from __future__ import annotations
 
 from flask import Blueprint, g, render_template
+from sqlalchemy import func, select
 
 from .auth import member_required
-from .models import Event, EventAssignment, Machine, Repair, RepairComment, RepairMedia, RepairSubscription, now_utc
+from .models import Event, EventAssignment, Repair, RepairComment, RepairMedia, RepairSubscription, now_utc
+from .repair_stats import defective_machine_count, machine_repair_stats
+from .routes_calendar import upcoming_events_query
 from . import get_db
 
 dashboard_bp = Blueprint("dashboard", __name__)
 
 
-@dashboard_bp.route("/")
-@member_required
-def index():
-    db = get_db()
-    member = g.current_member
-    now = now_utc()
+def _unseen_repairs(db, member_id: int) -> list[dict]:
+    """Subscribed repairs with new comments/media since last_seen — one query."""
+    return [
+        {"subscription": sub, "repair": repair, "count": unseen}
+        for sub, repair, unseen in _unseen_repairs_query(db, member_id).all()
+        if unseen > 0
+    ]
 
-    next_event = (
-        db.query(Event)
-        .filter(Event.is_archived == False, Event.start_dt >= now)
-        .order_by(Event.start_dt)
-        .first()
+
+def _unseen_repairs_query(db, member_id: int):
+    new_comments = (
+        select(func.count(RepairComment.id))
+        .where(
+            RepairComment.repair_id == RepairSubscription.repair_id,
+            RepairComment.created_at > RepairSubscription.last_seen,
+        )
+        .scalar_subquery()
+    )
+    new_media = (
+        select(func.count(RepairMedia.id))
+        .where(
+            RepairMedia.repair_id == RepairSubscription.repair_id,
+            RepairMedia.uploaded_at > RepairSubscription.last_seen,
+        )
+        .scalar_subquery()
     )
+    return (
+        db.query(RepairSubscription, Repair, (new_comments + new_media).label("unseen"))
+        .join(Repair, Repair.id == RepairSubscription.repair_id)
+        .filter(RepairSubscription.member_id == member_id)
+        .order_by(RepairSubscription.id)
+    )
+
 
-    my_assignments = (
+def my_assignments_query(db, member_id: int, now):
+    return (
         db.query(EventAssignment)
         .join(Event)
         .filter(
-            EventAssignment.member_id == member.id,
+            EventAssignment.member_id == member_id,
             Event.is_archived == False,
             Event.start_dt >= now,
         )
         .order_by(Event.start_dt)
-        .all()
     )
 
-    subscriptions = (
-        db.query(RepairSubscription)
-        .filter_by(member_id=member.id)
-        .all()
-    )
-    unseen_repairs = []
-    for sub in subscriptions:
-        new_comments = (
-            db.query(RepairComment)
-            .filter(
-                RepairComment.repair_id == sub.repair_id,
-                RepairComment.created_at > sub.last_seen,
-            )
-            .count()
-        )
-        new_media = (
-            db.query(RepairMedia)
-            .filter(
-                RepairMedia.repair_id == sub.repair_id,
-                RepairMedia.uploaded_at > sub.last_seen,
-            )
-            .count()
-        )
-        if new_comments + new_media > 0:
-            unseen_repairs.append({
-                "subscription": sub,
-                "repair": sub.repair,
-                "count": new_comments + new_media,
-            })
-
-    defective_count = (
-        db.query(Machine)
-        .filter(Machine.is_active == True)
-        .join(Repair, (Repair.machine_id == Machine.id) & Repair.status.in_(["open", "in_progress"]))
-        .distinct()
-        .count()
-    )
+
+@dashboard_bp.route("/")
+@member_required
+def index():
+    db = get_db()
+    member = g.current_member
+    now = now_utc()
+
+    next_event = upcoming_events_query(db, now).first()
+
+    my_assignments = my_assignments_query(db, member.id, now).all()
+
+    unseen_repairs = _unseen_repairs(db, member.id)
+
+    defective_count = defective_machine_count(machine_repair_stats(db))
 
     return render_template(
         "intern/dashboard.html",
@@ -11,10 +11,13 @@ from pathlib import Path
 from flask import (
     Blueprint, flash, g, jsonify, redirect, render_template, request, url_for,
 )
+from markupsafe import Markup
+from sqlalchemy import text
 from werkzeug.utils import secure_filename
 
 from .auth import member_required, generate_csrf_token
 from .models import InfoPage, now_utc
+from .portal_search import HL_END, HL_START, fts_query, highlight
 from . import get_db
 
 INFO_UPLOAD_DIR = Path(__file__).parent.parent / "static" / "intern" / "uploads" / "info"
@@ -49,23 +52,48 @@ def _unique_slug(db, title: str, exclude_id: int | None = None) -> str:
         i += 1
 
 
+def search_pages(db, q: str, limit: int = 50) -> list[tuple[InfoPage, Markup]]:
+    """Published pages matching `q`, best bm25 rank first, with highlighted snippet.
+
+    Reads the "info" documents of the portal search index (only published pages).
+    """
+    match = fts_query(q)
+    if not match:
+        return []
+    rows = db.execute(
+        text(
+            "SELECT ref_id, snippet(search_index, -1, :hl_start, :hl_end, ' … ', 16) "
+            "FROM search_index WHERE search_index MATCH :match AND kind = 'info' "
+            "ORDER BY bm25(search_index, 0.0, 0.0, 10.0, 1.0) LIMIT :limit"
+        ),
+        {"match": match, "hl_start": HL_START, "hl_end": HL_END, "limit": limit},
+    ).all()
+    pages = {p.id: p for p in db.query(InfoPage).filter(InfoPage.id.in_([r[0] for r in rows]))}
+    return [(pages[page_id], highlight(snippet)) for page_id, snippet in rows if page_id in pages]
+
+
 @info_bp.route("/informationen/")
 @member_required
 def list_pages():
     db = get_db()
     q = request.args.get("q", "").strip()
-    query = db.query(InfoPage).filter_by(is_published=True)
+    snippets = {}
     if q:
-        query = query.filter(InfoPage.title.ilike(f"%{q}%"))
-    pages = query.order_by(InfoPage.section.nulls_last(), InfoPage.updated_at.desc()).all()
-    # Group by section
-    sections: dict[str, list] = {}
-    for page in pages:
-        key = page.section or ""
-        sections.setdefault(key, []).append(page)
+        # ranked results stay in one list instead of being grouped by section
+        results = search_pages(db, q)
+        sections = {"": [page for page, _ in results]} if results else {}
+        snippets = {page.id: snippet for page, snippet in results}
+    else:
+        pages = db.query(InfoPage).filter_by(is_published=True).order_by(
+            InfoPage.section.nulls_last(), InfoPage.updated_at.desc()).all()
+        # Group by section
+        sections: dict[str, list] = {}
+        for page in pages:
+            key = page.section or ""
+            sections.setdefault(key, []).append(page)
     return render_template(
         "intern/info_list.html", active_tab="informationen",
-        sections=sections, search=q,
+        sections=sections, search=q, snippets=snippets,
     )
 
 
@@ -10,7 +10,7 @@ from flask import (
 )
 
 from .auth import member_required, generate_csrf_token
-from .models import Manufacturer, Part, PartManufacturer, PartSynonym
+from .models import Manufacturer, Part, PartManufacturer, PartSynonym, load_part_rows
 from .search_parts import get_cached_parts, invalidate_cache, search_parts
 from . import get_db
 
@@ -19,8 +19,7 @@ parts_bp = Blueprint("parts", __name__)
 
 def _load_parts(db) -> list[dict]:
     """Load all parts with synonyms + manufacturers as plain dicts."""
-    parts = db.query(Part).order_by(Part.name).all()
-    return [p.to_dict() for p in parts]
+    return [row.to_dict() for row in load_part_rows(db)]
 
 
 def _loader(db):
@@ -41,10 +40,10 @@ def _get_or_create_manufacturer(db, name: str) -> Manufacturer:
 def list_parts():
     db = get_db()
     q = request.args.get("q", "").strip()
-    all_parts = _load_parts(db)
+    all_parts, version = get_cached_parts(_loader(db))
 
     if q:
-        results = search_parts(all_parts, q, limit=60)
+        results = search_parts(all_parts, q, limit=60, version=version)
     else:
         results = all_parts[:60]
 
@@ -69,8 +68,8 @@ def search():
     db = get_db()
     q = request.args.get("q", "").strip()
     limit = min(int(request.args.get("limit", 40)), 100)
-    all_parts = _load_parts(db)
-    results = search_parts(all_parts, q, limit=limit) if q else all_parts[:limit]
+    all_parts, version = get_cached_parts(_loader(db))
+    results = search_parts(all_parts, q, limit=limit, version=version) if q else all_parts[:limit]
     return jsonify(results)
 
 
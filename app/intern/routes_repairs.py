@@ -15,6 +15,7 @@ from werkzeug.utils import secure_filename
 
 from .auth import member_required, generate_csrf_token
 from .models import Machine, Member, Repair, RepairComment, RepairMedia, RepairSubscription, now_utc
+from .repair_stats import NO_REPAIRS, defective_machine_count, machine_repair_stats
 from . import get_db
 
 repairs_bp = Blueprint("repairs", __name__)
@@ -39,15 +40,23 @@ UPLOAD_DIR = Path(__file__).parent.parent / "static" / "intern" / "uploads"
 _PRIORITY_ORDER = {"critical": 0, "high": 1, "normal": 2, "low": 3}
 
 
+def open_repairs_query(db):
+    return db.query(Repair).filter(Repair.status.in_(["open", "in_progress"]))
+
+
+def machine_repairs_query(db, machine_id: int):
+    return (
+        db.query(Repair)
+        .filter_by(machine_id=machine_id)
+        .order_by(Repair.created_at.desc())
+    )
+
+
 @repairs_bp.route("/reparaturen/")
 @member_required
 def list_repairs():
     db = get_db()
-    open_repairs = (
-        db.query(Repair)
-        .filter(Repair.status.in_(["open", "in_progress"]))
-        .all()
-    )
+    open_repairs = open_repairs_query(db).all()
     open_repairs.sort(key=lambda r: (
         _PRIORITY_ORDER.get(r.priority, 2),
         r.created_at,
@@ -65,16 +74,10 @@ def list_repairs():
 def list_machines():
     db = get_db()
     machines = db.query(Machine).filter_by(is_active=True).order_by(Machine.display_name).all()
-    open_counts = {}
-    for m in machines:
-        open_counts[m.id] = (
-            db.query(Repair)
-            .filter_by(machine_id=m.id)
-            .filter(Repair.status.in_(["open", "in_progress"]))
-            .count()
-        )
+    stats = machine_repair_stats(db)
+    open_counts = {m.id: stats.get(m.id, NO_REPAIRS).active for m in machines}
     machines = sorted(machines, key=lambda m: (0 if open_counts[m.id] > 0 else 1, m.display_name))
-    defective_count = sum(1 for m in machines if open_counts[m.id] > 0)
+    defective_count = defective_machine_count(stats)
     return render_template(
         "intern/repair_list.html", active_tab="reparaturen",
         machines=machines, open_counts=open_counts,
@@ -90,12 +93,7 @@ def machine_repairs(machine_id: int):
     if not machine:
         flash("Flipper nicht gefunden.", "error")
         return redirect(url_for("intern.repairs.list_repairs"))
-    repairs = (
-        db.query(Repair)
-        .filter_by(machine_id=machine_id)
-        .order_by(Repair.created_at.desc())
-        .all()
-    )
+    repairs = machine_repairs_query(db, machine_id).all()
     return render_template(
         "intern/machine_repairs.html", active_tab="reparaturen",
         machine=machine, repairs=repairs,
@@ -257,13 +255,18 @@ def upload_media(repair_id: int):
     file.save(str(dest_path))
     relative_filename = f"{repair_id}/{safe_name}"
     db = get_db()
-    db.add(RepairMedia(
+    media = RepairMedia(
         repair_id=repair_id,
         filename=relative_filename,
         mime_type=mime,
         uploaded_by=g.current_member.id,
-    ))
+    )
+    db.add(media)
     db.commit()
+    # Verkleinern, EXIF entfernen, Vorschaubilder: im Hintergrund (media_processing.py)
+    processor = current_app.extensions.get("media_processor")
+    if processor is not None and processor.can_process(mime):
+        processor.submit(media.id)
     flash("Datei hochgeladen.", "success")
     return redirect(url_for("intern.repairs.repair_detail", repair_id=repair_id))
 
@@ -274,10 +277,13 @@ def delete_media(repair_id: int, media_id: int):
     db = get_db()
     media = db.get(RepairMedia, media_id)
     if media and media.repair_id == repair_id:
-        try:
-            (UPLOAD_DIR / media.filename).unlink(missing_ok=True)
-        except Exception:
-            pass
+        for name in (media.filename, media.thumb_filename):
+            if not name:
+                continue
+            try:
+                (UPLOAD_DIR / name).unlink(missing_ok=True)
+            except Exception:
+                pass
         db.delete(media)
         db.commit()
         flash("Datei gelöscht.", "success")
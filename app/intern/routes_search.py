@@ -0,0 +1,52 @@
+"""
+Portal-wide search (Suche) for the intern portal.
+"""
+
+from __future__ import annotations
+
+from flask import Blueprint, jsonify, request, url_for
+
+from .auth import member_required
+from .portal_search import KINDS, search
+from . import get_db
+
+search_bp = Blueprint("search", __name__)
+
+
+def _hit_url(hit: dict) -> str:
+    kind, ref_id, parent = hit["type"], hit["id"], hit["parent"]
+    if kind == "repair":
+        return url_for("intern.repairs.repair_detail", repair_id=ref_id)
+    if kind == "comment":
+        return url_for("intern.repairs.repair_detail", repair_id=parent, _anchor=f"kommentar-{ref_id}")
+    if kind == "contact":
+        return url_for("intern.contacts.list_contacts", q=hit["label"])
+    if kind == "todo":
+        return url_for("intern.todos.todo_detail", list_id=parent)
+    if kind == "info":
+        return url_for("intern.info.view_page", slug=parent)
+    return url_for("intern.parts.part_detail", part_id=ref_id)
+
+
+@search_bp.route("/suche")
+@member_required
+def portal_search():
+    """JSON search over repairs, comments, contacts, todos, info pages and parts.
+
+    ?q=…&type=repair,part&limit=20 – hits ranked by bm25, title/snippet as HTML
+    with <mark> around the matched terms.
+    """
+    db = get_db()
+    q = request.args.get("q", "").strip()
+    kinds = [k for k in request.args.get("type", "").split(",") if k in KINDS] or None
+    try:
+        limit = max(1, min(int(request.args.get("limit", 20)), 50))
+    except ValueError:
+        limit = 20
+    hits = search(db, q, kinds=kinds, limit=limit) if q else []
+    for hit in hits:
+        hit["url"] = _hit_url(hit)
+        hit["title"] = str(hit["title"] or hit["label"] or "")
+        hit["snippet"] = str(hit["snippet"])
+        del hit["parent"]
+    return jsonify({"query": q, "hits": hits})
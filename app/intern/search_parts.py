@@ -5,10 +5,14 @@ Ported and optimised from the standalone parts app (rapidfuzz-based).
 
 from __future__ import annotations
 
+import bisect
+import hashlib
 import re
-import time
+import threading
 from typing import Any
 
+from .models import bump_cache_version, get_cache_version
+
 try:
     from rapidfuzz import fuzz, process, utils as rf_utils
     _HAS_RAPIDFUZZ = True
@@ -22,24 +26,30 @@ _TOKEN_RE = re.compile(
     re.I,
 )
 
-# In-memory cache: (parts_list, timestamp)
-_cache: tuple[list[dict], float] | None = None
-_CACHE_TTL = 30.0  # seconds
+PARTS_CACHE_NAME = "parts"
+
+# In-memory cache: (version, parts_list); the version lives in the shared
+# cache_version table, so a write in one worker invalidates all of them.
+_cache: tuple[int, list[dict]] | None = None
 
 
 def invalidate_cache() -> None:
-    global _cache
+    """Call after every committed change to parts, synonyms or manufacturers."""
+    global _cache, _index
     _cache = None
+    _index = None
+    bump_cache_version(PARTS_CACHE_NAME)
 
 
-def get_cached_parts(loader_fn) -> list[dict]:
-    """Return cached part dicts, refreshing if stale."""
+def get_cached_parts(loader_fn) -> tuple[list[dict], int]:
+    """Return (parts, version), reloading only when the shared version moved."""
     global _cache
-    now = time.monotonic()
-    if _cache is None or (now - _cache[1]) > _CACHE_TTL:
-        parts = loader_fn()
-        _cache = (parts, now)
-    return _cache[0]
+    version = get_cache_version(PARTS_CACHE_NAME)
+    current = _cache
+    if current is None or current[0] != version:
+        current = (version, loader_fn())
+        _cache = current
+    return current[1], current[0]
 
 
 # ── normalisation helpers ────────────────────────────────────────────────────
@@ -108,102 +118,155 @@ def _build_choices(parts: list[dict]) -> list[tuple[str, int]]:
     return choices
 
 
-# ── core search ──────────────────────────────────────────────────────────────
+# ── search index ─────────────────────────────────────────────────────────────
 
-def search_parts(parts: list[dict], query: str, limit: int = 30) -> list[dict]:
-    """
-    Hybrid exact + fuzzy search.  Returns up to `limit` parts ranked by score.
-    Falls back to simple substring search if rapidfuzz is not installed.
-    """
-    query = query.strip()
-    if not query:
-        return parts[:limit]
-    if not parts:
-        return []
+_DIGIT_RE = re.compile(r"\d")
+_LETTER_RE = re.compile(r"[A-Za-zÄÖÜäöüß]")
 
-    if not _HAS_RAPIDFUZZ:
-        return _simple_search(parts, query, limit)
 
-    choices = _build_choices(parts)
-    choice_texts = [t for t, _ in choices]
-    tokens = query.split()
+class PartsIndex:
+    """
+    Precomputed search structures for one version of the parts list.
 
-    exact_sets: list[set[int]] = []
-    fuzzy_maps: list[dict[int, float]] = []
+    - choices / processed: choice texts and their rapidfuzz-processed form
+    - numeric / alnum: sorted (normalised candidate token, part id) pairs,
+      so exact and prefix matches are a bisect instead of a full scan
+    """
 
-    def _exact(token: str) -> set[int]:
-        tn = _norm_token(token)
-        has_letters = bool(re.search(r"[A-Za-zÄÖÜäöüß]", token))
-        has_digits  = bool(re.search(r"\d", token))
-        is_numeric  = has_digits and not has_letters
-        ta = _norm_alnum(token)
+    def __init__(self, parts: list[dict]):
+        self.parts = parts
+        self.choices = _build_choices(parts)
+        self.choice_pids = [pid for _, pid in self.choices]
+        self.processed = [rf_utils.default_process(t) for t, _ in self.choices] if _HAS_RAPIDFUZZ else []
+
+        numeric: set[tuple[str, int]] = set()
+        alnum: set[tuple[str, int]] = set()
+        for text, pid in self.choices:
+            for cand in _candidate_tokens(_norm_slash(text).lower()):
+                numeric.add((_norm_token(cand), pid))
+                alnum.add((_norm_alnum(cand), pid))
+        self.numeric = sorted(numeric)
+        self.alnum = sorted(alnum)
+
+    @staticmethod
+    def _prefix_hits(pairs: list[tuple[str, int]], prefix: str) -> set[int]:
+        # candidate == prefix, or prefix followed by digit-free rest (e.g. "12" → "12a")
         hits: set[int] = set()
-        for text, pid in choices:
-            normed = _norm_slash(str(text)).lower()
-            for cand in _candidate_tokens(normed):
-                cn = _norm_token(cand)
-                if is_numeric:
-                    if cn == tn or (cn.startswith(tn) and not re.search(r"\d", cn[len(tn):])):
-                        hits.add(pid); break
-                else:  # alnum or pure alpha
-                    ca = _norm_alnum(cand)
-                    if ca == ta or (ca.startswith(ta) and not re.search(r"\d", ca[len(ta):])):
-                        hits.add(pid); break
+        i = bisect.bisect_left(pairs, (prefix, -1))
+        n = len(prefix)
+        while i < len(pairs) and pairs[i][0].startswith(prefix):
+            cand, pid = pairs[i]
+            if not _DIGIT_RE.search(cand, n):
+                hits.add(pid)
+            i += 1
         return hits
 
-    def _fuzzy(token: str) -> dict[int, float]:
+    def exact(self, token: str) -> set[int]:
+        if _LETTER_RE.search(token):
+            return self._prefix_hits(self.alnum, _norm_alnum(token))
+        return self._prefix_hits(self.numeric, _norm_token(token))
+
+    def fuzzy(self, token: str) -> dict[int, float]:
         results = process.extract(
-            token, choice_texts,
+            rf_utils.default_process(token), self.processed,
             scorer=fuzz.WRatio,
-            processor=rf_utils.default_process,
+            processor=None,
             limit=MAX_CANDIDATES,
         )
         best: dict[int, float] = {}
         for _txt, score, idx in results:
             if score < MIN_SCORE:
                 continue
-            pid = choices[idx][1]
+            pid = self.choice_pids[idx]
             if score > best.get(pid, 0):
                 best[pid] = float(score)
         return best
 
-    for tok in tokens:
-        if re.search(r"\d", tok):
-            exact_sets.append(_exact(tok))
+    def search(self, query: str, limit: int = 30) -> list[dict]:
+        exact_sets: list[set[int]] = []
+        fuzzy_maps: list[dict[int, float]] = []
+        for tok in query.split():
+            if _DIGIT_RE.search(tok):
+                exact_sets.append(self.exact(tok))
+            else:
+                fuzzy_maps.append(self.fuzzy(tok))
+
+        # Combine
+        if fuzzy_maps:
+            if any(not m for m in fuzzy_maps):
+                return []
+            common = set(fuzzy_maps[0])
+            for m in fuzzy_maps[1:]:
+                common &= set(m)
+            for es in exact_sets:
+                common &= es
+            if not common:
+                return []
+            score_map = {
+                pid: sum(m[pid] for m in fuzzy_maps) / len(fuzzy_maps)
+                for pid in common
+            }
         else:
-            fuzzy_maps.append(_fuzzy(tok))
-
-    # Combine
-    if fuzzy_maps:
-        if any(not m for m in fuzzy_maps):
-            return []
-        common = set(fuzzy_maps[0])
-        for m in fuzzy_maps[1:]:
-            common &= set(m)
-        for es in exact_sets:
-            common &= es
-        if not common:
-            return []
-        score_map = {
-            pid: sum(m[pid] for m in fuzzy_maps) / len(fuzzy_maps)
-            for pid in common
-        }
-    else:
-        if not exact_sets:
-            return []
-        common = set.intersection(*exact_sets) if len(exact_sets) > 1 else exact_sets[0]
-        if not common:
-            return []
-        score_map = {pid: 100.0 for pid in common}
-
-    hits = []
-    for p in parts:
-        pid = int(p["id"])
-        if pid in score_map:
-            hits.append({**p, "_score": score_map[pid]})
+            if not exact_sets:
+                return []
+            common = set.intersection(*exact_sets) if len(exact_sets) > 1 else exact_sets[0]
+            if not common:
+                return []
+            score_map = {pid: 100.0 for pid in common}
+
+        hits = []
+        for p in self.parts:
+            pid = int(p["id"])
+            if pid in score_map:
+                hits.append({**p, "_score": score_map[pid]})
+
+        hits.sort(key=lambda x: (-x["_score"], x.get("name", "").lower()))
+        return hits[:limit]
+
+
+# Index for the most recent parts version: (version, PartsIndex)
+_index: tuple[object, PartsIndex] | None = None
+_index_lock = threading.Lock()
+
+
+def _parts_fingerprint(parts: list[dict]) -> str:
+    return hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+
+
+def get_index(parts: list[dict], version: object = None) -> PartsIndex:
+    """
+    Return the search index for `parts`, building it only when the data
+    version changes. Without an explicit version the list content is hashed.
+    """
+    global _index
+    if version is None:
+        version = _parts_fingerprint(parts)
+    current = _index
+    if current is not None and current[0] == version:
+        return current[1]
+    with _index_lock:
+        if _index is None or _index[0] != version:
+            _index = (version, PartsIndex(parts))
+        return _index[1]
+
+
+# ── core search ──────────────────────────────────────────────────────────────
+
+def search_parts(parts: list[dict], query: str, limit: int = 30, version: object = None) -> list[dict]:
+    """
+    Hybrid exact + fuzzy search.  Returns up to `limit` parts ranked by score.
+    Falls back to simple substring search if rapidfuzz is not installed.
+    """
+    query = query.strip()
+    if not query:
+        return parts[:limit]
+    if not parts:
+        return []
+
+    if not _HAS_RAPIDFUZZ:
+        return _simple_search(parts, query, limit)
 
-    hits.sort(key=lambda x: (-x["_score"], x.get("name", "").lower()))
-    return hits[:limit]
+    return get_index(parts, version).search(query, limit)
 
 
 def _simple_search(parts: list[dict], query: str, limit: int) -> list[dict]:
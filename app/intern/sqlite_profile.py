@@ -0,0 +1,144 @@
+"""
+SQLite performance profiles for the intern database.
+
+Selected via INTERN_DB_PROFILE (safe | balanced | fast, default: balanced);
+single PRAGMAs can be overridden with INTERN_DB_PRAGMAS, e.g.
+"cache_size=-32000,mmap_size=0". Every PRAGMA is applied on connect and
+read back, so a value SQLite silently ignores shows up in the log.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+# Applied in this order; journal_mode first, it is persistent in the DB file.
+PROFILES: dict[str, dict[str, object]] = {
+    # durable on power loss, small footprint
+    "safe": {
+        "journal_mode": "wal",
+        "synchronous": "full",
+        "foreign_keys": "on",
+        "busy_timeout": 5000,
+        "cache_size": -2000,
+        "mmap_size": 0,
+        "temp_store": "default",
+    },
+    # WAL + NORMAL is durable except for the last commits on power loss
+    "balanced": {
+        "journal_mode": "wal",
+        "synchronous": "normal",
+        "foreign_keys": "on",
+        "busy_timeout": 10000,
+        "cache_size": -16000,
+        "mmap_size": 64 * 1024 * 1024,
+        "temp_store": "memory",
+    },
+    "fast": {
+        "journal_mode": "wal",
+        "synchronous": "normal",
+        "foreign_keys": "on",
+        "busy_timeout": 15000,
+        "cache_size": -64000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "memory",
+    },
+}
+
+# PRAGMA value → what the read-back returns
+_ENUMS = {
+    "journal_mode": {"wal": "wal", "delete": "delete", "truncate": "truncate"},
+    "synchronous": {"off": 0, "normal": 1, "full": 2, "extra": 3},
+    "foreign_keys": {"off": 0, "on": 1},
+    "temp_store": {"default": 0, "file": 1, "memory": 2},
+}
+_INTS = {"busy_timeout", "cache_size", "mmap_size"}
+
+OPTIMIZE_INTERVAL = 3600  # seconds between "PRAGMA optimize" runs per process
+
+
+def _validate(name: str, value) -> object:
+    name = name.strip().lower()
+    if name in _ENUMS:
+        value = str(value).strip().lower()
+        if value not in _ENUMS[name]:
+            raise ValueError(f"Invalid value for PRAGMA {name}: {value!r}")
+        return value
+    if name in _INTS:
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"PRAGMA {name} expects an integer, got {value!r}") from None
+    raise ValueError(f"Unsupported PRAGMA: {name}")
+
+
+def load_profile(name: str | None = None, overrides: str | None = None) -> tuple[str, dict[str, object]]:
+    """Return (profile name, validated PRAGMAs) from arguments or environment."""
+    name = (name or os.environ.get("INTERN_DB_PROFILE") or "balanced").strip().lower()
+    if name not in PROFILES:
+        raise ValueError(f"Unknown INTERN_DB_PROFILE {name!r} (expected one of {', '.join(PROFILES)})")
+    pragmas = dict(PROFILES[name])
+    overrides = os.environ.get("INTERN_DB_PRAGMAS", "") if overrides is None else overrides
+    for item in filter(None, (x.strip() for x in overrides.split(","))):
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(f"INTERN_DB_PRAGMAS entry without '=': {item!r}")
+        key = key.strip().lower()
+        pragmas[key] = _validate(key, value)
+    return name, {k: _validate(k, v) for k, v in pragmas.items()}
+
+
+def _expected(name: str, value):
+    return _ENUMS[name][value] if name in _ENUMS else value
+
+
+def apply_pragmas(dbapi_conn, pragmas: dict[str, object]) -> None:
+    """Set all PRAGMAs on a new DB-API connection and warn about ignored ones."""
+    cur = dbapi_conn.cursor()
+    try:
+        for name, value in pragmas.items():
+            cur.execute(f"PRAGMA {name}={value}")
+            row = cur.execute(f"PRAGMA {name}").fetchone()
+            actual = row[0] if row else None
+            if isinstance(actual, str):
+                actual = actual.lower()
+            # mmap_size is capped by SQLITE_MAX_MMAP_SIZE at compile time
+            if actual != _expected(name, value) and name != "mmap_size":
+                log.warning("SQLite ignored PRAGMA %s=%s (effective: %s)", name, value, actual)
+    finally:
+        cur.close()
+
+
+def read_pragmas(dbapi_conn, names) -> dict[str, object]:
+    cur = dbapi_conn.cursor()
+    try:
+        return {name: cur.execute(f"PRAGMA {name}").fetchone()[0] for name in names}
+    finally:
+        cur.close()
+
+
+class Optimizer:
+    """Runs "PRAGMA optimize" on connection check-in at most every `interval` s."""
+
+    def __init__(self, interval: float = OPTIMIZE_INTERVAL):
+        self.interval = interval
+        self.last_run = time.monotonic()
+        self._lock = threading.Lock()
+
+    def maybe_run(self, dbapi_conn) -> bool:
+        now = time.monotonic()
+        if now - self.last_run < self.interval or not self._lock.acquire(blocking=False):
+            return False
+        try:
+            self.last_run = now
+            dbapi_conn.execute("PRAGMA optimize")
+            return True
+        except Exception as exc:  # never fail a request because of housekeeping
+            log.warning("PRAGMA optimize failed: %s", exc)
+            return False
+        finally:
+            self._lock.release()
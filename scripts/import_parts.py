@@ -45,6 +45,10 @@ def main(src: str, dst: str) -> None:
             part_id INTEGER NOT NULL REFERENCES part(id) ON DELETE CASCADE,
             manufacturer_id INTEGER NOT NULL REFERENCES manufacturer(id)
         );
+        CREATE TABLE IF NOT EXISTS cache_version (
+            name VARCHAR(50) PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        );
     """)
     dst_conn.commit()
 
@@ -131,6 +135,12 @@ def main(src: str, dst: str) -> None:
                         (new_part_id, mid),
                     )
 
+    # Running portal workers reload their parts cache on the next request
+    dst_cur.execute(
+        "INSERT INTO cache_version (name, version) VALUES ('parts', 1) "
+        "ON CONFLICT(name) DO UPDATE SET version = version + 1"
+    )
+    # the portal search index follows by its triggers (app/intern/portal_search.py)
     dst_conn.commit()
     final = dst_cur.execute("SELECT COUNT(*) FROM part").fetchone()[0]
     mfr_count = dst_cur.execute("SELECT COUNT(*) FROM manufacturer").fetchone()[0]
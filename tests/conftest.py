@@ -0,0 +1,16 @@
+"""
+Gemeinsames Test-Setup: Laufzeitdaten landen in einem temporären
+Verzeichnis statt in app/data. Muss vor dem ersten Import von app.app
+bzw. app.intern greifen, deshalb auf Modulebene.
+"""
+import os
+import shutil
+import tempfile
+
+_DATA_DIR = tempfile.mkdtemp(prefix="aixtraball-tests-")
+os.environ["INTERN_DB_PATH"] = os.path.join(_DATA_DIR, "intern.db")
+os.environ["RATE_LIMIT_DB"] = os.path.join(_DATA_DIR, "ratelimit.db")
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(_DATA_DIR, ignore_errors=True)
@@ -0,0 +1,808 @@
+"""
+Tests für Hilfsmodule des internen Portals (ohne laufende Blueprints).
+"""
+import socket
+import socketserver
+import threading
+from datetime import timedelta
+from email.message import EmailMessage
+
+import pytest
+
+from app.intern import search_parts as sp
+from app.intern.models import Base, bump_cache_version, engine
+
+pytest.importorskip("rapidfuzz")
+Base.metadata.create_all(engine)
+
+PARTS = [
+    {"id": 1, "name": "Flipper-Gummi 1 1/2", "article_number": "A-1205", "supplier": None,
+     "shelf": "R1", "bin": "12", "synonyms": ["Rubber"], "manufacturers": ["Williams"]},
+    {"id": 2, "name": "Spule 25-500", "article_number": "A-120", "supplier": "Marco",
+     "shelf": "R2", "bin": "3", "synonyms": ["Coil"], "manufacturers": ["Bally"]},
+    {"id": 3, "name": "Lampe 44", "article_number": "44a", "supplier": None,
+     "shelf": None, "bin": None, "synonyms": [], "manufacturers": []},
+]
+
+
+# ------------------------------------------------------------------
+# 1  Ersatzteil-Suche: Index pro Datenstand, exakte + unscharfe Treffer
+# ------------------------------------------------------------------
+@pytest.mark.parametrize("query, expected", [
+    ("500", [2]),            # Teil eines "25-500"-Tokens
+    ("44", [3]),             # "44" und "44a" (Buchstaben-Rest erlaubt)
+    ("A-120", [2]),          # kein Präfix-Treffer auf A-1205 (Ziffern im Rest)
+    ("R1 12", [1]),
+    ("spule", [2]),
+    ("coil 25", [2]),
+    ("xyzzy", []),
+])
+def test_search_parts(query, expected):
+    sp.invalidate_cache()
+    assert [p["id"] for p in sp.search_parts(PARTS, query)] == expected
+
+
+def test_search_index_reused_per_version():
+    sp.invalidate_cache()
+    first = sp.get_index(PARTS, version=1)
+    assert sp.get_index(PARTS, version=1) is first
+    assert sp.get_index(PARTS, version=2) is not first
+    # ohne Version entscheidet der Inhalt
+    assert sp.get_index(list(PARTS)) is sp.get_index(list(PARTS))
+
+
+def test_parts_cache_follows_shared_version():
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return PARTS
+
+    sp.invalidate_cache()
+    parts, version = sp.get_cached_parts(loader)
+    assert sp.get_cached_parts(loader) == (parts, version)
+    assert len(calls) == 1
+
+    # Schreibzugriff in einem anderen Worker: nur der Zähler in der DB ändert sich
+    bump_cache_version(sp.PARTS_CACHE_NAME)
+    assert sp.get_cached_parts(loader)[1] == version + 1
+    assert len(calls) == 2
+
+
+# ------------------------------------------------------------------
+# 2  Bulk-Loader: gleiche Daten wie Part.to_dict(), feste Query-Anzahl
+# ------------------------------------------------------------------
+def test_load_part_rows_matches_orm():
+    from sqlalchemy import event
+    from app.intern.models import (
+        Manufacturer, Part, PartManufacturer, PartSynonym, SessionLocal, load_part_rows,
+    )
+
+    db = SessionLocal()
+    try:
+        db.query(Part).delete()
+        bally = Manufacturer(name="Bulk Bally")
+        db.add(bally)
+        db.flush()
+        for i in range(20):
+            part = Part(name=f"Bulk Teil {i:02d}", stock=i, shelf="R9")
+            db.add(part)
+            db.flush()
+            db.add(PartSynonym(part_id=part.id, synonym=f"Syn {i}"))
+            if i % 2:
+                db.add(PartManufacturer(part_id=part.id, manufacturer_id=bally.id))
+        db.commit()
+
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            rows = load_part_rows(db)
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+
+        assert len(statements) == 3
+        expected = [p.to_dict() for p in db.query(Part).order_by(Part.name).all()]
+        assert [r.to_dict() for r in rows] == expected
+        assert rows[1].manufacturers == ("Bulk Bally",)
+    finally:
+        db.query(Part).delete()
+        db.query(Manufacturer).filter_by(name="Bulk Bally").delete()
+        db.commit()
+        db.close()
+
+
+# ------------------------------------------------------------------
+# 3  Dashboard: ungesehene Reparatur-Updates in einer Abfrage
+# ------------------------------------------------------------------
+def test_unseen_repairs_single_query():
+    from datetime import timedelta
+    from sqlalchemy import event
+    from app.intern.models import (
+        Machine, Member, Repair, RepairComment, RepairMedia, RepairSubscription,
+        SessionLocal, now_utc,
+    )
+    from app.intern.routes_dashboard import _unseen_repairs
+
+    db = SessionLocal()
+    try:
+        member = Member(email="dash-test@aixtraball.de")
+        machine = Machine(yaml_name="Dash Test", display_name="Dash Test")
+        db.add_all([member, machine])
+        db.flush()
+        seen = now_utc() - timedelta(hours=1)
+        repairs = [Repair(machine_id=machine.id, title=f"R{i}", created_by=member.id) for i in range(3)]
+        db.add_all(repairs)
+        db.flush()
+        for repair in repairs:
+            db.add(RepairSubscription(member_id=member.id, repair_id=repair.id, last_seen=seen))
+        db.add_all([
+            RepairComment(repair_id=repairs[0].id, member_id=member.id, body="neu"),
+            RepairComment(repair_id=repairs[0].id, member_id=member.id, body="alt",
+                          created_at=seen - timedelta(minutes=5)),
+            RepairMedia(repair_id=repairs[0].id, filename="a.jpg", mime_type="image/jpeg",
+                        uploaded_by=member.id),
+            RepairMedia(repair_id=repairs[2].id, filename="b.jpg", mime_type="image/jpeg",
+                        uploaded_by=member.id),
+        ])
+        db.commit()
+        member_id = member.id
+
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            unseen = _unseen_repairs(db, member_id)
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+
+        assert len(statements) == 1
+        assert [(u["repair"].title, u["count"]) for u in unseen] == [("R0", 2), ("R2", 1)]
+    finally:
+        db.rollback()
+        for model in (RepairSubscription, RepairComment, RepairMedia, Repair, Machine, Member):
+            db.query(model).delete()
+        db.commit()
+        db.close()
+
+
+# ------------------------------------------------------------------
+# 4  Reparatur-Statistik: offene/kritische Tickets pro Flipper gruppiert
+# ------------------------------------------------------------------
+def test_machine_repair_stats():
+    from app.intern.models import Machine, Member, Repair, SessionLocal
+    from app.intern.repair_stats import NO_REPAIRS, defective_machine_count, machine_repair_stats
+
+    db = SessionLocal()
+    try:
+        member = Member(email="stats-test@aixtraball.de")
+        busy = Machine(yaml_name="Stats A", display_name="Stats A")
+        fine = Machine(yaml_name="Stats B", display_name="Stats B")
+        retired = Machine(yaml_name="Stats C", display_name="Stats C", is_active=False)
+        db.add_all([member, busy, fine, retired])
+        db.flush()
+        for machine, status, priority in [
+            (busy, "open", "critical"), (busy, "in_progress", "normal"), (busy, "resolved", "critical"),
+            (fine, "resolved", "normal"), (retired, "open", "normal"),
+        ]:
+            db.add(Repair(machine_id=machine.id, title="x", status=status,
+                          priority=priority, created_by=member.id))
+        db.commit()
+
+        stats = machine_repair_stats(db)
+        assert stats[busy.id] == (1, 1, 1) and stats[busy.id].active == 2
+        assert stats.get(fine.id, NO_REPAIRS).active == 0
+        assert retired.id not in stats
+        assert defective_machine_count(stats) == 1
+    finally:
+        db.rollback()
+        for model in (Repair, Machine, Member):
+            db.query(model).delete()
+        db.commit()
+        db.close()
+
+
+# ------------------------------------------------------------------
+# 5  SQLite-Profil: PRAGMAs werden gesetzt und sind auslesbar
+# ------------------------------------------------------------------
+def test_sqlite_profile_applied():
+    from app.intern.models import DB_PRAGMAS, effective_db_settings
+
+    settings = effective_db_settings()
+    assert settings["pool"]["class"] == "QueuePool"
+    assert settings["pragmas"]["journal_mode"] == "wal"
+    assert settings["pragmas"]["foreign_keys"] == 1
+    assert settings["pragmas"]["busy_timeout"] == DB_PRAGMAS["busy_timeout"]
+    assert settings["pragmas"]["cache_size"] == DB_PRAGMAS["cache_size"]
+
+
+def test_sqlite_profile_validation():
+    from app.intern.sqlite_profile import load_profile
+
+    name, pragmas = load_profile("fast", "cache_size=-1000, synchronous=FULL")
+    assert name == "fast"
+    assert pragmas["cache_size"] == -1000 and pragmas["synchronous"] == "full"
+    for bad in ("synchronous=sometimes", "cache_size=viel", "page_size=4096", "cache_size"):
+        with pytest.raises(ValueError):
+            load_profile("balanced", bad)
+    with pytest.raises(ValueError):
+        load_profile("turbo", "")
+
+
+# ------------------------------------------------------------------
+# 6  Migrationen: einmalig, auch für Datenbanken von vor schema_version
+# ------------------------------------------------------------------
+def test_migrations_apply_once(tmp_path):
+    from sqlalchemy import create_engine, text
+    from app.intern import migrations
+
+    legacy = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with legacy.begin() as conn:
+        # Stand vor den ALTER-TABLE-Spalten, ohne schema_version
+        conn.execute(text("CREATE TABLE info_page (id INTEGER PRIMARY KEY, title VARCHAR(200))"))
+
+    assert migrations.current_version(legacy) == 0
+    assert migrations.run_migrations(legacy) == migrations.LATEST_VERSION
+    with legacy.connect() as conn:
+        assert "section" in migrations._columns(conn, "info_page")
+        assert "min_members" in migrations._columns(conn, "event")
+        triggers = conn.execute(text(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'search_index_%'"
+        )).scalar()
+        assert triggers > 0                                  # Suchindex per Trigger synchron
+        applied = conn.execute(text("SELECT COUNT(*) FROM schema_version")).scalar()
+    assert applied == len(migrations.MIGRATIONS)
+
+    # zweiter Start: nur noch die Versionsabfrage
+    assert migrations.run_migrations(legacy) == migrations.LATEST_VERSION
+    with legacy.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM schema_version")).scalar() == applied
+
+
+# ------------------------------------------------------------------
+# 7  Index-Advisor: keine Full-Table-Scans in den Hot-Queries
+# ------------------------------------------------------------------
+def test_hot_queries_use_indexes():
+    from app.intern.models import SessionLocal
+    from app.intern.query_advisor import check_hot_queries
+
+    db = SessionLocal()
+    try:
+        assert check_hot_queries(db) == {}
+    finally:
+        db.close()
+
+
+def test_index_migration_on_legacy_db(tmp_path):
+    from sqlalchemy import create_engine, inspect, text
+    from app.intern import migrations
+
+    legacy = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with legacy.begin() as conn:
+        # Tabelle aus der Zeit vor den Indizes – create_all legt dort keine an
+        conn.execute(text("CREATE TABLE repair_comment (id INTEGER PRIMARY KEY, repair_id INTEGER, "
+                          "member_id INTEGER, body TEXT, created_at DATETIME)"))
+    migrations.run_migrations(legacy)
+    assert "ix_repair_comment_repair_created" in {
+        ix["name"] for ix in inspect(legacy).get_indexes("repair_comment")
+    }
+
+
+# ------------------------------------------------------------------
+# 8  Member-Identität: Snapshot-Cache mit gemeinsamer Versionsmarke
+# ------------------------------------------------------------------
+def test_member_identity_cache():
+    from flask import Flask
+    from app.intern import auth
+    from app.intern.models import Member, SessionLocal
+
+    db = SessionLocal()
+    member = Member(email="ident.test@aixtraball.de", display_name="Ident")
+    db.add(member)
+    db.commit()
+    member_id = member.id
+    flask_app = Flask(__name__)
+    try:
+        auth.invalidate_member_cache()
+        with flask_app.app_context():
+            first = auth._load_identity(member_id)
+            assert first.get_display_name() == "Ident" and first.is_active
+            # Änderung ohne Invalidierung: Snapshot bleibt bis TTL/Version
+            db.get(Member, member_id).is_active = False
+            db.commit()
+            assert auth._load_identity(member_id) is first
+        # z. B. in einem anderen Worker deaktiviert → Version steigt
+        auth.bump_cache_version(auth.MEMBER_CACHE_NAME)
+        with flask_app.app_context():
+            assert auth._load_identity(member_id).is_active is False
+    finally:
+        db.query(Member).filter_by(id=member_id).delete()
+        db.commit()
+        db.close()
+
+
+# ------------------------------------------------------------------
+# 9  Mail-Queue: Zustellung über eine Verbindung, Backoff, Circuit Breaker
+# ------------------------------------------------------------------
+class _SmtpStandIn(socketserver.StreamRequestHandler):
+    """Minimaler SMTP-Server: nimmt alles an und merkt sich die Nachrichten.
+
+    Empfänger mit "reject" werden mit 550 abgelehnt; server.mail_reply ersetzt
+    die Antwort auf MAIL FROM (z. B. 530 ohne Anmeldung).
+    """
+
+    def handle(self):
+        self.server.connections += 1
+        self.wfile.write(b"220 stand-in\r\n")
+        while line := self.rfile.readline():
+            cmd = line[:4].upper()
+            if cmd == b"DATA":
+                self.wfile.write(b"354 go ahead\r\n")
+                data = []
+                while (line := self.rfile.readline()) not in (b".\r\n", b""):
+                    data.append(line)
+                self.server.messages.append(b"".join(data).decode())
+                self.wfile.write(b"250 queued\r\n")
+            elif cmd == b"MAIL" and self.server.mail_reply:
+                self.wfile.write(self.server.mail_reply)
+            elif cmd == b"RCPT" and b"reject" in line:
+                self.wfile.write(b"550 no such user\r\n")
+            elif cmd == b"QUIT":
+                self.wfile.write(b"221 bye\r\n")
+                return
+            else:
+                self.wfile.write(b"250 ok\r\n")
+
+
+@pytest.fixture
+def smtp_stand_in():
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _SmtpStandIn)
+    server.daemon_threads = True
+    server.connections, server.messages, server.mail_reply = 0, [], None
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _mail(to, subject):
+    msg = EmailMessage()
+    msg["Subject"], msg["From"], msg["To"] = subject, "portal@aixtraball.de", to
+    msg.set_content("Hallo")
+    return msg
+
+
+def _closed_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_mail_queue_delivery_and_retry(tmp_path, smtp_stand_in):
+    from sqlalchemy import create_engine, select, update
+    from app.intern import mail_queue as mq
+    from app.intern.models import OutboundMail
+
+    queue_engine = create_engine(f"sqlite:///{tmp_path / 'mail.db'}")
+    OutboundMail.__table__.create(queue_engine)
+    good = mq.SmtpSettings("127.0.0.1", smtp_stand_in.server_address[1],
+                           sender="portal@aixtraball.de", use_tls=False, timeout=5)
+
+    def status():
+        with queue_engine.connect() as conn:
+            return {r.id: (r.status, r.attempts) for r in conn.execute(OutboundMail.__table__.select())}
+
+    # zwei Mails, eine SMTP-Sitzung
+    queue = mq.MailQueue(queue_engine, good)
+    first = queue.enqueue(_mail("a@example.org", "Eins"), kind="test")
+    second = queue.enqueue(_mail("b@example.org", "Zwei"), kind="test")
+    assert queue.drain() == 2
+    queue.connection.close()
+    assert status() == {first: ("sent", 1), second: ("sent", 1)}
+    assert smtp_stand_in.connections == 1
+    with queue_engine.connect() as conn:                   # kein Magic-Link/PIN mehr gespeichert
+        assert set(conn.execute(select(OutboundMail.message)).scalars()) == {""}
+    assert "Subject: Zwei" in smtp_stand_in.messages[1]
+
+    # Relay nicht erreichbar: Backoff, nach 2 Fehlern öffnet der Breaker
+    clock = [0.0]
+    breaker = mq.CircuitBreaker(threshold=2, cooldown=60, clock=lambda: clock[0])
+    bad = mq.SmtpSettings("127.0.0.1", _closed_port(), sender="portal@aixtraball.de",
+                          use_tls=False, timeout=5)
+    queue = mq.MailQueue(queue_engine, bad, breaker=breaker, max_attempts=3)
+    assert [queue.backoff(n) for n in (1, 2, 3, 20)] == [30, 60, 120, 3600]
+    third = queue.enqueue(_mail("c@example.org", "Drei"), kind="test")
+
+    def make_due():
+        with queue_engine.begin() as conn:
+            conn.execute(update(OutboundMail).where(OutboundMail.id == third)
+                         .values(next_attempt_at=mq.now_utc()))
+
+    assert queue.process_one() and status()[third] == ("pending", 1)
+    assert queue.process_one() is False  # Retry liegt 30 s in der Zukunft
+    make_due()
+    assert queue.process_one() and breaker.state == "open"
+    make_due()
+    assert queue.process_one() is False and status()[third] == ("pending", 2)
+
+    # nach Cooldown: Probeversand über das wieder erreichbare Relay
+    clock[0] = 61
+    queue.connection = mq.SmtpConnection(good)
+    assert queue.process_one() and breaker.state == "closed"
+    queue.connection.close()
+    assert status()[third] == ("sent", 3)
+
+    # unbekannter Empfänger: endgültig, das Relay gilt als gesund
+    queue.breaker = mq.CircuitBreaker(threshold=1)
+    fourth = queue.enqueue(_mail("reject@example.org", "Vier"), kind="test")
+    assert queue.process_one() and status()[fourth] == ("failed", 1)
+    assert queue.breaker.state == "closed"
+
+    # 530 ohne Anmeldung (Relay falsch konfiguriert): Retry, Breaker öffnet
+    smtp_stand_in.mail_reply = b"530 authentication required\r\n"
+    fifth = queue.enqueue(_mail("e@example.org", "Fünf"), kind="test")
+    assert queue.process_one() and status()[fifth] == ("pending", 1)
+    assert queue.breaker.state == "open"
+    queue.connection.close()
+
+    # Aufräumen: alte versendete und fehlgeschlagene Mails verschwinden, offene bleiben
+    with queue_engine.begin() as conn:
+        conn.execute(update(OutboundMail).where(OutboundMail.id == first)
+                     .values(sent_at=mq.now_utc() - timedelta(hours=7)))
+        conn.execute(update(OutboundMail).where(OutboundMail.id == fourth)
+                     .values(created_at=mq.now_utc() - timedelta(days=8)))
+    assert queue.purge() == 2
+    assert set(status()) == {second, third, fifth}
+
+    # ohne SMTP-Konfiguration wird nichts angenommen
+    with pytest.raises(RuntimeError):
+        mq.MailQueue(queue_engine, mq.SmtpSettings(None)).enqueue(_mail("d@example.org", "Vier"))
+
+
+# ------------------------------------------------------------------
+# 10  Reparatur-Medien: Verarbeitung im Hintergrund, EXIF entfernt
+# ------------------------------------------------------------------
+def test_repair_media_processed_off_request(tmp_path):
+    Image = pytest.importorskip("PIL.Image")
+    from datetime import timedelta
+    from app.intern.media_processing import DISPLAY_MAX, STALE_AFTER, THUMB_MAX, MediaProcessor
+    from app.intern.models import Machine, Member, Repair, RepairMedia, SessionLocal, now_utc
+
+    (tmp_path / "7").mkdir()
+    exif = Image.Exif()
+    exif[0x010F] = "Handy"           # Make
+    exif[0x8825] = {2: (50.0, 46.0, 0.0)}  # GPS
+    Image.new("RGB", (4000, 3000), (10, 120, 200)).save(tmp_path / "7" / "foto.jpg", exif=exif)
+
+    db = SessionLocal()
+    member = Member(email="media-test@aixtraball.de")
+    machine = Machine(yaml_name="Media Test", display_name="Media Test")
+    db.add_all([member, machine])
+    db.flush()
+    repair = Repair(machine_id=machine.id, title="Foto", created_by=member.id)
+    db.add(repair)
+    db.flush()
+    photo = RepairMedia(repair_id=repair.id, filename="7/foto.jpg", mime_type="image/jpeg",
+                        uploaded_by=member.id)
+    db.add(photo)
+    db.commit()
+    processor = MediaProcessor(tmp_path)
+    try:
+        assert photo.processing_status == "pending"
+        assert processor.submit(photo.id).result(timeout=30) == "done"
+        assert processor.process(photo.id) is None            # schon erledigt, kein zweiter Lauf
+        db.expire_all()
+        assert (photo.filename, photo.thumb_filename) == (
+            f"7/foto_{photo.id}_display.jpg", f"7/foto_{photo.id}_thumb.jpg")
+        assert not (tmp_path / "7" / "foto.jpg").exists()     # Original mit GPS-Daten entfernt
+        with Image.open(tmp_path / photo.filename) as im:
+            assert max(im.size) == DISPLAY_MAX and not im.getexif()
+        with Image.open(tmp_path / photo.thumb_filename) as im:
+            assert max(im.size) == THUMB_MAX
+
+        # gleicher Dateiname erneut hochgeladen, Worker beim ersten Versuch abgebrochen
+        Image.new("RGB", (800, 600), (200, 20, 20)).save(tmp_path / "7" / "foto.jpg")
+        again = RepairMedia(repair_id=repair.id, filename="7/foto.jpg", mime_type="image/jpeg",
+                            uploaded_by=member.id, processing_status="processing",
+                            processing_started_at=now_utc() - STALE_AFTER - timedelta(minutes=1))
+        fresh = RepairMedia(repair_id=repair.id, filename="7/anderes.jpg", mime_type="image/jpeg",
+                            uploaded_by=member.id, processing_status="processing",
+                            processing_started_at=now_utc())
+        db.add_all([again, fresh])
+        db.commit()
+        assert processor.process(fresh.id) is None              # läuft noch in einem anderen Worker
+        assert processor.process(again.id) == "done"            # hängender Claim wird übernommen
+        db.expire_all()
+        assert again.filename == f"7/foto_{again.id}_display.jpg"
+        assert len({photo.filename, photo.thumb_filename, again.filename, again.thumb_filename}) == 4
+        with Image.open(tmp_path / photo.filename) as im:
+            assert max(im.size) == DISPLAY_MAX                  # erstes Foto nicht überschrieben
+    finally:
+        processor.shutdown()
+        db.delete(repair)
+        db.query(RepairMedia).filter_by(repair_id=repair.id).delete()
+        db.delete(machine)
+        db.delete(member)
+        db.commit()
+        db.close()
+
+
+# ------------------------------------------------------------------
+# 11  Info-Seiten: FTS5-Index per Trigger, bm25-Ranking, Snippets
+# ------------------------------------------------------------------
+def test_info_page_fulltext_search():
+    from app.intern.models import InfoPage, Member, SessionLocal
+    from app.intern.routes_info import search_pages
+
+    db = SessionLocal()
+    member = Member(email="info-fts@aixtraball.de")
+    db.add(member)
+    db.flush()
+    coil = InfoPage(title="Spulen tauschen", slug="fts-spulen", section="Reparatur",
+                    content_html="<p>Erst die <b>Sicherung</b> prüfen, dann die Spule &amp; Diode.</p>",
+                    created_by=member.id)
+    rubber = InfoPage(title="Gummis", slug="fts-gummis",
+                      content_html="<p>Alte Gummis ersetzen. Die Spule bleibt drin.</p>"
+                                   "<script>alert('x')</script>&lt;b&gt;",
+                      created_by=member.id)
+    hidden = InfoPage(title="Spule Entwurf", slug="fts-entwurf", content_html="", is_published=False,
+                      created_by=member.id)
+    db.add_all([coil, rubber, hidden])
+    db.commit()
+    try:
+        results = search_pages(db, "spule")
+        assert [p.slug for p, _ in results] == ["fts-spulen", "fts-gummis"]   # Titel wiegt mehr
+        assert "<mark>Sicherung</mark>" in search_pages(db, "sicher")[0][1]  # Präfix, HTML entfernt
+        assert [p.slug for p, _ in search_pages(db, "prufen")] == ["fts-spulen"]  # ohne Umlaut
+        assert search_pages(db, "alert") == []                               # <script> nicht indexiert
+        assert "&lt;b&gt;" in str(search_pages(db, "ersetzen")[0][1])        # Snippet escaped
+
+        rubber.content_html = "<p>Nur noch Gummis.</p>"                      # Update-Trigger
+        db.commit()
+        assert [p.slug for p, _ in search_pages(db, "spule")] == ["fts-spulen"]
+        db.query(InfoPage).filter_by(slug="fts-gummis").update({"is_published": False})  # Bulk-Update
+        db.commit()
+        assert search_pages(db, "gummis") == []
+        db.query(InfoPage).filter_by(slug="fts-spulen").delete()             # Bulk-Delete-Trigger
+        db.commit()
+        assert search_pages(db, "spule") == []
+    finally:
+        db.query(InfoPage).filter(InfoPage.slug.like("fts-%")).delete()
+        db.delete(member)
+        db.commit()
+        db.close()
+
+
+# ------------------------------------------------------------------
+# 12  Portal-Suche: ein Index für alle Bereiche, per Trigger gepflegt
+# ------------------------------------------------------------------
+def test_portal_search_index():
+    from app.intern.models import (
+        Contact, Machine, Member, Part, PartSynonym, Repair, RepairComment, SessionLocal,
+        TodoItem, TodoList, TodoSection,
+    )
+    from app.intern.portal_search import search
+
+    db = SessionLocal()
+    member = Member(email="portal-search@aixtraball.de")
+    machine = Machine(yaml_name="Search Gorgar", display_name="Gorgar")
+    db.add_all([member, machine])
+    db.flush()
+    repair = Repair(machine=machine, title="Slingshot zuckt", description="Kondensator am Gleichrichter",
+                    created_by=member.id)
+    todo_list = TodoList(title="Werkstatt", created_by=member.id)
+    todo_list.sections.append(TodoSection(title="Einkauf", items=[TodoItem(text="Gleichrichter bestellen")]))
+    contact = Contact(name="Elektro Müller", note="liefert Gleichrichter", created_by=member.id)
+    part = Part(name="Gleichrichter Brücke 35A", article_number="BR-35")
+    db.add_all([repair, todo_list, contact, part])
+    db.flush()
+    db.add(RepairComment(repair=repair, member_id=member.id, body="Gleichrichter getauscht, läuft"))
+    db.commit()
+    try:
+        hits = search(db, "gleichrichter")
+        assert {h["type"] for h in hits} == {"repair", "comment", "contact", "todo", "part"}
+        assert hits[0]["type"] in {"todo", "part"}                      # Titeltreffer zuerst
+        by_type = {h["type"]: h for h in hits}
+        assert by_type["repair"]["label"] == "Gorgar"
+        assert by_type["todo"]["label"] == "Werkstatt · Einkauf"
+        assert "<mark>Gleichrichter</mark>" in by_type["comment"]["snippet"]
+        assert [h["type"] for h in search(db, "mull", kinds=["contact"])] == ["contact"]   # ohne Umlaut
+
+        # Änderungen über die Session: Synonym landet im Teil-Dokument, Löschen entfernt Treffer
+        db.add(PartSynonym(part_id=part.id, synonym="Rectifier"))
+        repair.description = "Lötstelle nachgelötet"
+        db.delete(contact)
+        db.commit()
+        assert [h["id"] for h in search(db, "rectif")] == [part.id]
+        assert {h["type"] for h in search(db, "gleichrichter")} == {"comment", "todo", "part"}
+
+        db.query(Repair).filter_by(id=repair.id).delete()               # Kommentare per FK-Cascade
+        db.commit()
+        assert {h["type"] for h in search(db, "gleichrichter")} == {"todo", "part"}
+        assert len(search(db, "gleichrichter", limit=2)) == 2           # keine toten Treffer im LIMIT
+    finally:
+        db.rollback()
+        for obj in (db.get(Repair, repair.id), db.get(Contact, contact.id), todo_list, part, machine, member):
+            if obj is not None:
+                db.delete(obj)
+        db.commit()
+        assert search(db, "gleichrichter") == []
+        db.close()
+
+
+# ------------------------------------------------------------------
+# 13  iCal-Feed: Snapshot pro Versionsstand, VEVENTs wiederverwendet
+# ------------------------------------------------------------------
+def test_ical_feed_snapshot():
+    from datetime import date, datetime
+    from app.intern import ical_feed
+    from app.intern.models import Event, EventAssignment, Member, SessionLocal
+
+    db = SessionLocal()
+    member = Member(email="ical-feed@aixtraball.de")
+    db.add(member)
+    db.flush()
+    spring = Event(title="Frühjahrsputz; Werkstatt", start_dt=datetime(2031, 3, 1, 10),
+                   end_dt=datetime(2031, 3, 1, 16), created_by=member.id)
+    cup = Event(title="Turnier", start_dt=datetime(2031, 6, 1, 12), created_by=member.id)
+    old = Event(title="Archiv", start_dt=datetime(2020, 1, 1), is_archived=True, created_by=member.id)
+    db.add_all([spring, cup, old])
+    db.flush()
+    db.add(EventAssignment(event_id=cup.id, member_id=member.id))
+    db.commit()
+    ical_feed.invalidate_events()
+    try:
+        first = ical_feed.get_snapshot(db)
+        assert ical_feed.get_snapshot(db) is first                       # gleiche Version: kein Query
+        ours = [e for e in first.events if e.id in {spring.id, cup.id}]
+        assert [e.id for e in ours] == [spring.id, cup.id]
+        assert old.id not in {e.id for e in first.events}
+        assert "SUMMARY:Frühjahrsputz\\; Werkstatt\r\n" in first.full_calendar()
+
+        assert [e.id for e in first.select(member_id=member.id)] == [cup.id]
+        window = first.select(start=datetime(2031, 3, 1, 12), end=datetime(2031, 4, 1))
+        assert spring.id in {e.id for e in window} and cup.id not in {e.id for e in window}
+
+        cup.title = "Turnier (verschoben)"
+        cup.updated_at = datetime(2031, 1, 1)
+        db.commit()
+        ical_feed.invalidate_events()
+        second = ical_feed.get_snapshot(db)
+        by_id = {e.id: e for e in second.events}
+        assert by_id[spring.id] is next(e for e in first.events if e.id == spring.id)  # unverändert
+        assert "SUMMARY:Turnier (verschoben)" in by_id[cup.id].vevent
+
+        today = date(2031, 3, 10)
+        assert ical_feed.parse_window_bound("-30", today) == datetime(2031, 2, 8)
+        assert ical_feed.parse_window_bound("2031-05-01", today) == datetime(2031, 5, 1)
+        assert ical_feed.parse_window_bound("", today) is None
+        with pytest.raises(ValueError):
+            ical_feed.parse_window_bound("morgen", today)
+        with pytest.raises(OverflowError):
+            ical_feed.parse_window_bound("+99999999", today)
+    finally:
+        for event in (spring, cup, old):
+            db.delete(event)
+        db.delete(member)
+        db.commit()
+        db.close()
+
+
+def test_ical_route_revalidates_on_version_only():
+    from datetime import datetime
+    from flask import Flask
+    from app.intern import ical_feed
+    from app.intern.models import Event, EventAssignment, Member, SessionLocal
+    from app.intern.routes_calendar import calendar_bp
+
+    flask_app = Flask(__name__)
+    flask_app.register_blueprint(calendar_bp)
+    client = flask_app.test_client()
+    db = SessionLocal()
+    member = Member(email="ical-route@aixtraball.de", ical_token="ical-route-token")
+    db.add(member)
+    db.flush()
+    cup = Event(title="Liga", start_dt=datetime(2031, 9, 1, 18), created_by=member.id)
+    db.add(cup)
+    db.commit()
+    ical_feed.invalidate_events()
+    url = "/ical?token=ical-route-token&mine=1"
+    try:
+        first = client.get(url)
+        assert first.status_code == 200 and "Last-Modified" not in first.headers
+        assert "Liga" not in first.get_data(as_text=True)
+        etag = first.headers["ETag"]
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+        # Anmeldung ändert kein updated_at – nur die Version
+        db.add(EventAssignment(event_id=cup.id, member_id=member.id))
+        db.commit()
+        ical_feed.invalidate_events()
+        since_only = client.get(url, headers={"If-Modified-Since": "Wed, 01 Jan 2031 00:00:00 GMT"})
+        assert since_only.status_code == 200 and "Liga" in since_only.get_data(as_text=True)
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 200
+    finally:
+        db.delete(cup)
+        db.delete(member)
+        db.commit()
+        db.close()
+
+
+# ------------------------------------------------------------------
+# 14  vCard-Export: zeilenweise gestreamt, "geändert seit"-Variante
+# ------------------------------------------------------------------
+def test_vcard_export_stream():
+    from datetime import datetime
+    from app.intern.models import Contact, Member, SessionLocal
+    from app.intern.routes_contacts import _stream_vcards, export_query
+
+    db = SessionLocal()
+    member = Member(email="vcard-export@aixtraball.de")
+    db.add(member)
+    db.flush()
+    db.add_all([
+        Contact(name="vcf Zander", phone="0241 1", created_by=member.id, updated_at=datetime(2030, 1, 1)),
+        Contact(name="vcf Abel", email="abel@example.org", note="Zeile 1\nZeile 2",
+                created_by=member.id, updated_at=datetime(2030, 6, 1)),
+    ])
+    db.commit()
+    try:
+        stream = _stream_vcards(export_query().where(Contact.name.like("vcf %")))
+        first = next(stream)                                  # erster Block ohne Gesamtlast
+        assert first.startswith("BEGIN:VCARD\nVERSION:3.0\nFN:vcf Abel\n")
+        assert "NOTE:Zeile 1\\nZeile 2" in first
+        rest = "".join(stream)
+        assert rest.startswith("\nBEGIN:VCARD") and "TEL;TYPE=CELL:0241 1" in rest
+
+        changed = "".join(_stream_vcards(
+            export_query(datetime(2030, 3, 1)).where(Contact.name.like("vcf %"))))
+        assert "FN:vcf Abel" in changed and "Zander" not in changed
+    finally:
+        db.query(Contact).filter(Contact.name.like("vcf %")).delete()
+        db.delete(member)
+        db.commit()
+        db.close()
+
+
+def test_vcard_export_route_validators():
+    from datetime import datetime
+    from flask import Flask
+    from app.intern.auth import invalidate_member_cache
+    from app.intern.models import Contact, Member, SessionLocal
+    from app.intern.routes_contacts import contacts_bp
+
+    flask_app = Flask(__name__)
+    flask_app.secret_key = "test"
+    flask_app.register_blueprint(contacts_bp)
+    client = flask_app.test_client()
+    db = SessionLocal()
+    member = Member(email="vcard-route@aixtraball.de")
+    db.add(member)
+    db.flush()
+    old = Contact(name="vcr Alt", created_by=member.id, updated_at=datetime(2030, 1, 1))
+    new = Contact(name="vcr Neu", created_by=member.id, updated_at=datetime(2030, 6, 1))
+    db.add_all([old, new])
+    db.commit()
+    invalidate_member_cache()                             # SQLite vergibt gelöschte IDs neu
+    with client.session_transaction() as sess:
+        sess["member_id"] = member.id
+    try:
+        first = client.get("/kontakte/export.vcf")
+        assert first.status_code == 200 and "Last-Modified" not in first.headers
+        since = first.headers["X-Next-Since"]
+        assert client.get("/kontakte/export.vcf",
+                          query_string={"since": since}).get_data(as_text=True) == ""
+
+        # Löschen bewegt kein updated_at: nur die ETag merkt es
+        db.delete(old)
+        db.commit()
+        since_only = client.get("/kontakte/export.vcf",
+                                headers={"If-Modified-Since": "Wed, 01 Jan 2031 00:00:00 GMT"})
+        assert since_only.status_code == 200 and "vcr Alt" not in since_only.get_data(as_text=True)
+        assert client.get("/kontakte/export.vcf",
+                          headers={"If-None-Match": first.headers["ETag"]}).status_code == 200
+    finally:
+        db.query(Contact).filter(Contact.name.like("vcr %")).delete()
+        db.delete(member)
+        db.commit()
+        db.close()
@@ -166,3 +166,341 @@ def test_admin_add_entry_via_form(client):
     )
     data = yaml.safe_load((CONFIG / "flippers.yaml").read_text())
     assert any(f.get("name") == "Neu" for f in data)
+
+
+# ------------------------------------------------------------------
+# 7  Content-Store teilt schreibgeschützte Inhalte
+# ------------------------------------------------------------------
+def test_content_store_is_shared_and_readonly():
+    from app.app import load_content, load_yaml
+
+    first = load_content("members.yaml")
+    assert load_content("members.yaml") is first, "Inhalt wird pro Request neu aufgebaut"
+    with pytest.raises(TypeError):
+        first[0]["name"] = "Mallory"
+    # Admin-Schreibpfade bekommen weiterhin eine veränderbare Kopie
+    editable = load_yaml("members.yaml")
+    editable[0]["name"] = "Mallory"
+    assert load_content("members.yaml")[0]["name"] == "Jane Doe"
+
+    _write("members.yaml", [{"name": "John Roe", "role": "Kassenwart"}])
+    assert load_content("members.yaml")[0]["name"] == "John Roe"
+
+
+# ------------------------------------------------------------------
+# 8  News-Index: Sortierung, Slug-Lookup und Sichtbarkeitsfenster
+# ------------------------------------------------------------------
+def test_news_index_respects_visibility_window(client):
+    from app.app import news_index
+
+    now = datetime.now()
+    _write("news.yaml", [
+        {"title": "Alt", "slug": "alt", "date": "2020-01-01", "category": "Verein",
+         "preview_image": "images/slide.jpg"},
+        {"title": "Neu", "slug": "neu", "date": now.strftime("%Y-%m-%d"),
+         "preview_image": "images/slide.jpg"},
+        {"title": "Geplant", "slug": "geplant", "date": "2021-05-01",
+         "preview_image": "images/slide.jpg",
+         "visible_from": (now + timedelta(days=2)).strftime("%Y-%m-%d %H:%M")},
+    ])
+    index = news_index()
+    assert [n["slug"] for n in index.items] == ["neu", "geplant", "alt"]
+    assert [n["slug"] for n in index.visible()] == ["neu", "alt"]
+    assert [n["slug"] for n in index.visible(now + timedelta(days=3))] == ["neu", "geplant", "alt"]
+    assert index.visible_years() == [now.year, 2020]
+
+    assert client.get("/news/alt").status_code == 200
+    assert client.get("/news/geplant").status_code == 302
+    html = client.get("/news?year=2020").data.decode()
+    assert "Alt" in html and "Geplant" not in html
+
+
+# ------------------------------------------------------------------
+# 9  Öffnungstage: nächster Termin per bisect
+# ------------------------------------------------------------------
+def test_opening_schedule_picks_next_unfinished_opening():
+    from app.app import OpeningSchedule, LOCAL_TZ
+
+    schedule = OpeningSchedule([
+        {"from": "2030-03-01T11:00:00+01:00", "to": "2030-03-01T15:00:00+01:00"},
+        {"from": "2030-01-05T11:00:00+01:00", "to": "2030-01-05T15:00:00+01:00"},
+        {"from": "2030-02-02T11:00:00+01:00", "to": "2030-02-02T15:00:00+01:00"},
+        {"from": "kaputt", "to": "2030-02-02T15:00:00+01:00"},
+    ])
+    at = lambda s: datetime.fromisoformat(s).astimezone(LOCAL_TZ)
+
+    assert schedule.next_opening(at("2029-12-24T12:00:00+01:00"))["from"].startswith("2030-01-05")
+    running = schedule.next_opening(at("2030-02-02T14:00:00+01:00"))
+    assert running["from"].startswith("2030-02-02") and running["is_today"]
+    assert not schedule.next_opening(at("2030-02-01T14:00:00+01:00"))["is_today"]
+    assert schedule.next_opening(at("2030-03-01T16:00:00+01:00")) is None
+
+
+# ------------------------------------------------------------------
+# 10  Seiten-Cache: Treffer für anonyme Besucher, neu bei YAML-Änderung
+# ------------------------------------------------------------------
+def test_page_cache_keyed_by_content_version(client):
+    from app.app import PAGE_CACHE
+    PAGE_CACHE.clear()
+
+    _write("members.yaml", [{"name": "Cache Erst", "role": "Test"}])
+    first = client.get("/team")
+    assert first.headers["X-Page-Cache"] == "MISS"
+    second = client.get("/team")
+    assert second.headers["X-Page-Cache"] == "HIT"
+    assert second.data == first.data
+
+    _write("members.yaml", [{"name": "Cache Neu", "role": "Test"}])
+    third = client.get("/team")
+    assert third.headers["X-Page-Cache"] == "MISS"
+    assert "Cache Neu" in third.data.decode()
+
+    # Besucher mit Session (z. B. Admin) bekommen immer frisch gerenderte Seiten
+    with client.session_transaction() as sess:
+        sess["logged_in"] = True
+    assert "X-Page-Cache" not in client.get("/team").headers
+
+
+# ------------------------------------------------------------------
+# 11  Conditional GET: 304 solange sich die YAML-Inhalte nicht ändern
+# ------------------------------------------------------------------
+@pytest.mark.parametrize("route", ["/news", "/sitemap.xml", "/robots.txt"])
+def test_conditional_get_returns_304(client, route):
+    first = client.get(route)
+    etag = first.headers["ETag"]
+    assert first.headers["Last-Modified"]
+
+    again = client.get(route, headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.data == b""
+
+    if route != "/robots.txt":
+        _write("news.yaml", [{"title": "Geändert", "slug": "geaendert",
+                              "date": datetime.now().strftime("%Y-%m-%d"),
+                              "preview_image": "images/slide.jpg"}])
+        assert client.get(route, headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_public_app_imports_without_member_portal():
+    """Ein kaputtes Portal-Setup darf die öffentliche Seite nicht mitreißen."""
+    import os, subprocess, sys
+    env = dict(os.environ, INTERN_DB_PROFILE="turbo")
+    code = "import app, sys; assert 'intern' not in sys.modules; app.app.test_client().get('/')"
+    proc = subprocess.run([sys.executable, "-c", code], cwd=BASE_DIR, env=env,
+                          capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr
+
+
+# ------------------------------------------------------------------
+# 12  Komprimierung: statische Assets vorkomprimiert, Seiten-Bodies gecacht
+# ------------------------------------------------------------------
+def test_static_assets_served_precompressed(client):
+    import gzip
+    plain = (pathlib.Path(__file__).resolve().parents[1] / "app" / "static" / "css" / "custom.css").read_bytes()
+
+    resp = client.get("/static/css/custom.css", headers={"Accept-Encoding": "gzip"})
+    assert resp.status_code == 200
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert resp.headers["Vary"] == "Accept-Encoding"
+    assert gzip.decompress(resp.data) == plain
+
+    again = client.get("/static/css/custom.css",
+                       headers={"Accept-Encoding": "gzip", "If-None-Match": resp.headers["ETag"]})
+    assert again.status_code == 304
+
+    # ohne Accept-Encoding bleibt es beim normalen send_file
+    assert "Content-Encoding" not in client.get("/static/css/custom.css").headers
+
+
+def test_compressed_bodies_reused_across_requests(client):
+    from app.app import COMPRESSED_CACHE
+    COMPRESSED_CACHE.clear()
+
+    first = client.get("/impressum", headers={"Accept-Encoding": "gzip"})
+    assert first.headers["Content-Encoding"] == "gzip"
+    cached = len(COMPRESSED_CACHE)
+    assert cached >= 1
+    second = client.get("/impressum", headers={"Accept-Encoding": "gzip"})
+    assert second.data == first.data
+    assert len(COMPRESSED_CACHE) == cached
+
+
+# ------------------------------------------------------------------
+# 13  Kiosk-Payload: Version mit ETag, neue Version bei Änderung
+# ------------------------------------------------------------------
+def test_kiosk_payload_versioned(client):
+    _write("flippers.yaml", [{"name": "Kiosk Flipper", "year": "ca. 1979",
+                              "manufacturer": "Bally", "features": ["Multiball"],
+                              "image": "images/flipper.jpg"}])
+    resp = client.get("/kiosk/payload.json")
+    payload = resp.get_json()
+    assert list(payload) == ["version"]
+    page = client.get("/kiosk").data.decode()
+    assert payload["version"] in page
+    assert "1979" in page and "Multiball" in page                 # normalisiert in KioskContent
+
+    etag = resp.headers["ETag"]
+    assert client.get("/kiosk/payload.json", headers={"If-None-Match": etag}).status_code == 304
+
+    _write("flippers.yaml", [{"name": "Neuer Flipper", "year": 1992, "image": "images/flipper.jpg"}])
+    changed = client.get("/kiosk/payload.json", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.get_json()["version"] != payload["version"]
+
+
+# ------------------------------------------------------------------
+# 14  Kontakt-Log: atomare Appends, Rotation, Seiten neueste zuerst
+# ------------------------------------------------------------------
+def test_contact_log_append_rotate_and_page(tmp_path):
+    import threading
+    from app.app import SubmissionLog
+
+    (tmp_path / "contact_submissions.yaml").write_text(
+        yaml.safe_dump([{"name": "alt-0"}, {"name": "alt-1"}]), encoding="utf-8")
+    log = SubmissionLog(tmp_path, max_bytes=2048)
+
+    def worker(n):
+        for i in range(25):
+            log.append({"name": f"t{n}-{i}", "message": "x" * 40})
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert log.count() == 202                        # nichts verloren, Altbestand übernommen
+    assert len(log.segments()) > 2                   # rotiert
+    assert (tmp_path / "contact_submissions.yaml.imported").exists()
+    log.append({"name": "neu"})
+    assert log.page(1, 10)[0]["name"] == "neu"
+    assert [e["name"] for e in log.page(21, 10)][1:] == ["alt-1", "alt-0"]
+    names = [e["name"] for p in range(1, 22) for e in log.page(p, 10)]
+    assert len(names) == 203 and len(set(names)) == 203
+
+    # YAML taucht erneut auf (Backup-Restore): wird angehängt, nichts überschrieben
+    (tmp_path / "contact_submissions.yaml").write_text(
+        yaml.safe_dump([{"name": "restore-0"}]), encoding="utf-8")
+    assert log.count() == 204
+    assert [e["name"] for e in log.page(21, 10)][-3:] == ["restore-0", "alt-1", "alt-0"]
+    assert len(list(tmp_path.glob("contact_submissions.yaml*.imported"))) == 2
+
+
+def test_admin_contact_log_paginated(client, monkeypatch, tmp_path):
+    from app import app as app_module
+
+    log = app_module.SubmissionLog(tmp_path)
+    for i in range(app_module.CONTACT_LOG_PAGE_SIZE + 5):
+        log.append({"name": f"Absender {i}", "email": f"a{i}@example.org", "message": "Hallo"})
+    monkeypatch.setattr(app_module, "CONTACT_LOG", log)
+    with client.session_transaction() as sess:
+        sess["logged_in"] = True
+    first = client.get("/admin/manage/contact_submissions.yaml").get_data(as_text=True)
+    assert f"Absender {app_module.CONTACT_LOG_PAGE_SIZE + 4}" in first and "Absender 4<" not in first
+    second = client.get("/admin/manage/contact_submissions.yaml?page=2").get_data(as_text=True)
+    assert "Absender 4<" in second and "Seite 2 von 2" in second
+    assert client.get("/admin").status_code == 200
+    # RAW-Editor würde eine neue YAML-Datei anlegen, die erneut importiert wird
+    blocked = client.post("/admin/edit/contact_submissions.yaml", data={"content": "[]"})
+    assert blocked.status_code == 302 and "/admin/manage/" in blocked.headers["Location"]
+    assert not (app_module.CONFIG_DIR / "contact_submissions.yaml").exists()
+
+
+# ------------------------------------------------------------------
+# 15  Rate-Limits: gleitendes Fenster, von allen Workern geteilt, begrenzt
+# ------------------------------------------------------------------
+def test_rate_limit_store_shared_and_sliding(tmp_path):
+    from app.app import RateLimitStore
+
+    path = str(tmp_path / "ratelimit.db")
+    worker_a, worker_b = RateLimitStore(path), RateLimitStore(path)
+    limit_a, limit_b = worker_a.limit("login", 5, 100), worker_b.limit("login", 5, 100)
+
+    for i in range(3):
+        limit_a.hit("10.0.0.1", now=1000 + i)
+    for i in range(2):
+        limit_b.hit("10.0.0.1", now=1010 + i)
+    assert limit_a.is_limited("10.0.0.1", now=1050)       # 3 + 2 über beide Worker
+    assert not limit_a.is_limited("10.0.0.2", now=1050)
+
+    # nächstes Fenster: alter Zähler zählt anteilig (hier zur Hälfte), dann gar nicht
+    assert limit_b.hits("10.0.0.1", now=1150) == pytest.approx(2.5)
+    assert limit_b.hits("10.0.0.1", now=1250) == 0
+
+    limit_a.pop("10.0.0.1")
+    assert limit_b.hits("10.0.0.1", now=1050) == 0
+
+
+def test_rate_limit_store_evicts_expired_and_caps_keys(tmp_path):
+    from app.app import RateLimitStore
+
+    store = RateLimitStore(str(tmp_path / "ratelimit.db"), max_keys=50)
+    scan = store.limit("contact", 5, 60)
+    for i in range(200):                                   # verteilter Scan: lauter neue IPs
+        store._next_sweep = 0
+        scan.hit(f"192.0.2.{i}", now=1000)
+    rows = store._connect().execute("SELECT COUNT(*) FROM rate_limit").fetchone()[0]
+    assert rows <= 51
+    store._next_sweep = 0
+    scan.hit("198.51.100.1", now=5000)                     # alles andere ist abgelaufen
+    assert store._connect().execute("SELECT COUNT(*) FROM rate_limit").fetchone()[0] == 1
+
+
+def test_rate_limit_store_fails_open(tmp_path):
+    import sqlite3
+    from app.app import RateLimitStore
+
+    broken = tmp_path / "kaputt.db"
+    broken.write_bytes(b"kein SQLite" * 100)
+    fallback = RateLimitStore(str(broken)).limit("login", 5, 100)
+    assert fallback.hit("10.0.0.1", now=1000) == 1                 # weiter pro Prozess im Speicher
+
+    path = str(tmp_path / "ratelimit.db")
+    limit = RateLimitStore(path, timeout=0.05).limit("login", 5, 100)
+    limit.hit("10.0.0.1", now=1000)
+    writer = sqlite3.connect(path, isolation_level=None)
+    writer.execute("BEGIN IMMEDIATE")                              # anderer Worker hält die Sperre
+    try:
+        assert limit.hit("10.0.0.1", now=1001) == 0                # kein 500, Anfrage geht durch
+        limit.pop("10.0.0.1")
+    finally:
+        writer.execute("ROLLBACK")
+        writer.close()
+    assert limit.hits("10.0.0.1", now=1002) == 1
+
+
+# ------------------------------------------------------------------
+# 16  Responsive Bilder: srcset mit Varianten, Format nach Accept-Header
+# ------------------------------------------------------------------
+def test_srcset_skips_remote_and_vector_images(client):
+    from app.app import srcset_value
+    with flask_app.test_request_context():
+        assert srcset_value("https://example.org/bild.jpg") == ""
+        assert srcset_value("images/gibt-es-nicht.jpg") == ""
+        assert srcset_value("images/logo.svg") == ""
+
+
+def test_image_variants_generated_and_negotiated(client, monkeypatch, tmp_path):
+    Image = pytest.importorskip("PIL.Image")
+    from app import app as app_module
+
+    monkeypatch.setattr(app_module, "IMAGE_VARIANT_DIR", tmp_path / "variants")
+    monkeypatch.setattr(app_module, "STATIC_DIR", tmp_path / "static")
+    rel = "images/_test_variant.jpg"
+    src = app_module.STATIC_DIR / rel
+    src.parent.mkdir(parents=True)
+    Image.new("RGB", (2000, 1000), (200, 30, 30)).save(src, quality=95)
+    with flask_app.test_request_context():
+        value = app_module.srcset_value(rel)
+    widths = [int(c.rsplit(" ", 1)[1][:-1]) for c in value.split(", ")]
+    assert widths == [w for w in app_module.IMAGE_VARIANT_WIDTHS if w < 2000] + [2000]
+
+    url = value.split(" ", 1)[0]
+    webp = client.get(url, headers={"Accept": "image/webp,image/*"})
+    assert webp.status_code == 200 and webp.mimetype == "image/webp"
+    assert "Accept" in webp.headers["Vary"]
+    jpeg = client.get(url, headers={"Accept": "image/*"})  # kein WebP angekündigt
+    assert jpeg.mimetype == "image/jpeg"
+    with Image.open(app_module.image_variant_path(rel, widths[0], "jpeg")) as im:
+        assert im.size == (widths[0], widths[0] // 2)
+    assert client.get("/img/123/" + rel).status_code == 404       # keine erlaubte Breite